@@ -0,0 +1,3 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+
@@ -0,0 +1,75 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+"""
+Batch generation against a local HTTP stub with artificial latency: blocking workers versus the asyncio fetch path, with
+    the same number of requests in flight
+
+The stub serves the Rockruff test page (with the ndex changed per page) for every title, after a fixed delay, like a
+    wiki far away would. Every batch generates the same entries into a temporary directory, without rate limiting.
+    A blocking batch of n workers has n requests in flight, the async batch is given the same concurrency (and the
+    default 4 workers to parse). AsyncHttpFetcher runs the requests on a thread pool, so both are expected to be about
+    as fast: the async path bounds the requests per host and overlaps requesting with parsing, it does not make a
+    request itself any cheaper.
+Run from the root of the repository: python3 -m benchmarks.async_fetching
+"""
+import os
+import tempfile
+import time
+from urllib.parse import urlparse, parse_qs
+
+from pokemon_dex_entries.pokedex_entry_batch import PokedexEntryBatch
+from tests.local_http_server import LocalHttpServer
+from utils.async_http_fetcher import AsyncHttpFetcher
+from utils.http_fetcher import HttpFetcher
+from utils.translation_cache import TranslationCache
+
+ROCKRUFF_WIKITEXT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                      "tests", "resources", "Rockruff_Test_Page.wiki")
+
+
+def create_stub(wikitext: str, latency: float) -> LocalHttpServer:
+    def index(handler):
+        time.sleep(latency)
+        ndex = int(parse_qs(urlparse(handler.path).query)["title"][0].split("_")[-1])
+        return 200, {"Content-Type": "text/plain; charset=utf-8"}, \
+            wikitext.replace("|ndex=744", "|ndex={:03}".format(ndex), 1)
+
+    return LocalHttpServer({"/w/index.php": index})
+
+
+def run_batch(sources: list, max_workers: int, async_fetcher: AsyncHttpFetcher = None) -> float:
+    with tempfile.TemporaryDirectory() as output_dir:
+        batch = PokedexEntryBatch(sources, output_dir=output_dir, max_workers=max_workers,
+                                  fetcher=HttpFetcher(min_interval=0, pool_size=max_workers),
+                                  entry_options={"translator": TranslationCache(seed={"puppy": "Puppy"})})
+
+        start = time.perf_counter()
+        results = batch.run_async(async_fetcher) if async_fetcher else batch.run()
+        elapsed = time.perf_counter() - start
+
+    assert all(result.succeeded for result in results), PokedexEntryBatch.create_report(results)
+    return elapsed
+
+
+def main(n_pages: int = 96, latency: float = 0.2):
+    with open(ROCKRUFF_WIKITEXT_PATH, 'r', encoding='utf8') as wikitext_file:
+        wikitext = wikitext_file.read()
+
+    with create_stub(wikitext, latency) as server:
+        sources = [server.base_url + "/w/index.php?title=Page_{}&action=edit".format(ndex)
+                   for ndex in range(1, n_pages + 1)]
+
+        print("{} pages, {:.0f} ms latency per request".format(n_pages, latency * 1000))
+        for concurrency in (1, 4, 16, 32):
+            blocking = run_batch(sources, concurrency)
+
+            async_fetcher = AsyncHttpFetcher(HttpFetcher(min_interval=0, pool_size=concurrency),
+                                             max_concurrency=concurrency, max_per_host=concurrency)
+            asynchronous = run_batch(sources, 4, async_fetcher)
+            async_fetcher.close()
+
+            print("{:2} in flight: blocking {:6.2f} s, async {:6.2f} s".format(concurrency, blocking, asynchronous))
+
+
+if __name__ == '__main__':
+    main()
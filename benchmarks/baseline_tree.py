@@ -0,0 +1,33 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+"""
+Helpers to run a benchmark against an earlier commit as well as against this tree
+
+The commit is exported with git archive into a temporary directory, without touching the working tree or the worktrees
+    of the repository. The benchmark is a script that is run in each tree in a process of its own.
+"""
+import io
+import json
+import subprocess
+import sys
+import tarfile
+
+
+def export_revision(revision: str, directory: str):
+    """Export the tree of a commit into directory (run from the root of the repository)"""
+    archive = subprocess.run(["git", "archive", "--format=tar", revision], capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        # Extraction filters only exist since Python 3.11.4 (and 3.8.17, 3.9.17, 3.10.12)
+        tar.extractall(directory, **({"filter": "data"} if hasattr(tarfile, "data_filter") else {}))
+
+
+def run_script(script: str, root: str, *args: str):
+    """
+    Run script (python source) with the root of a tree and args as its arguments, the script makes the tree
+        importable and prints its result as JSON
+
+    :returns the result of the script
+    """
+    output = subprocess.run([sys.executable, "-c", script, root, *args], capture_output=True, text=True,
+                            check=True).stdout
+    return json.loads(output)
@@ -0,0 +1,44 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+"""
+Reading a Serebii list page with every HTML backend: rows per second
+
+Uses the Gen 1 test page (151 rows), and a national list made of it by repeating its rows 6 times (906 rows).
+Run from the root of the repository: python3 -m benchmarks.list_backends
+"""
+import time
+
+from pokemon_lists.list_scraper_serebii import ListScraperSerebii
+from tests.test_html_backends import read_serebii_test_page
+from utils.html_backends import HTML_BACKENDS
+
+
+def create_national_page(page: str, times: int) -> str:
+    # The Pokémon rows are everything from the row of #001 up to the end of the table
+    rows_start = page.rindex("<tr>", 0, page.index("#001"))
+    rows_end = page.rindex("</tr>", 0, page.index("</table>\n</main>")) + len("</tr>")
+    return page[:rows_start] + "\n".join([page[rows_start:rows_end]] * times) + page[rows_end:]
+
+
+def measure(page: str, backend: str, min_time: float = 1.0) -> float:
+    # Rows per second, over as many runs as fit in min_time
+    runs = 0
+    rows = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_time:
+        rows += len(ListScraperSerebii("https://www.serebii.net/", text=page, html_backend=backend).parse_pokemon())
+        runs += 1
+    return rows / (time.perf_counter() - start)
+
+
+def main():
+    gen1_page = read_serebii_test_page()
+    pages = (("gen 1, 151 rows", gen1_page), ("national, 906 rows", create_national_page(gen1_page, 6)))
+
+    for name in HTML_BACKENDS:
+        print("{:<14} ".format(name) + ", ".join("{}: {:8.0f} rows/s".format(page_name, measure(page, name))
+                                                  for page_name, page in pages))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+"""
+Micro-benchmark of the local dex extraction on the Rockruff test page
+
+Run from the root of the repository: python3 -m benchmarks.local_dex_extraction
+"""
+import os
+import re
+import timeit
+
+from pokemon_dex_entries.bulbapedia.pokedex_entry_scraper_bulbapedia import PokedexEntryScraperPokemonBulbapedia
+from utils.wikitext_parser import WikitextDocument
+
+ROCKRUFF_WIKITEXT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                      "tests", "resources", "Rockruff_Test_Page.wiki")
+
+
+def legacy_extract_local_dex_data(local_data_entries):
+    # The previous implementation, two freshly formatted regexes per regN/numN for every dex entry, at most 3 regions
+    results = {}
+
+    region_key = "reg{}"
+    number_key = "num{}"
+    for entry in local_data_entries:
+        for i in range(1, 4):
+            reg_key = region_key.format(i.__str__())
+            num_key = number_key.format(i.__str__())
+
+            reg_regex = rf'{re.escape(reg_key)}=([\w]*)((\|)|(}}))'
+            reg_regex_search = re.search(reg_regex, entry)
+
+            if reg_regex_search:
+                region = reg_regex_search.group(1)
+
+                num_regex = rf'{re.escape(num_key)}=([\w]*)((\|)|(}}))'
+                num_regex_search = re.search(num_regex, entry)
+
+                if num_regex_search:
+                    num = num_regex_search.group(1)
+                    if region in results and num not in results[region]:
+                        results[region].append(num_regex_search.group(1))
+                    else:
+                        results[region] = [num_regex_search.group(1)]
+
+    return results
+
+
+def main(number: int = 10000):
+    with open(ROCKRUFF_WIKITEXT_PATH, 'r', encoding='utf8') as wikitext_file:
+        text = wikitext_file.read()
+
+    document = WikitextDocument(text)
+    dex_section = document.find_section("Pokédex entries", parent=document.find_section("Game data"))
+    start, end = dex_section.content_start, dex_section.end
+
+    def legacy():
+        # The legacy implementation works on newline-free copies of the dex entries, split like the page used to be
+        legacy_entries = text[start:end].partition("{{Dex/Footer}}")[0].replace('\n', '').split("|}|}")
+        return legacy_extract_local_dex_data(legacy_entries)
+
+    expected = legacy()
+    result = PokedexEntryScraperPokemonBulbapedia._extract_local_dex_data(text, start, end)
+    assert result == expected, "{} != {}".format(result, expected)
+
+    legacy_time = timeit.timeit(legacy, number=number) / number
+    new_time = timeit.timeit(
+        lambda: PokedexEntryScraperPokemonBulbapedia._extract_local_dex_data(text, start, end), number=number) / number
+
+    print("legacy:      {:8.2f} us per page".format(legacy_time * 1e6))
+    print("precompiled: {:8.2f} us per page".format(new_time * 1e6))
+    print("speedup:     {:8.2f}x".format(legacy_time / new_time))
+
+
+if __name__ == '__main__':
+    main()
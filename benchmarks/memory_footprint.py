@@ -0,0 +1,131 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+"""
+Memory footprint of a full National Dex worth of Pokédex entries held in memory
+
+Every entry is generated from the Rockruff test page (with its name, ndex and a few forms changed), parsed like a real
+    page is, and rendered. Only the entries are kept, the scrapers and parsers are discarded. The entries are measured
+    as used (rendered) and once every field is resolved.
+Compares this tree with an earlier commit (-baseline), by default the commit before PokedexEntry and EvolutionStep were
+    slotted and their strings interned. Both trees parse the same pages (see baseline_tree.py).
+Run from the root of the repository: python3 -m benchmarks.memory_footprint [-baseline <commit>]
+"""
+import argparse
+import os
+import tempfile
+
+from benchmarks.baseline_tree import export_revision, run_script
+
+# The commit before the entries were slotted and interned
+BASELINE_COMMIT = "60b4539"
+
+ROCKRUFF_WIKITEXT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                      "tests", "resources", "Rockruff_Test_Page.wiki")
+
+# Run inside the tree that is measured (its root is argv[1]) on the page at argv[2], for the national dex numbers up to
+#   argv[3]. Prints the number of entries and forms and the bytes they take as used and resolved as JSON.
+MEASURE_SCRIPT = """
+import gc, json, sys, tracemalloc
+sys.path.insert(0, sys.argv[1])
+from pokemon_dex_entries.bulbapedia.pokedex_entry_bulbapedia import PokedexEntryBulbapedia
+from utils.translation_cache import TranslationCache
+
+# Every fourth Pokémon gets these forms
+FORMS = "|forme=3\\n|form1=Midday Form\\n|form2=Midnight Form\\n|form3=Dusk Form\\n|form2type1=Dark\\n" \\
+        "|form2type2=Rock\\n|ability2-1=Keen Eye\\n|ability2-2=Vital Spirit\\n|abilityd2=No Guard\\n" \\
+        "|height-m2=1.1\\n|weight-kg2=25.0\\n"
+
+
+class WikitextFetcher:
+    # Serves the given wikitext for every url
+
+    def __init__(self, wikitext):
+        self.wikitext = wikitext
+
+    def get_text(self, url):
+        return self.wikitext
+
+
+def create_wikitext(template, ndex):
+    wikitext = template.replace("|ndex=744", "|ndex={:03}".format(ndex), 1)
+    if ndex % 4 == 0:
+        wikitext = wikitext.replace("|form2=Event\\n", FORMS, 1)
+    return wikitext
+
+
+def build_entries(template, last_ndex):
+    translator = TranslationCache()
+    entries = []
+    for ndex in range(1, last_ndex + 1):
+        entry = PokedexEntryBulbapedia("https://test/index.php?title={}".format(ndex),
+                                       WikitextFetcher(create_wikitext(template, ndex)), translator=translator)
+        entry.setup()
+        # As if the entry is used, the fields that are not rendered stay unresolved
+        entry.build_template()
+        entries.append(entry.dex_entry)
+    return entries
+
+
+def resolve(dex_entry):
+    if hasattr(type(dex_entry), "resolve"):
+        dex_entry.resolve()
+    else:
+        # Before PokedexEntry.resolve, a lazy field was resolved by using it
+        for field in list(getattr(dex_entry, "_resolvers", None) or ()):
+            getattr(dex_entry, field)
+
+
+def measure():
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+with open(sys.argv[2], "r", encoding="utf8") as wikitext_file:
+    template = wikitext_file.read()
+
+# Warm up, so caches and imports are not counted
+for dex_entry in build_entries(template, 1):
+    resolve(dex_entry)
+gc.collect()
+
+tracemalloc.start()
+entries = build_entries(template, int(sys.argv[3]))
+as_used = measure()
+for dex_entry in entries:
+    resolve(dex_entry)
+resolved = measure()
+tracemalloc.stop()
+
+print(json.dumps({"entries": len(entries), "forms": sum(len(dex_entry.forms) for dex_entry in entries),
+                  "as used": as_used, "resolved": resolved}))
+"""
+
+
+def measure_tree(root: str, last_ndex: int) -> dict:
+    # The entries and forms the tree at root parsed, and the bytes they take
+    return run_script(MEASURE_SCRIPT, root, ROCKRUFF_WIKITEXT_PATH, str(last_ndex))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the memory a dex of entries takes to an earlier commit.')
+    parser.add_argument('-baseline', action="store", help='Commit to compare to, by default the commit before the '
+                                                          'entries were slotted', type=str, default=BASELINE_COMMIT)
+    parser.add_argument('-last-ndex', action="store", help='Number of entries', type=int, default=898)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as baseline_root:
+        export_revision(args.baseline, baseline_root)
+        baseline = measure_tree(baseline_root, args.last_ndex)
+    result = measure_tree(os.getcwd(), args.last_ndex)
+    assert (result["entries"], result["forms"]) == (baseline["entries"], baseline["forms"]), \
+        "This tree parses different entries than {}".format(args.baseline)
+
+    print("{} entries ({} forms), {} against this tree".format(result["entries"], result["forms"], args.baseline))
+    for state in ("as used", "resolved"):
+        print("{:<9} {:8.1f} KiB -> {:8.1f} KiB, {:6.0f} -> {:6.0f} bytes per entry".format(
+            state + ":", baseline[state] / 1024, result[state] / 1024, baseline[state] / baseline["entries"],
+            result[state] / result["entries"]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+"""
+Batch generation against a local HTTP stub: worker threads that fetch and parse versus the fetch -> parse -> render
+    pipeline that parses in a pool of processes
+
+The stub serves the Rockruff test page (with the ndex changed per page) for every title, without delay so the parsing
+    is what limits the throughput. Every run generates the same entries into a temporary directory, without rate
+    limiting. The pipeline only gets faster with more than one core.
+Run from the root of the repository: python3 -m benchmarks.parse_pipeline
+"""
+import os
+import tempfile
+import time
+
+from benchmarks.async_fetching import ROCKRUFF_WIKITEXT_PATH, create_stub
+from pokemon_dex_entries.pokedex_entry_batch import PokedexEntryBatch
+from pokemon_dex_entries.pokedex_entry_pipeline import PokedexEntryPipeline
+from utils.evolution_graph_store import EvolutionGraphStore
+from utils.http_fetcher import HttpFetcher
+from utils.translation_cache import TranslationCache
+
+
+def run_batch(sources: list, max_workers: int, processes: int = None) -> float:
+    with tempfile.TemporaryDirectory() as output_dir:
+        fetcher = HttpFetcher(min_interval=0, pool_size=max_workers)
+        entry_options = {"translator": TranslationCache(seed={"puppy": "Puppy"}),
+                         "evolution_graph_store": EvolutionGraphStore()}
+        if processes:
+            batch = PokedexEntryPipeline(sources, output_dir=output_dir, max_workers=max_workers, fetcher=fetcher,
+                                         entry_options=entry_options, processes=processes)
+        else:
+            batch = PokedexEntryBatch(sources, output_dir=output_dir, max_workers=max_workers, fetcher=fetcher,
+                                      entry_options=entry_options)
+
+        start = time.perf_counter()
+        results = batch.run()
+        elapsed = time.perf_counter() - start
+
+    assert all(result.succeeded for result in results), PokedexEntryBatch.create_report(results)
+    if processes:
+        print(batch.create_throughput_report())
+    return elapsed
+
+
+def main(n_pages: int = 200, latency: float = 0.0):
+    with open(ROCKRUFF_WIKITEXT_PATH, 'r', encoding='utf8') as wikitext_file:
+        wikitext = wikitext_file.read()
+
+    with create_stub(wikitext, latency) as server:
+        sources = [server.base_url + "/w/index.php?title=Page_{}&action=edit".format(ndex)
+                   for ndex in range(1, n_pages + 1)]
+
+        print("{} pages, {:.0f} ms latency per request, {} cores".format(n_pages, latency * 1000, os.cpu_count()))
+        elapsed = run_batch(sources, 8)
+        print("threads, 8 workers:                {:6.2f} s, {:6.1f} pages/s".format(elapsed, n_pages / elapsed))
+
+        for processes in sorted({2, os.cpu_count()}):
+            elapsed = run_batch(sources, 8, processes)
+            print("pipeline, 8 fetchers, {:2} processes: {:6.2f} s, {:6.1f} pages/s".format(
+                processes, elapsed, n_pages / elapsed))
+
+
+if __name__ == '__main__':
+    main()
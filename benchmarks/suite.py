@@ -0,0 +1,223 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+"""
+The time every stage of the entry and list generation takes, per page of a fixed corpus, as a JSON report to compare
+    between commits
+
+Entry stages, per page: extract (the wikitext from the edit page), generate_usable_data, build_pokedex_entry (every
+    field resolved, the evolution line is looked up in a store that has it already), evolution_line (parsed into an
+    empty store) and create_dutch_wiki_entry, and the total of a page from edit page to template.
+List stages, on the Serebii Gen 1 page: parse (html.parser backend) and render.
+The corpus is made of the test pages, without any request: the Rockruff page as it is (a single form with a split
+    evolution), with a linear evolution, with three forms and without evolution.
+Every stage runs for at least min_time seconds, the report has the median, mean and minimum time of a run.
+Run from the root of the repository: python3 -m benchmarks.suite [-output report.json] [-compare old_report.json]
+"""
+import argparse
+import html
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import time
+
+from pokemon_dex_entries.bulbapedia.pokedex_entry_bulbapedia import PokedexEntryBulbapedia
+from pokemon_dex_entries.bulbapedia.pokedex_entry_parser_bulbapedia import PokedexEntryParserPokemonStrategyBulbapedia
+from pokemon_dex_entries.bulbapedia.pokedex_entry_scraper_bulbapedia import PokedexEntryScraperPokemonBulbapedia
+from pokemon_lists.list_scraper_serebii import ListScraperSerebii
+from pokemon_lists.nl_pkmn_fandom_list import DutchPokemonFandomPokemonList
+from utils.evolution_graph_store import EvolutionGraphStore
+from utils.translation_cache import TranslationCache
+
+RESOURCES_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "tests", "resources")
+ENTRY_URL = "https://bulbapedia.bulbagarden.net/w/index.php?title=Rockruff_(Pok%C3%A9mon)&action=edit"
+
+# Bumped when the stages or the corpus change, reports of another version cannot be compared
+REPORT_VERSION = 1
+
+# The infobox lines of Rockruff in three forms, the forms of Lycanroc (only the base form is in the test page)
+FORM_LINES = """|forme=3
+|form1=Midday Form
+|form2=Midnight Form
+|form3=Dusk Form
+|form2type1=Dark
+|form2type2=Rock
+|ability2-1=Keen Eye
+|ability2-2=Vital Spirit
+|abilityd2=No Guard
+|height-m2=1.1
+|weight-kg2=25.0
+|height-ftin3=2'07"
+"""
+
+
+def read_resource(name: str) -> str:
+    with open(os.path.join(RESOURCES_PATH, name), 'r', encoding='utf8') as resource_file:
+        return resource_file.read()
+
+
+def create_corpus() -> dict:
+    """
+    :returns page name -> wikitext
+    """
+    wikitext = read_resource("Rockruff_Test_Page.wiki")
+    evolution_start = wikitext.index("===Evolution===\n")
+    evolution_end = wikitext.index("===Sprites===")
+
+    return {
+        "split_evolution": wikitext,
+        # Only the Own Tempo boxes are left, Rockruff -> Lycanroc
+        "linear_evolution": re.sub(r'\{\{Evobox/1branch2\n.*?\|type1-2b=Rock\}\}\n', "", wikitext, flags=re.DOTALL),
+        "multi_form": wikitext.replace("|form2=Event\n", FORM_LINES, 1),
+        "no_evolution": wikitext[:evolution_start] + "===Evolution===\n{{p|Rockruff}} is not known to evolve into or "
+                                                     "from any other Pokémon.\n\n" + wikitext[evolution_end:]
+    }
+
+
+def create_edit_page(wikitext: str) -> str:
+    # The edit page of the test page, with the wikitext in its textarea
+    page = read_resource("Rockruff_Test_Page.html")
+    start = page.find(">", page.find('id="wpTextbox1"')) + 1
+    end = page.find("</textarea>", start)
+    return page[:start] + html.escape(wikitext, quote=False) + page[end:]
+
+
+def measure(function, min_time: float) -> dict:
+    # The times of as many runs as fit in min_time (at least 3), in microseconds
+    times = []
+    start = time.perf_counter()
+    while len(times) < 3 or time.perf_counter() - start < min_time:
+        run_start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - run_start) * 1e6)
+    return {"runs": len(times), "median_us": statistics.median(times), "mean_us": statistics.fmean(times),
+            "min_us": min(times)}
+
+
+def create_entry_stages(wikitext: str) -> dict:
+    """
+    :returns stage name -> function running the stage once, on its own input
+    """
+    translator = TranslationCache(seed={"puppy": "Puppy"})
+    edit_page = create_edit_page(wikitext)
+    data = PokedexEntryScraperPokemonBulbapedia(ENTRY_URL).generate_usable_data(wikitext)
+
+    # A store that has the family already, so building the entry only looks up the evolution line
+    evolution_graph_store = EvolutionGraphStore()
+    entry = PokedexEntryBulbapedia(ENTRY_URL, translator=translator, evolution_graph_store=evolution_graph_store)
+    entry.setup_from_data(*data)
+    dex_entry = entry.dex_entry
+    dex_entry.to_dict()
+
+    def build_pokedex_entry():
+        stage_entry = PokedexEntryBulbapedia(ENTRY_URL, translator=translator,
+                                             evolution_graph_store=evolution_graph_store)
+        stage_entry.setup_from_data(*data)
+        stage_entry.dex_entry.to_dict()
+
+    def evolution_line():
+        PokedexEntryParserPokemonStrategyBulbapedia(data[0], data[1], data[2], data[4], translator,
+                                                    EvolutionGraphStore()).parse_pokemon_evo_line()
+
+    def total():
+        scraper = PokedexEntryScraperPokemonBulbapedia(ENTRY_URL, fetch_mode="edit")
+        scraper.wikitext = scraper.extract_text_area_text(edit_page)
+        page_entry = PokedexEntryBulbapedia(ENTRY_URL, translator=translator,
+                                            evolution_graph_store=EvolutionGraphStore())
+        page_entry.setup_from_scraper(scraper)
+        page_entry.build_template()
+
+    return {
+        "extract": lambda: PokedexEntryScraperPokemonBulbapedia.extract_text_area_text(edit_page),
+        "generate_usable_data": lambda: PokedexEntryScraperPokemonBulbapedia(ENTRY_URL).generate_usable_data(wikitext),
+        "build_pokedex_entry": build_pokedex_entry,
+        "evolution_line": evolution_line,
+        "create_dutch_wiki_entry": dex_entry.create_dutch_wiki_entry,
+        "total": total
+    }
+
+
+def create_list_stages(page: str) -> dict:
+    pokemon = ListScraperSerebii("https://www.serebii.net/pokemon/gen1pokemon.shtml", text=page,
+                                 html_backend="html.parser").parse_pokemon()
+    return {
+        "parse": lambda: ListScraperSerebii("https://www.serebii.net/pokemon/gen1pokemon.shtml", text=page,
+                                            html_backend="html.parser").parse_pokemon(),
+        "render": lambda: DutchPokemonFandomPokemonList(pokemon).generate_fandom_list()
+    }
+
+
+def get_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(min_time: float = 0.5) -> dict:
+    """
+    Measure every stage of every page
+
+    :returns the report: the environment it ran in, and a result (pipeline, page, stage and times) per stage
+    """
+    results = []
+    for page, wikitext in create_corpus().items():
+        for stage, function in create_entry_stages(wikitext).items():
+            results.append(dict(pipeline="entry", page=page, stage=stage, **measure(function, min_time)))
+    for stage, function in create_list_stages(read_resource("Serebii_Gen1_Test_Page.html")).items():
+        results.append(dict(pipeline="list", page="serebii_gen1", stage=stage, **measure(function, min_time)))
+
+    return {"version": REPORT_VERSION, "commit": get_commit(), "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(), "platform": platform.platform(), "min_time": min_time,
+            "results": results}
+
+
+def create_comparison(report: dict, old_report: dict) -> str:
+    """
+    The median of every stage next to the one in old_report, a ratio above 1 means the stage got slower
+
+    Raises ValueError when the reports are of another version
+    """
+    if report["version"] != old_report["version"]:
+        raise ValueError("Cannot compare a version {} report to a version {} report".format(old_report["version"],
+                                                                                        report["version"]))
+
+    old_results = {(result["pipeline"], result["page"], result["stage"]): result for result in old_report["results"]}
+    lines = ["{:<6} {:<17} {:<24} {:>12} {:>12} {:>7}".format("", "page", "stage", "old us", "new us", "ratio")]
+    for result in report["results"]:
+        old_result = old_results.get((result["pipeline"], result["page"], result["stage"]))
+        if old_result is None:
+            continue
+        lines.append("{:<6} {:<17} {:<24} {:12.1f} {:12.1f} {:7.2f}".format(
+            result["pipeline"], result["page"], result["stage"], old_result["median_us"], result["median_us"],
+            result["median_us"] / old_result["median_us"]))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure every stage of the entry and list generation.')
+    parser.add_argument('-output', action="store", help='JSON file the report is written to', type=str,
+                        default="benchmark_report.json")
+    parser.add_argument('-compare', action="store", help='JSON report of an earlier run to compare to', type=str)
+    parser.add_argument('-min-time', action="store", help='Minimum seconds every stage runs', type=float,
+                        default=0.5)
+    args = parser.parse_args()
+
+    report = run(args.min_time)
+    with open(args.output, "w", encoding='utf8') as report_file:
+        json.dump(report, report_file, indent=2)
+
+    for result in report["results"]:
+        print("{pipeline:<6} {page:<17} {stage:<24} {median_us:12.1f} us (median of {runs} runs)".format(**result))
+    print("Report written to {}".format(args.output))
+
+    if args.compare:
+        with open(args.compare, "r", encoding='utf8') as old_report_file:
+            print(create_comparison(report, json.load(old_report_file)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+"""
+Benchmark of rendering a Pokémon to its Dutch wiki entry, with only its base form and with three forms
+
+Compares the renderer of this tree with the renderer of an earlier commit (-baseline), by default the method-per-field
+    renderer the repository started with. Both trees render the same entries (see baseline_tree.py) and have to give
+    the same text.
+Run from the root of the repository: python3 -m benchmarks.wiki_entry_rendering [-baseline <commit>]
+"""
+import argparse
+import os
+import tempfile
+
+from benchmarks.baseline_tree import export_revision, run_script
+
+# The commit the repository started from, before any change to the rendering
+BASELINE_COMMIT = "9042328"
+
+# Run inside the tree that is measured (its root is argv[1]), prints for every entry the text and the seconds rendering
+#   it took (the fastest of 5 runs) as JSON. Before PokedexFormEntry existed the forms of an entry were dicts.
+RENDER_SCRIPT = """
+import json, sys, timeit
+sys.path.insert(0, sys.argv[1])
+from pokemon_dex_entries.pokedex_entry import PokedexEntry
+from utils.evolution_line import EvolutionLine, EvolutionStep
+
+# Rockruff, and Rockruff with the three forms of Lycanroc as if it had them
+evo_line = EvolutionLine(EvolutionStep("Rockruff", "744", 1))
+evo_line.first.add_next(EvolutionStep("Lycanroc", "745", 2))
+
+def create_entry():
+    return PokedexEntry("Rockruff", "Midday Form", "イワンコ Iwanko", "Generatie VII", "Puppy", "Steen", None,
+                        ["Keen Eye", "Vital Spirit"], "Steadfast", "744", "Lycanroc", "Ribombee", evo_line, 50, "0.5",
+                        "9.2", "1'08\\"", "20.3", ["Veld"], "Bruin", "08", None, None, None, None, None, None,
+                        "103/126", "157")
+
+single_entry, dex_entry = create_entry(), create_entry()
+forms = [dict(form_name=form_name, types=types, abilities=["Keen Eye", "Sand Rush"], hidden_ability="Steadfast",
+              met_height="0.8", met_weight="25.0", imp_height="2'07\\"", imp_weight="55.1")
+         for form_name, types in (("Midnight Form", ["Steen", None]), ("Dusk Form", ["Steen", "Duister"]))]
+try:
+    from pokemon_dex_entries.pokedex_entry import PokedexFormEntry
+    dex_entry.add_forms([PokedexFormEntry(**form) for form in forms])
+except ImportError:
+    dex_entry.add_forms([{"form": form["form_name"], "type": form["types"], "ability": form["abilities"],
+                          "h_ability": form["hidden_ability"], "met_height": form["met_height"],
+                          "met_weight": form["met_weight"], "imp_height": form["imp_height"],
+                          "imp_weight": form["imp_weight"]} for form in forms])
+
+print(json.dumps({name: {"entry": entry.create_dutch_wiki_entry(),
+                         "seconds": min(timeit.repeat(entry.create_dutch_wiki_entry, number=int(sys.argv[2]),
+                                                      repeat=5))}
+                  for name, entry in (("1 form", single_entry), ("3 forms", dex_entry))}))
+"""
+
+
+def measure_tree(root: str, number: int) -> dict:
+    # The entries rendered by the tree at root, and the seconds rendering each of them number times took
+    return run_script(RENDER_SCRIPT, root, str(number))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare rendering a wiki entry to an earlier commit.')
+    parser.add_argument('-baseline', action="store", help='Commit to compare to, by default the commit the repository '
+                                                          'started from', type=str, default=BASELINE_COMMIT)
+    parser.add_argument('-number', action="store", help='Times the entry is rendered', type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as baseline_root:
+        export_revision(args.baseline, baseline_root)
+        baseline = measure_tree(baseline_root, args.number)
+    result = measure_tree(os.getcwd(), args.number)
+
+    print("Rendering every entry {} times, {} against this tree".format(args.number, args.baseline))
+    for name, entry in result.items():
+        assert entry["entry"] == baseline[name]["entry"], \
+            "This tree renders a different entry ({}) than {}".format(name, args.baseline)
+        print("{:<8} {:8.3f} s -> {:8.3f} s, speedup {:5.2f}x".format(
+            name + ":", baseline[name]["seconds"], entry["seconds"], baseline[name]["seconds"] / entry["seconds"]))
+
+
+if __name__ == '__main__':
+    main()
@@ -2,33 +2,143 @@
 #  All rights reserved.
 
 import argparse
+import contextlib
+import os
 
+from pokemon_dex_entries.bulbapedia.pokedex_entry_scraper_bulbapedia import PokedexEntryScraperPokemonBulbapedia
 from pokemon_dex_entries.entry_scraper_factory import EntryScraperFactory
+from pokemon_dex_entries.pokedex_entry_batch import PokedexEntryBatch, read_sources_file, parse_ndex_range, \
+    sources_from_ndex_range, split_changed_sources
+from pokemon_dex_entries.pokedex_entry_pipeline import PokedexEntryPipeline
+from pokemon_dex_entries.pokedex_entry_store import PokedexEntryStore
+from utils.async_http_fetcher import AsyncHttpFetcher
+from utils.atomic_file import open_atomic
+from utils.evolution_graph_store import EvolutionGraphStore
+from utils.fetcher_arguments import add_fetcher_arguments, create_fetcher
+from utils.http_cache import HttpCache
+from utils.http_fetcher import HttpFetcher
+from utils.mediawiki_revisions import MediaWikiRevisionChecker
+from utils.translation_cache import TranslationCache, create_default_backend
 
 
 def main():
     parser = argparse.ArgumentParser(description='Scrape a website and convert the data to a Pokémon entry using a '
                                                  'format usable by the Dutch Pokémon fandom/.')
 
-    parser.add_argument('-url', action="store", help='Target url', required=True)
-    parser.add_argument('-type', action="store", help='Source type of website being scraped, options', type=str,
-                        choices=["bulbapedia"], default="bulbapedia")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('-url', action="store", help='Target url')
+    target.add_argument('-file', action="store", help='Batch mode: file with one url or Pokémon name per line')
+    target.add_argument('-range', action="store", help='Batch mode: national dex range, e.g. 1-151')
+
+    parser.add_argument('-type', action="store", help='Source type of website being scraped, options. Use store to '
+                                                      'render the entries stored by an earlier run instead',
+                        type=str, choices=["bulbapedia", "store"], default="bulbapedia")
+    parser.add_argument('-fetch-mode', action="store", help='Bulbapedia: request the raw wikitext, the edit page or only '
+                                                           'the sections that are used',
+                        type=str, choices=["raw", "edit", "sections"], default="raw")
+    parser.add_argument('-workers', action="store", help='Batch mode: number of entries generated concurrently',
+                        type=int, default=4)
+    parser.add_argument('-output-dir', action="store", help='Batch mode: directory to write the entries to',
+                        type=str, default="output")
+    parser.add_argument('-translations', action="store", type=str,
+                        help='JSON file the translations are cached in, defaults to translations.json in the cache dir')
+    parser.add_argument('-no-translate', action="store_true",
+                        help='Only use cached translations, never request a translation')
+    parser.add_argument('-evolution-graph', action="store", type=str,
+                        help='JSON file the parsed evolution families are stored in, defaults to evolution_graph.json '
+                             'in the cache dir. Only used by a single -url entry when given')
+    parser.add_argument('-store', action="store", type=str,
+                        help='SQLite file the parsed entries are stored in, defaults to pokedex_entries.sqlite in the '
+                             'cache dir. A single -url entry is only stored when given')
+    parser.add_argument('-async', action="store_true", dest="use_async",
+                        help='Batch mode: await all pages from a single event loop, at most -concurrency at once '
+                             '(at most 8 per host, each on a thread of its own), while -workers threads parse and '
+                             'write the entries')
+    parser.add_argument('-concurrency', action="store", help='Batch mode: requests in flight at once with -async',
+                        type=int, default=32)
+    parser.add_argument('-processes', action="store", type=int,
+                        help='Batch mode, Bulbapedia: parse the pages in this many processes, while -workers threads '
+                             'request them. Prints the throughput of every stage')
+    parser.add_argument('-incremental', action="store_true",
+                        help='Batch mode: only scrape the pages that changed since they were stored, the other entries '
+                             'are rendered from the store')
+    add_fetcher_arguments(parser)
 
     args = parser.parse_args()
+    if args.incremental and (args.url or args.type != "bulbapedia" or args.offline):
+        parser.error("-incremental needs a batch (-file or -range) of Bulbapedia pages, and cannot be used offline")
+    if args.processes and (args.url or args.type != "bulbapedia" or args.use_async):
+        parser.error("-processes needs a batch (-file or -range) of Bulbapedia pages, and cannot be used with -async")
+
+    fetcher = create_fetcher(args)
+    translator = create_translator(args)
+    # None: the families are only kept in memory (see get_default_evolution_graph_store)
+    evolution_graph_store = create_evolution_graph_store(args) if uses_evolution_graph_store(args) else None
+
+    with create_store(args) if uses_store(args) else contextlib.nullcontext() as store:
+        if args.url:
+            generate_single(args, fetcher, translator, evolution_graph_store, store)
+        else:
+            generate_batch(args, fetcher, translator, evolution_graph_store, store)
+
+    # The families parsed during this run are stored for the next one (not 'if evolution_graph_store', an empty store is
+    #   falsy)
+    if evolution_graph_store is not None:
+        evolution_graph_store.save()
+
+
+def uses_store(args) -> bool:
+    # A batch keeps its entries for -type store and -incremental, a single entry is only stored when -store is given
+    return args.type == "store" or not args.url or args.store is not None
+
+
+def uses_evolution_graph_store(args) -> bool:
+    # Stored entries come with their evolution line. A single entry only uses the file when -evolution-graph is given
+    return args.type != "store" and (not args.url or args.evolution_graph is not None)
+
+
+def create_translator(args) -> TranslationCache:
+    # Offline runs only use the cached translations as well
+    backend = None if args.no_translate or args.offline else create_default_backend()
+    path = args.translations if args.translations else os.path.join(args.cache_dir, "translations.json")
+    return TranslationCache(path, backend=backend)
+
+
+def create_evolution_graph_store(args) -> EvolutionGraphStore:
+    path = args.evolution_graph if args.evolution_graph else os.path.join(args.cache_dir, "evolution_graph.json")
+    return EvolutionGraphStore(path)
+
+
+def create_store(args) -> PokedexEntryStore:
+    return PokedexEntryStore(args.store if args.store else os.path.join(args.cache_dir, "pokedex_entries.sqlite"))
+
+
+def create_entry_options(args, translator: TranslationCache, evolution_graph_store: EvolutionGraphStore,
+                         store: PokedexEntryStore) -> dict:
+    # The options passed on to the entry class of the source type
+    if args.type == "store":
+        return {"store": store}
+    return {"fetch_mode": args.fetch_mode, "translator": translator, "evolution_graph_store": evolution_graph_store}
+
 
+def generate_single(args, fetcher: HttpFetcher, translator: TranslationCache,
+                    evolution_graph_store: EvolutionGraphStore, store: PokedexEntryStore):
     # scraper_class = EntryScraperFactory().create(source_type="bulbapedia", url="https://bulbapedia.bulbagarden.net/w/index.php?title=Pikachu_(Pok%C3%A9mon)&action=edit")
-    scraper_class = EntryScraperFactory().create(source_type=args.type, url=args.url)
+    scraper_class = EntryScraperFactory().create(source_type=args.type, url=args.url, fetcher=fetcher,
+                                                 **create_entry_options(args, translator, evolution_graph_store,
+                                                                        store))
 
     try:
         # Setup
         scraper_class.setup()
 
-        # Build the template
-        dutch_format = scraper_class.build_template()
+        # Build the template, straight into the output file (which is only replaced once the whole entry is rendered)
+        with open_atomic("output.txt") as text_file:
+            scraper_class.write_template(text_file)
 
-        text_file = open("output.txt", "w", encoding='utf8')
-        text_file.write(dutch_format)
-        text_file.close()
+        # Keep the parsed entry (when asked to), so it can be rendered again without scraping it
+        if args.type != "store" and store is not None:
+            store.put(scraper_class.dex_entry, args.url)
 
         print("Done! Dutch Fandom formatted text can be found in output.txt")
 
@@ -36,5 +146,79 @@ def main():
         print("Something went wrong during scraping, the source site may have changed its format.")
 
 
+def generate_batch(args, fetcher: HttpFetcher, translator: TranslationCache,
+                   evolution_graph_store: EvolutionGraphStore, store: PokedexEntryStore):
+    if args.file:
+        sources = read_sources_file(args.file)
+    elif args.type == "store":
+        # Only the stored entries, no need to look up the names of the range
+        sources = store.sources_in_range(*parse_ndex_range(args.range))
+    else:
+        sources = sources_from_ndex_range(*parse_ndex_range(args.range), fetcher=fetcher)
+
+    if args.incremental:
+        results = generate_incremental(args, sources, fetcher, translator, evolution_graph_store, store)
+    else:
+        batch = create_batch(args, sources, fetcher,
+                             create_entry_options(args, translator, evolution_graph_store, store),
+                             store=store if args.type != "store" else None)
+        results = run_batch(args, batch, fetcher)
+
+    print(PokedexEntryBatch.create_report(results))
+
+
+def create_batch(args, sources: list, fetcher: HttpFetcher, entry_options: dict, store: PokedexEntryStore = None,
+                 revisions: dict = None) -> PokedexEntryBatch:
+    if args.processes:
+        return PokedexEntryPipeline(sources, output_dir=args.output_dir, max_workers=args.workers, fetcher=fetcher,
+                                    entry_options=entry_options, store=store, revisions=revisions,
+                                    processes=args.processes)
+    return PokedexEntryBatch(sources, source_type=args.type, output_dir=args.output_dir, max_workers=args.workers,
+                             fetcher=fetcher, entry_options=entry_options, store=store, revisions=revisions)
+
+
+def run_batch(args, batch: PokedexEntryBatch, fetcher: HttpFetcher) -> list:
+    if isinstance(batch, PokedexEntryPipeline):
+        results = batch.run()
+        print(batch.create_throughput_report())
+        return results
+
+    if not args.use_async:
+        return batch.run()
+
+    async_fetcher = AsyncHttpFetcher(fetcher, max_concurrency=args.concurrency)
+    try:
+        return batch.run_async(async_fetcher)
+    finally:
+        async_fetcher.close()
+
+
+def generate_incremental(args, sources: list, fetcher: HttpFetcher, translator: TranslationCache,
+                         evolution_graph_store: EvolutionGraphStore, store: PokedexEntryStore) -> list:
+    # The current revisions are always requested, never served from the cache
+    http_fetcher = fetcher.fetcher if isinstance(fetcher, HttpCache) else fetcher
+    revisions = MediaWikiRevisionChecker(http_fetcher).get_revisions(sources)
+    changed, unchanged = split_changed_sources(sources, revisions, store.get_revisions(sources))
+    print("{} changed, {} unchanged".format(len(changed), len(unchanged)))
+
+    if isinstance(fetcher, HttpCache):
+        # A cached copy of a changed page might still be fresh, make sure the new revision is requested
+        for source in changed:
+            fetcher.expire(source)
+            fetcher.expire(PokedexEntryScraperPokemonBulbapedia.create_raw_url(source))
+            # The sections are requested by revision, only where they are needs to be looked up again
+            fetcher.expire(PokedexEntryScraperPokemonBulbapedia.create_sections_url(source))
+
+    # Only the changed pages are scraped and parsed, the unchanged entries are rendered from the store
+    changed_batch = create_batch(args, changed, fetcher,
+                                 create_entry_options(args, translator, evolution_graph_store, store),
+                                 store=store, revisions=revisions)
+    unchanged_batch = PokedexEntryBatch(unchanged, source_type="store", output_dir=args.output_dir,
+                                        max_workers=args.workers, entry_options={"store": store})
+
+    results = {result.source: result for result in run_batch(args, changed_batch, fetcher) + unchanged_batch.run()}
+    return [results[source] for source in sources]
+
+
 if __name__ == "__main__":
     main()
@@ -1,8 +1,16 @@
 import argparse
+import os
 
 import importlib
 
+from pokemon_dex_entries.pokedex_entry_batch import parse_ndex_range
+from pokemon_dex_entries.pokedex_entry_store import PokedexEntryStore
+from pokemon_lists.list_batch import PokemonListBatch, create_all_generation_urls
 from pokemon_lists.list_scraper_factory import ListScraperFactory
+from utils.atomic_file import open_atomic
+from utils.fetcher_arguments import add_fetcher_arguments, create_fetcher
+from utils.html_backends import HTML_BACKENDS, DEFAULT_HTML_BACKEND
+from utils.pokemon_type import PokemonType
 
 
 def main():
@@ -10,24 +18,73 @@ def main():
     parser = argparse.ArgumentParser(description='Scrape a website and convert the data to a list format usable by the'
                                                  ' Dutch Pokémon fandom/.')
 
-    parser.add_argument('-url', action="store", help='Target url', required=True)
-    parser.add_argument('-type', action="store", help='Source type of website being scraped, options', type=str, choices=["serebii"], default="serebii")
+    parser.add_argument('-url', action="store", nargs="+",
+                        help='Target url, several urls (e.g. a page per generation) are merged into one list')
+    parser.add_argument('-all-generations', action="store_true",
+                        help='Serebii: merge the list pages of all generations into one list, instead of -url')
+    parser.add_argument('-type', action="store", help='Source type of website being scraped, options. Use store to '
+                                                      'list the entries stored by the entry generator instead',
+                        type=str, choices=["serebii", "store"], default="serebii")
+    parser.add_argument('-html-backend', action="store", help='Serebii: parser used to read the page, beautifulsoup '
+                                                              'is slower but the most forgiving',
+                        type=str, choices=list(HTML_BACKENDS), default=DEFAULT_HTML_BACKEND)
+    parser.add_argument('-range', action="store", help='Store: only list this national dex range, e.g. 1-151')
+    parser.add_argument('-generation', action="store", help='Store: only list this generation', type=int)
+    parser.add_argument('-pokemon-type', action="store", help='Store: only list Pokémon of this type, e.g. rock',
+                        type=str)
+    parser.add_argument('-store', action="store", type=str,
+                        help='Store: SQLite file of the entry generator, defaults to pokedex_entries.sqlite in the '
+                             'cache dir')
+    parser.add_argument('-workers', action="store", help='Several urls: pages requested at once', type=int,
+                        default=4)
+    parser.add_argument('-processes', action="store", type=int,
+                        help='Several urls: parse the pages in this many processes, while -workers threads request them')
+    add_fetcher_arguments(parser)
 
     args = parser.parse_args()
+    if args.type == "serebii" and not args.url and not args.all_generations:
+        parser.error("-url or -all-generations is required for -type serebii")
+    if args.type == "store" and (args.url or args.all_generations):
+        parser.error("-url and -all-generations cannot be used with -type store")
+    if args.pokemon_type:
+        try:
+            PokemonType.to_dutch_name(args.pokemon_type)
+        except ValueError as e:
+            parser.error(str(e))
 
-    scraper_class = ListScraperFactory().create(source_type=args.type, url=args.url)
+    fetcher = create_fetcher(args)
 
     try:
-        formatted_fandom_list = scraper_class.scrape()
+        urls = create_all_generation_urls() if args.all_generations else args.url
+        if urls and len(urls) > 1:
+            # Requested (and parsed) concurrently, then merged by national dex number
+            scraper_class = PokemonListBatch(urls, source_type=args.type, max_workers=args.workers, fetcher=fetcher,
+                                             list_options=create_list_options(args), processes=args.processes)
+        else:
+            scraper_class = ListScraperFactory().create(source_type=args.type, url=urls[0] if urls else None,
+                                                        fetcher=fetcher, **create_list_options(args))
 
-        text_file = open("output.txt", "w")
-        text_file.write(formatted_fandom_list)
-        text_file.close()
+        # Build the list, straight into the output file (which is only replaced once the whole list is written, a
+        #   page that cannot be requested or parsed leaves the output.txt of an earlier run as it was)
+        with open_atomic("output.txt") as text_file:
+            scraper_class.write_to(text_file)
 
         print("Done! Dutch Fandom formatted text can be found in output.txt")
 
     except Exception as e:
         print("Something went wrong during scraping, the source site may have changed its format.")
 
+
+def create_list_options(args) -> dict:
+    # The options passed on to the list class of the source type
+    if args.type != "store":
+        return {"html_backend": args.html_backend}
+
+    first, last = parse_ndex_range(args.range) if args.range else (None, None)
+    return {"store": PokedexEntryStore(args.store if args.store else os.path.join(args.cache_dir,
+                                                                                  "pokedex_entries.sqlite")),
+            "first": first, "last": last, "generation": args.generation, "pokemon_type": args.pokemon_type}
+
+
 if __name__ == "__main__":
    main()
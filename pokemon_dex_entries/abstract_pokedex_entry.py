@@ -1,6 +1,10 @@
 #  Copyright (c) 2021 Aaron Beetstra
 #  All rights reserved.
 import abc
+import asyncio
+from concurrent.futures import Executor
+
+from utils.async_http_fetcher import AsyncHttpFetcher
 
 
 class AbstractPokedexEntry(abc.ABC):
@@ -17,6 +21,19 @@ class AbstractPokedexEntry(abc.ABC):
     def setup(self):
         pass
 
+    async def setup_async(self, fetcher: AsyncHttpFetcher, executor: Executor = None):
+        """
+        Setup without blocking the event loop, the pages are requested through fetcher and everything else runs on the
+            executor (the default executor of the loop when None)
+
+        By default the whole (blocking) setup runs on the executor, sources override this to await their requests.
+        """
+        await asyncio.get_running_loop().run_in_executor(executor, self.setup)
+
     @abc.abstractmethod
     def build_template(self):
         pass
+
+    def write_template(self, fp):
+        """Write the template to the (text) file handle fp"""
+        fp.write(self.build_template())
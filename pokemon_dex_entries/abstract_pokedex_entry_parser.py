@@ -2,13 +2,41 @@
 #  All rights reserved.
 
 import abc
+import functools
 from abc import abstractmethod
 
-from googletrans import Translator
-
-from pokemon_dex_entries.pokedex_entry import PokedexEntry
+from pokemon_dex_entries.pokedex_entry import PokedexEntry, PokedexFormEntry
 from pokemon_dex_entries.abstract_pokedex_entry_parser_strategy import AbstractPokedexEntryParserStrategy
 from utils.evolution_line import EvolutionLine
+from utils.translation_cache import TranslationCache, get_default_translation_cache
+
+
+def memoize_parse(method):
+    """
+    Compute a characteristic only once per parser, every following call returns the stored result
+
+    Used for general characteristics, these do not depend on the active form strategy.
+    """
+    return _memoize(method, form_dependent=False)
+
+
+def memoize_form_parse(method):
+    """
+    Compute a form depending characteristic only once per form, the result is stored per active form strategy
+    """
+    return _memoize(method, form_dependent=True)
+
+
+def _memoize(method, form_dependent: bool):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, self._form_strategy if form_dependent else None, args, tuple(sorted(kwargs.items())))
+        try:
+            return self._parse_cache[key]
+        except KeyError:
+            result = self._parse_cache[key] = method(self, *args, **kwargs)
+            return result
+    return wrapper
 
 
 class AbstractPokedexEntryParser(abc.ABC):
@@ -17,10 +45,14 @@ class AbstractPokedexEntryParser(abc.ABC):
 
     Inherits from PokedexEntryParserStrategyForm as this parser needs all characteristics, thus
         form depending characteristics are required as well as general characteristics.
+    The translator is shared between parsers, by default the process wide translation cache is used.
+    Every characteristic is parsed at most once per form (see memoize_parse and memoize_form_parse), and only when it
+        is actually used by the PokedexEntry.
     """
 
-    def __init__(self, strategy: AbstractPokedexEntryParserStrategy):
-        self.translator = Translator()
+    def __init__(self, strategy: AbstractPokedexEntryParserStrategy, translator: TranslationCache = None):
+        self.translator = translator if translator else get_default_translation_cache()
+        self._parse_cache = {}
 
         self._form_strategy = strategy
         self.default_strategy = strategy
@@ -33,43 +65,70 @@ class AbstractPokedexEntryParser(abc.ABC):
     def form_strategy(self, strategy: AbstractPokedexEntryParserStrategy):
         self._form_strategy = strategy
 
-    def build_pokedex_entry(self):
-        return PokedexEntry(
-            self.parse_pokemon_name(),
-            self.parse_pokemon_form_name(),
-            self.parse_pokemon_japanese_name(),
-            self.parse_pokemon_generation(),
-            self.parse_pokemon_species(),
-            self.parse_pokemon_types()[0],
-            self.parse_pokemon_types()[1],
-            self.parse_pokemon_abilities(),
-            self.parse_pokemon_hidden_ability(),
-            self.parse_pokemon_national_dex_number(),
-            self.parse_pokemon_national_dex_next(),
-            self.parse_pokemon_national_dex_previous(),
-            self.parse_pokemon_evo_line(),
-            self.parse_pokemon_gender(),
-            self.parse_pokemon_met_height(),
-            self.parse_pokemon_met_weight(),
-            self.parse_pokemon_imp_height(),
-            self.parse_pokemon_imp_weight(),
-            self.parse_pokemon_egg_groups(),
-            self.parse_pokemon_dex_color(),
-            self.parse_pokemon_body(),
-            self.parse_pokemon_kanto_dex_number(),
-            self.parse_pokemon_johto_dex_number(),
-            self.parse_pokemon_hoenn_dex_number(),
-            self.parse_pokemon_sinnoh_dex_number(),
-            self.parse_pokemon_unova_dex_number(),
-            self.parse_pokemon_kalos_dex_number(),
-            self.parse_pokemon_alola_dex_number(),
-            self.parse_pokemon_galar_dex_number()
+    def build_pokedex_entry(self) -> PokedexEntry:
+        # The characteristics are only parsed once the PokedexEntry needs them, which might be after the form strategy
+        #   changed, so they are resolved with the form strategy that is active right now
+        resolve = functools.partial(self._resolve_with_strategy, self._form_strategy)
+        return PokedexEntry.create_lazy(
+            name=resolve(self.parse_pokemon_name),
+            form_name=resolve(self.parse_pokemon_form_name),
+            japanese_name=resolve(self.parse_pokemon_japanese_name),
+            generation=resolve(self.parse_pokemon_generation),
+            species=resolve(self.parse_pokemon_species),
+            type=resolve(lambda: self.parse_pokemon_types()[0]),
+            type2=resolve(lambda: self.parse_pokemon_types()[1]),
+            abilities=resolve(self.parse_pokemon_abilities),
+            hidden_ability=resolve(self.parse_pokemon_hidden_ability),
+            ndex_num=resolve(self.parse_pokemon_national_dex_number),
+            ndex_next=resolve(self.parse_pokemon_national_dex_next),
+            ndex_prev=resolve(self.parse_pokemon_national_dex_previous),
+            evo_line=resolve(self.parse_pokemon_evo_line),
+            percent_male=resolve(self.parse_pokemon_gender),
+            met_height=resolve(self.parse_pokemon_met_height),
+            met_weight=resolve(self.parse_pokemon_met_weight),
+            imp_height=resolve(self.parse_pokemon_imp_height),
+            imp_weight=resolve(self.parse_pokemon_imp_weight),
+            egg_groups=resolve(self.parse_pokemon_egg_groups),
+            color=resolve(self.parse_pokemon_dex_color),
+            body=resolve(self.parse_pokemon_body),
+            kanto_num=resolve(self.parse_pokemon_kanto_dex_number),
+            johto_num=resolve(self.parse_pokemon_johto_dex_number),
+            hoenn_num=resolve(self.parse_pokemon_hoenn_dex_number),
+            sinnoh_num=resolve(self.parse_pokemon_sinnoh_dex_number),
+            unova_num=resolve(self.parse_pokemon_unova_dex_number),
+            kalos_num=resolve(self.parse_pokemon_kalos_dex_number),
+            alola_num=resolve(self.parse_pokemon_alola_dex_number),
+            galar_num=resolve(self.parse_pokemon_galar_dex_number)
+        )
+
+    def _resolve_with_strategy(self, strategy: AbstractPokedexEntryParserStrategy, parse):
+        def resolver():
+            active_strategy = self._form_strategy
+            self._form_strategy = strategy
+            try:
+                return parse()
+            finally:
+                self._form_strategy = active_strategy
+        return resolver
+
+    def build_pokedex_form_entry(self) -> PokedexFormEntry:
+        # The form depending characteristics of the active form strategy, parsed once per form
+        return PokedexFormEntry.create(
+            form_name=self.parse_pokemon_form_name(),
+            types=self.parse_pokemon_types(),
+            abilities=self.parse_pokemon_abilities(),
+            hidden_ability=self.parse_pokemon_hidden_ability(),
+            met_height=self.parse_pokemon_met_height(),
+            met_weight=self.parse_pokemon_met_weight(),
+            imp_height=self.parse_pokemon_imp_height(),
+            imp_weight=self.parse_pokemon_imp_weight()
         )
 
     @abstractmethod
     def parse_pokemon_name(self):
         pass
 
+    @memoize_form_parse
     def parse_pokemon_form_name(self):
         return self._form_strategy.parse_pokemon_form_name()
 
@@ -85,12 +144,15 @@ class AbstractPokedexEntryParser(abc.ABC):
     def parse_pokemon_species(self):
         pass
 
+    @memoize_form_parse
     def parse_pokemon_types(self):
         return self._form_strategy.parse_pokemon_types()
 
+    @memoize_form_parse
     def parse_pokemon_abilities(self):
         return self._form_strategy.parse_pokemon_abilities()
 
+    @memoize_form_parse
     def parse_pokemon_hidden_ability(self):
         return self._form_strategy.parse_pokemon_hidden_ability()
 
@@ -114,15 +176,19 @@ class AbstractPokedexEntryParser(abc.ABC):
     def parse_pokemon_gender(self):
         pass
 
+    @memoize_form_parse
     def parse_pokemon_met_height(self):
         return self._form_strategy.parse_pokemon_met_height()
 
+    @memoize_form_parse
     def parse_pokemon_met_weight(self):
         return self._form_strategy.parse_pokemon_met_weight()
 
+    @memoize_form_parse
     def parse_pokemon_imp_height(self):
         return self._form_strategy.parse_pokemon_imp_height()
 
+    @memoize_form_parse
     def parse_pokemon_imp_weight(self):
         return self._form_strategy.parse_pokemon_imp_weight()
 
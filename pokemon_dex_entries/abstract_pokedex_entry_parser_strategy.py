@@ -10,19 +10,6 @@ class AbstractPokedexEntryParserStrategy(abc.ABC):
     A class used to build parsers for FORM depending characteristics
     """
 
-    # TODO: Replace DICT with class
-    def build_pokedex_form_entry(self):
-        return {
-            "form": self.parse_pokemon_form_name(),
-            "type": self.parse_pokemon_types(),
-            "ability": self.parse_pokemon_abilities(),
-            "h_ability": self.parse_pokemon_hidden_ability(),
-            "met_height": self.parse_pokemon_met_height(),
-            "met_weight": self.parse_pokemon_met_weight(),
-            "imp_height": self.parse_pokemon_imp_height(),
-            "imp_weight": self.parse_pokemon_imp_weight()
-        }
-
     @abstractmethod
     def parse_pokemon_form_name(self):
         pass
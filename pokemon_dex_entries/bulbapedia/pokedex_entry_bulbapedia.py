@@ -1,33 +1,69 @@
 #  Copyright (c) 2020 Aaron Beetstra
 #  All rights reserved.
+import asyncio
+from concurrent.futures import Executor
+
 from pokemon_dex_entries.abstract_pokedex_entry import AbstractPokedexEntry
 from pokemon_dex_entries.bulbapedia.pokedex_entry_parser_bulbapedia import \
     PokedexEntryParserPokemonStrategyBulbapedia
 from pokemon_dex_entries.bulbapedia.pokedex_entry_parser_strategy_bulbapedia_form import \
     PokedexEntryParserPokemonStrategyBulbapediaForm
 from pokemon_dex_entries.bulbapedia.pokedex_entry_scraper_bulbapedia import PokedexEntryScraperPokemonBulbapedia
+from utils.async_http_fetcher import AsyncHttpFetcher
+from utils.evolution_graph_store import EvolutionGraphStore
+from utils.http_fetcher import HttpFetcher
+from utils.translation_cache import TranslationCache
 
 
 class PokedexEntryBulbapedia(AbstractPokedexEntry):
 
-    def __init__(self, url: str):
+    def __init__(self, url: str, fetcher: HttpFetcher = None, fetch_mode: str = "raw",
+                 translator: TranslationCache = None, evolution_graph_store: EvolutionGraphStore = None):
 
         super().__init__()
         self.url = url
+        self.fetcher = fetcher
+        self.fetch_mode = fetch_mode
+        self.translator = translator
+        self.evolution_graph_store = evolution_graph_store
 
     def setup(self):
 
         # Setup scraper:
-        scraper = PokedexEntryScraperPokemonBulbapedia(self.url)
+        scraper = PokedexEntryScraperPokemonBulbapedia(self.url, self.fetcher, self.fetch_mode)
 
         # Request the data
-        scraper.get_structured_object()
+        scraper.get_wikitext()
+
+        self.setup_from_scraper(scraper)
+
+    async def setup_async(self, fetcher: AsyncHttpFetcher, executor: Executor = None):
+        scraper = PokedexEntryScraperPokemonBulbapedia(self.url, self.fetcher, self.fetch_mode)
+
+        # Only the request is awaited, the scraping runs on the executor so the event loop can keep other requests going
+        await scraper.get_wikitext_async(fetcher)
+        await asyncio.get_running_loop().run_in_executor(executor, self.setup_from_scraper, scraper)
 
+    def setup_from_scraper(self, scraper: PokedexEntryScraperPokemonBulbapedia) -> \
+            PokedexEntryParserPokemonStrategyBulbapedia:
+        """
+        Setup from a scraper of which the wikitext is requested already
+
+        :returns the parser of the base form, the (lazy) dex_entry is built by it
+        """
         # Scrape the data
-        infobox_dict, ndex_dict, evolines, forms, dex_data = scraper.generate_usable_data()
+        return self.setup_from_data(*scraper.generate_usable_data())
+
+    def setup_from_data(self, infobox_dict: dict, ndex_dict: dict, evolines: list, forms: dict,
+                        dex_data: dict) -> PokedexEntryParserPokemonStrategyBulbapedia:
+        """
+        Setup from the data scraped by PokedexEntryScraperPokemonBulbapedia.generate_usable_data
 
+        :returns the parser of the base form, the (lazy) dex_entry is built by it
+        """
         # Generate the base form:
-        parser_base = PokedexEntryParserPokemonStrategyBulbapedia(infobox_dict, ndex_dict, evolines, dex_data)
+        parser_base = PokedexEntryParserPokemonStrategyBulbapedia(infobox_dict, ndex_dict, evolines, dex_data,
+                                                                  self.translator, self.evolution_graph_store)
         dex_entry = parser_base.build_pokedex_entry()
 
         # Generate separate forms if applicable:
@@ -38,14 +74,19 @@ class PokedexEntryBulbapedia(AbstractPokedexEntry):
                     form_id=form_id,
                     infobox_dict=parser_base.infobox_dict
                 )
-                parsed_forms.append(parser_base.form_strategy.build_pokedex_form_entry())
+                parsed_forms.append(parser_base.build_pokedex_form_entry())
 
             # Add the forms to the Pokedex Entry:
             dex_entry.add_forms(parsed_forms)
 
         self.dex_entry = dex_entry
+        return parser_base
 
     def build_template(self):
         # Generate the output for Fandom
         return self.dex_entry.create_dutch_wiki_entry()
 
+    def write_template(self, fp):
+        # Stream the output for Fandom straight to fp
+        self.dex_entry.write_dutch_wiki_entry(fp)
+
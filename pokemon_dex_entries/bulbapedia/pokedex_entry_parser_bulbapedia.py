@@ -2,59 +2,78 @@
 #  All rights reserved.
 import re
 
-from pokemon_dex_entries.abstract_pokedex_entry_parser import AbstractPokedexEntryParser
+from pokemon_dex_entries.abstract_pokedex_entry_parser import AbstractPokedexEntryParser, memoize_parse
 from pokemon_dex_entries.bulbapedia.pokedex_entry_parser_strategy_bulbapedia_base import \
     PokedexEntryParserPokemonStrategyBulbapediaBase
 from utils.color_translation import ENGLISH_TO_DUTCH_COLOR
 from utils.egg_groups_translation import ENGLISH_TO_DUTCH_EGG_GROUP
+from utils.evolution_graph_store import EvolutionGraphStore, get_default_evolution_graph_store
 from utils.evolution_line import EvolutionLine, EvolutionStep
 from utils.gen_translation import ENGLISH_TO_DUTCH_GEN
 from utils.gender_conversion import GENDER_DECIMAL_TO_MALE_PERCENTAGE
+from utils.translation_cache import TranslationCache
+from utils.wikitext_parser import parse_templates
 
 # TODO: Right now, a lot of the conversion happens in this class, e.g. if we require string we will convert it to
 #  string here, it shouldn't be done here but rather in the PokedexEntry class.
 
 class PokedexEntryParserPokemonStrategyBulbapedia(AbstractPokedexEntryParser):
 
-    def __init__(self, infobox: dict, prev_next_dict: dict, raw_pokemon_evolution_lines: list, dex_data: dict):
-        super().__init__(strategy=PokedexEntryParserPokemonStrategyBulbapediaBase(infobox))
+    # Some Pokémon cannot be done. Bulbapedia writers deemed these too complex, their evo logic is not
+    #   present in the data we have, rather this data is found somewhere else on their site.
+    unparsable_evo_lines = ("Eevee", "Tyrogue", "Feebas", "Milotic", "Nincada")
+
+    def __init__(self, infobox: dict, prev_next_dict: dict, raw_pokemon_evolution_lines: list, dex_data: dict,
+                 translator: TranslationCache = None, evolution_graph_store: EvolutionGraphStore = None):
+        super().__init__(strategy=PokedexEntryParserPokemonStrategyBulbapediaBase(infobox), translator=translator)
         self.infobox_dict = infobox
         self.prev_next_dict = prev_next_dict
         self.raw_pokemon_evolution_lines = raw_pokemon_evolution_lines
         self.dex_data = dex_data
+        # The evolution families are shared between parsers, by default the process wide store is used (compared to
+        #   None, an empty store is falsy)
+        self.evolution_graph_store = evolution_graph_store if evolution_graph_store is not None \
+            else get_default_evolution_graph_store()
 
+    @memoize_parse
     def parse_pokemon_name(self, id = None):
         # Grab the Pokémon name, found inside the infobox dict
         # key: "name"
         return self.infobox_dict["name"]
 
+    @memoize_parse
     def parse_pokemon_japanese_name(self):
         # Grab the Japanese name, found inside the infobox dict
         # keys: "jname" and "tmname"
         return self.infobox_dict["jname"] + " " + self.infobox_dict["tmname"]
 
+    @memoize_parse
     def parse_pokemon_generation(self):
         # Grab the Pokémon generation, found inside the infobox dict
         # key: "generation"
         return ENGLISH_TO_DUTCH_GEN[self.infobox_dict["generation"]]
 
+    @memoize_parse
     def parse_pokemon_species(self):
         # Grab the Pokémon species, found inside the infobox dict
-        # key: "category"
+        # key: "category", translated to Dutch through the translation cache
 
-        return self.translator.translate(self.infobox_dict["category"], src="en", dest="nl").text.capitalize()
+        return self.translator.translate(self.infobox_dict["category"]).capitalize()
 
+    @memoize_parse
     def parse_pokemon_national_dex_number(self):
         # Grab the Pokémon national dex number, found inside the infobox dict
         # key: "ndex"
         return self.infobox_dict["ndex"]
 
+    @memoize_parse
     def parse_pokemon_national_dex_next(self):
         # Grab the Pokémon national dex next, found inside the prev_next box dict
         # key: "next" and check if "nextnum" isn't 001 (since Bulbapedia loops from last to first)
         if "next" in self.prev_next_dict and self.prev_next_dict["nextnum"] != "001":
             return self.prev_next_dict["next"]
 
+    @memoize_parse
     def parse_pokemon_national_dex_previous(self):
         # Grab the Pokémon national dex next, found inside the prev_next box dict
         # key: "prev" and check if "nextnum" isn't 002 (since Bulbapedia loops from last to first)
@@ -109,9 +128,9 @@ class PokedexEntryParserPokemonStrategyBulbapedia(AbstractPokedexEntryParser):
                 #   We need to do this since 'normal' evo paths use name1, name2, name3 as keys, not name2a, etc.
                 #   We can just grab the name2 value from name2a, the no2 value needs to be extracted from the
                 #   art2a key, since that is the only place where it is available (not sure why they just not use
-                #   no2a or no2b but whatever).
+                #   no2a or no2b but whatever). Some pages (e.g. Rockruff) do use no2a instead of art2a.
                 evo_dict['name2'] = evo_dict['name2a']
-                evo_dict['no2'] = re.findall(r'\d+', evo_dict["art2a"])[0]
+                evo_dict['no2'] = re.findall(r'\d+', evo_dict.get("art2a", evo_dict.get("no2a", "")))[0]
 
         if evo_line_type == "normal":
             evo_steps = []
@@ -182,35 +201,45 @@ class PokedexEntryParserPokemonStrategyBulbapedia(AbstractPokedexEntryParser):
             parent.add_next(child_b)
             return EvolutionLine(parent)
 
+    @staticmethod
+    def parse_raw_evolution_line(raw_pokemon_evolution_line: str) -> dict:
+        """
+        Parse a raw evolution line into a dict of all its key=value pairs, in a single pass
+        Sample: /1branch2|type1=Rock|no1=744|name1=Rockruff|... -> {'type1': 'Rock', 'no1': '744', 'name1': 'Rockruff'}
+
+        The raw line is the argument list of an Evobox, so it is tokenized as one: a '|' or '=' inside a nested template
+            or link (e.g. evo1={{bag|Rare Candy}}) does not split the value.
+
+        :returns dict of key -> value
+        """
+        evobox = parse_templates("{{" + raw_pokemon_evolution_line + "}}")
+        return evobox[0].params if evobox else {}
+
+    def has_parsable_evo_line(self) -> bool:
+        """
+        Whether the evolution line is parsed from the raw evolution lines: not when the page has no Evobox (the Pokémon
+            does not evolve), see unparsable_evo_lines as well
+        """
+        return bool(self.raw_pokemon_evolution_lines) and self.parse_pokemon_name() not in self.unparsable_evo_lines
+
+    @memoize_parse
     def parse_pokemon_evo_line(self) -> EvolutionLine:
         # Create an evolution line for this Pokémon
 
-        # Some Pokémon cannot be done. Bulbapedia writers deemed these too complex, their evo logic is not
-        #   present in the data we have, rather this data is found somewhere else on their site.
-        skip = ["Eevee", "Tyrogue", "Feebas", "Milotic", "Nincada"]
-        if self.parse_pokemon_name() in skip:
+        if not self.raw_pokemon_evolution_lines:
+            # Does not evolve, a line of its own
+            return EvolutionLine(first=EvolutionStep(pokemon_name=self.parse_pokemon_name(),
+                                                     ndex=self.parse_pokemon_national_dex_number(), evo_stage=1))
+        if not self.has_parsable_evo_line():
             return EvolutionLine(first=EvolutionStep(pokemon_name=self.parse_pokemon_name(), ndex="???", evo_stage=1))
 
-        # First create a usable format, we only need the names from the infobox, put them in a dict:
-        raw_evo_lines = []
-        needed_keys = ["name{}", "name{}a", "name{}b", "sprite{}", "sprite{}a", "sprite{}b", "no{}", "no{}a", "no{}b",
-                       "art{}a", "art{}b"]
-        for raw_pokemon_evolution_line in self.raw_pokemon_evolution_lines:
-            temp = raw_pokemon_evolution_line.split("|", 1)[1]
-            dict = {}
-            for i in range(1, 5):
-                for key in needed_keys:
-                    formatted_key = key.format(str(i))
-                    pattern = r"\b" + re.escape(formatted_key) + r"\b"
-                    if re.search(pattern, temp):
-                        index = temp.index(formatted_key)
-                        index += len(formatted_key) + 1
-                        key_value = ""
-                        while temp[index] != "|":
-                            key_value += temp[index]
-                            index += 1
-                        dict[formatted_key] = key_value
-            raw_evo_lines.append(dict)
+        # The members of a family mostly have the same Evobox, it is only parsed once (see EvolutionGraphStore)
+        return self.evolution_graph_store.get_or_create(self.raw_pokemon_evolution_lines, self._create_full_evo_line)
+
+    def _create_full_evo_line(self) -> EvolutionLine:
+        # First create a usable format, the main and the secondary lines are all parsed the same way
+        raw_evo_lines = [self.parse_raw_evolution_line(raw_pokemon_evolution_line)
+                         for raw_pokemon_evolution_line in self.raw_pokemon_evolution_lines]
 
         # Some Pokémon have multiple evo lines on their pages (need to fix forms here!), call the first on our
         #   main line:
@@ -224,11 +253,13 @@ class PokedexEntryParserPokemonStrategyBulbapedia(AbstractPokedexEntryParser):
 
         return main_line
 
+    @memoize_parse
     def parse_pokemon_gender(self):
         # Grab the Pokémon decimal gender code, found inside the infobox dict, convert to male%
         # key: "gendercode"
         return GENDER_DECIMAL_TO_MALE_PERCENTAGE[int(self.infobox_dict["gendercode"])]
 
+    @memoize_parse
     def parse_pokemon_egg_groups(self):
         # Grab the Pokémon egg group(s)
         # key: "egggroupn" for the amount, "egggroup1" and "egggroup2" (if n == 2)
@@ -242,51 +273,61 @@ class PokedexEntryParserPokemonStrategyBulbapedia(AbstractPokedexEntryParser):
             return [ENGLISH_TO_DUTCH_EGG_GROUP[self.infobox_dict["egggroup1"].lower()],
                     ENGLISH_TO_DUTCH_EGG_GROUP[self.infobox_dict["egggroup2"].lower()]]
 
+    @memoize_parse
     def parse_pokemon_dex_color(self):
         # Grab the Pokémon dex color
         # key: "color", given value is English with leading capital, e.g. Blue, required is Blauw
         return ENGLISH_TO_DUTCH_COLOR[self.infobox_dict["color"].lower()]
 
+    @memoize_parse
     def parse_pokemon_body(self):
         # Grab the Pokémon body code
         # key: "body"
         return self.infobox_dict["body"]
 
+    @memoize_parse
     def parse_pokemon_kanto_dex_number(self):
         # Grab the Kanto dex numbers, if applicable
         # key: "Kanto"
         return self._parse_dex_numbers(key="Kanto")
 
+    @memoize_parse
     def parse_pokemon_johto_dex_number(self):
         # Grab the Kanto dex numbers, if applicable
         # key: "Johto"
         return self._parse_dex_numbers(key="Johto")
 
+    @memoize_parse
     def parse_pokemon_hoenn_dex_number(self):
         # Grab the Kanto dex numbers, if applicable
         # key: "Hoenn"
         return self._parse_dex_numbers(key="Hoenn")
 
+    @memoize_parse
     def parse_pokemon_sinnoh_dex_number(self):
         # Grab the Kanto dex numbers, if applicable
         # key: "Sinnoh"
         return self._parse_dex_numbers(key="Sinnoh")
 
+    @memoize_parse
     def parse_pokemon_unova_dex_number(self):
         # Grab the Kanto dex numbers, if applicable
         # key: "Unova"
         return self._parse_dex_numbers(key="Unova")
 
+    @memoize_parse
     def parse_pokemon_kalos_dex_number(self):
         # Grab the Kanto dex numbers, if applicable
         # key: "Kalos"
         return self._parse_dex_numbers(key="Kalos")
 
+    @memoize_parse
     def parse_pokemon_alola_dex_number(self):
         # Grab the Kanto dex numbers, if applicable
         # key: "Alola"
         return self._parse_dex_numbers(key="Alola")
 
+    @memoize_parse
     def parse_pokemon_galar_dex_number(self):
         # Grab the Kanto dex numbers, if applicable
         # key: "Galar"
@@ -1,9 +1,25 @@
 #  Copyright (c) 2020 Aaron Beetstra
 #  All rights reserved.
+import asyncio
+import html
+import json
 import re
+from urllib.parse import quote, urlencode
+
+import requests
 
 from pokemon_dex_entries.pokedex_entry_scraper import PokedexEntryScraper
-from utils.list_to_dict import str_list_to_dict
+from utils.async_http_fetcher import AsyncHttpFetcher
+from utils.http_cache import HttpCacheMissError
+from utils.http_fetcher import HttpFetcher
+from utils.mediawiki_revisions import MediaWikiRevisionChecker
+from utils.wikitext_parser import WikitextDocument, WikitextTemplate, find_template
+
+# The start of a dex entry, or a regN/numN argument with its value, which ends at the delimiter '|' or the ending '}}'
+#   Sample: {{Dex/Gen/3|gen=VII|reg1=Alola|num1=103|...|reg2=Alola|num2=126|...}}
+#   Both alternatives start with a literal, which lets the regex engine skip ahead to the next '{' or '|'
+_LOCAL_DEX_PATTERN = re.compile(r'\{\{\s*(?P<entry>Dex/Gen)'
+                                r'|\|\s*(?P<key>reg|num)(?P<index>\d+)\s*=\s*(?P<value>\w*)\s*(?=\||\}\})')
 
 
 class PokedexEntryScraperPokemonBulbapedia(PokedexEntryScraper):
@@ -18,6 +34,14 @@ class PokedexEntryScraperPokemonBulbapedia(PokedexEntryScraper):
     We grab this and convert it to a dict for our usage.
 
     Other information we need: prev, next from the national dex, evolution
+
+    The wikitext is either requested directly (fetch_mode "raw", using action=raw) or cut out of the textarea of the
+        edit page (fetch_mode "edit").
+    With fetch_mode "sections" only the parts of the article we use are requested: the lead (infobox and PrevNext box),
+        the Evolution section and the Pokédex entries of the Game data section. Where these sections are is looked up
+        once per revision of the article through the API (see create_sections_url), the sections themselves are
+        requested from that revision so they never change and can be cached for good. When the article does not have
+        the layout we expect, the whole article is requested instead.
     """
 
     # List of forms we can safely ignore:
@@ -34,51 +58,232 @@ class PokedexEntryScraperPokemonBulbapedia(PokedexEntryScraper):
         "gorging form"
     ]
 
-    def __init__(self, url: str):
-        super().__init__(url)
+    # Edit page of a Pokémon article, e.g. Rockruff_(Pokémon)
+    edit_url_format = "https://bulbapedia.bulbagarden.net/w/index.php?title={}_(Pok%C3%A9mon)&action=edit"
 
-    def generate_usable_data(self):
-        """"
-        Generate data based on the scaped HTML
+    fetch_modes = ("raw", "edit", "sections")
+
+    # The sections requested with fetch_mode "sections" besides the lead: (title, title of the parent section or None)
+    #   There are more sections called 'Pokédex entries', we need the one in the 'Game data' section.
+    wanted_sections = (("Evolution", None), ("Pokédex entries", "Game data"))
+    # The whole article is requested instead when the sections are not laid out as we expect, or when one of the
+    #   requests for them fails (e.g. a 404 of an api.php that is disabled, or a section that is not cached offline)
+    sections_fallback_errors = (ValueError, KeyError, TypeError, requests.RequestException, HttpCacheMissError)
+
+    def __init__(self, url: str, fetcher: HttpFetcher = None, fetch_mode: str = "raw"):
+        super().__init__(url, fetcher)
 
+        if fetch_mode not in self.fetch_modes:
+            raise ValueError('Invalid fetch mode {}'.format(fetch_mode))
 
-        :returns infobox, the ndex prev/next box, and raw evolution lines
-        :type dict, dict, list
+        self.fetch_mode = fetch_mode
+        self.wikitext = None
+
+    @classmethod
+    def create_edit_url(cls, pokemon_name: str) -> str:
         """
-        text_area_text = self.structured_object.find("textarea", id="wpTextbox1").text
+        Create the edit page url for a Pokémon based on its (English) name
 
-        # Grab the Pokémon info box and convert to a list
-        info_box_raw = text_area_text.partition("{{Pokémon Infobox")[2].partition("\'\'\'")[0].replace("\n", "")[:-2]
-        info_box = re.split(r'\|+(?![^{{]*}})', info_box_raw)
+        :returns url, e.g. for 'Mr. Mime': ...?title=Mr._Mime_(Pok%C3%A9mon)&action=edit
+        """
+        return cls.edit_url_format.format(quote(pokemon_name.strip().replace(" ", "_")))
 
-        # Grab the Pokémon PrevNext box and convert to a list
-        prev_next_box = text_area_text.partition("{{PokémonPrevNext/Pokémon")[2].partition("}}")[0].split("|")
+    @staticmethod
+    def create_raw_url(url: str) -> str:
+        """
+        Convert an article (edit) url to the url returning the raw wikitext of the article
 
-        # To get the evolution line we need to get another part of the page.
-        #   This is found between ===Evolution=== and ===Forms=== or ===Sprites===
+        :returns url, e.g. ...?title=Rockruff_(Pok%C3%A9mon)&action=edit -> ...?title=Rockruff_(Pok%C3%A9mon)&action=raw
+        """
+        if re.search(r'[?&]action=', url):
+            return re.sub(r'([?&])action=[^&#]*', r'\1action=raw', url)
+        return url + ("&" if "?" in url else "?") + "action=raw"
 
-        if "===Forms===" in text_area_text:
-            evolution_box = text_area_text.partition("===Evolution===")[2].partition("===Forms===")[0]
-        else:
-            evolution_box = text_area_text.partition("===Evolution===")[2].partition("===Sprites===")[0]
+    @staticmethod
+    def create_sections_url(url: str) -> str:
+        """
+        Create the url of the API request returning the current revision and the sections of an article
+
+        :returns url, e.g. ...?title=Rockruff_(Pok%C3%A9mon)&action=edit -> .../w/api.php?action=parse&page=Rockruff+...
+        """
+        return MediaWikiRevisionChecker.api_url_from_url(url) + "?" + urlencode({
+            "action": "parse",
+            "page": MediaWikiRevisionChecker.title_from_url(url),
+            "prop": "sections|revid",
+            "format": "json",
+            "formatversion": "2"
+        })
+
+    @classmethod
+    def create_section_url(cls, url: str, index: int, revision: int) -> str:
+        """
+        Convert an article (edit) url to the url returning the raw wikitext of a single section of a revision
 
-        # So I couldn't get regex to work with dotall and \n\n (it would always see the entire object as one,
-        #   rather than finding multiple occurrences...), so dirty workaround I guess
-        evolution_box = evolution_box.replace("\n\n", "ENDHERE")
-        evolution_box = evolution_box.replace("\n", "")
-        evolution_box = evolution_box.replace("ENDHERE", "\n")
+        :returns url, e.g. ...?title=Rockruff_(Pok%C3%A9mon)&action=raw&section=4&oldid=3456789
+        """
+        return cls.create_raw_url(url) + "&section={}&oldid={}".format(index, revision)
 
-        # For Gen VIII Sprites are commented out, replace it with a newline to make it match all previous gens (regex)
-        evolution_box = evolution_box.replace("<!--", "\n")
+    @classmethod
+    def find_wanted_sections(cls, sections_response: str) -> tuple:
+        """
+        Find the wanted sections (see wanted_sections) in the response to the url of create_sections_url
 
-        # Pattern to grab all evo boxes if there are multiple
-        regex_pattern_individual_evo_boxes = r"{{Evobox(.*)}}\n"
+        Raises ValueError when the article does not have one of them
+        :returns the revision, and a list of (index, title, heading of the parent section or None) per wanted section
+        """
+        parsed = json.loads(sections_response).get("parse")
+        if not parsed or not parsed.get("revid"):
+            raise ValueError("The sections of the page were not found")
+
+        # Sections transcluded from a template (with an index like 'T-1') are not part of the wikitext of the article
+        sections = [(int(section["index"]), section["line"], int(section["level"]))
+                    for section in parsed["sections"] if section["index"].isdigit()]
+
+        wanted = []
+        for title, parent_title in cls.wanted_sections:
+            candidates = sections
+            parent_heading = None
+            if parent_title:
+                parent = next((position for position, section in enumerate(sections) if section[1] == parent_title),
+                              None)
+                if parent is None:
+                    raise ValueError("No {} section found".format(parent_title))
+                parent_level = sections[parent][2]
+                parent_heading = "=" * parent_level + parent_title + "=" * parent_level
+
+                # The subsections of the parent, up to the next section of the same or a higher level
+                candidates = []
+                for section in sections[parent + 1:]:
+                    if section[2] <= parent_level:
+                        break
+                    candidates.append(section)
+
+            index = next((index for index, line, _ in candidates if line == title), None)
+            if index is None:
+                raise ValueError("No {} section found".format(title))
+            wanted.append((index, title, parent_heading))
+
+        return parsed["revid"], wanted
 
-        raw_pokemon_evolution_lines = re.findall(regex_pattern_individual_evo_boxes, evolution_box, re.IGNORECASE)
+    @staticmethod
+    def join_sections(lead: str, wanted: list, section_texts: list) -> str:
+        """
+        Join the lead and the wanted sections (see find_wanted_sections) into wikitext with the same structure as the
+            article, the wanted sections are found in it like they are found in the whole article
 
-        # Bulbapedia uses "=" to split between the key and value
-        infobox_dict = str_list_to_dict(info_box, "=")
-        prev_next_dict = str_list_to_dict(prev_next_box, "=")
+        Raises ValueError when a section does not start with the heading we expect, the article changed in between
+        """
+        parts = [lead]
+        for (_, title, parent_heading), section_text in zip(wanted, section_texts):
+            sections = WikitextDocument(section_text).sections
+            if not sections or sections[0].start != 0 or sections[0].title != title:
+                raise ValueError("The {} section was not found where it was expected".format(title))
+
+            # The heading of the parent section is all we need of it
+            if parent_heading:
+                parts.append(parent_heading)
+            parts.append(section_text)
+        return "\n".join(parts)
+
+    @staticmethod
+    def extract_text_area_text(page: str) -> str:
+        """
+        Grab the text of the wpTextbox1 textarea (the wikitext) from an edit page
+
+        A plain scan for the textarea tags, building a DOM tree of the whole edit page for a single element is a lot
+            of work we don't need.
+        """
+        id_index = page.find('id="wpTextbox1"')
+        start = page.find(">", id_index) + 1
+        end = page.find("</textarea>", start)
+        if id_index == -1 or end == -1:
+            raise ValueError("No wpTextbox1 textarea found, the page may not be an edit page")
+
+        return html.unescape(page[start:end])
+
+    def get_wikitext(self) -> str:
+        """
+        Request the wikitext of the article, based on the fetch mode
+
+        :returns the wikitext, which is also stored as self.wikitext
+        """
+        if self.fetch_mode == "sections":
+            try:
+                return self._set_wikitext(self._get_sections_wikitext())
+            except self.sections_fallback_errors:
+                # Not the layout we expect, or a section could not be requested, the whole article it is
+                pass
+        return self._set_wikitext(self._get_text(self._wikitext_url()))
+
+    async def get_wikitext_async(self, fetcher: AsyncHttpFetcher) -> str:
+        """
+        Request the wikitext of the article without blocking the event loop, see get_wikitext
+
+        :returns the wikitext, which is also stored as self.wikitext
+        """
+        if self.fetch_mode == "sections":
+            try:
+                return self._set_wikitext(await self._get_sections_wikitext_async(fetcher))
+            except self.sections_fallback_errors:
+                pass
+        return self._set_wikitext(await fetcher.get_text(self._wikitext_url()))
+
+    def _get_sections_wikitext(self) -> str:
+        revision, wanted = self.find_wanted_sections(self._get_text(self.create_sections_url(self.url)))
+        texts = [self._get_text(self.create_section_url(self.url, index, revision))
+                 for index in [0] + [index for index, _, _ in wanted]]
+        return self.join_sections(texts[0], wanted, texts[1:])
+
+    async def _get_sections_wikitext_async(self, fetcher: AsyncHttpFetcher) -> str:
+        revision, wanted = self.find_wanted_sections(await fetcher.get_text(self.create_sections_url(self.url)))
+        # The sections are requested at the same time
+        texts = await asyncio.gather(*[fetcher.get_text(self.create_section_url(self.url, index, revision))
+                                       for index in [0] + [index for index, _, _ in wanted]])
+        return self.join_sections(texts[0], wanted, texts[1:])
+
+    def _wikitext_url(self) -> str:
+        return self.url if self.fetch_mode == "edit" else self.create_raw_url(self.url)
+
+    def _set_wikitext(self, text: str) -> str:
+        self.wikitext = self.extract_text_area_text(text) if self.fetch_mode == "edit" else text
+        return self.wikitext
+
+    def generate_usable_data(self, text_area_text: str = None):
+        """"
+        Generate data based on the wikitext of the article
+
+        :param text_area_text: the wikitext, defaults to the result of get_wikitext() or the textarea of the structured
+            object
+        :returns infobox, the ndex prev/next box, raw evolution lines, forms and local dex numbers
+        :type dict, dict, list, dict, dict
+        """
+        if text_area_text is None:
+            if self.wikitext is not None:
+                text_area_text = self.wikitext
+            else:
+                text_area_text = self.structured_object.find("textarea", id="wpTextbox1").text
+
+        # Index the sections of the page once, every part of the page we need is looked up by offset from here on
+        #   and only the templates of those parts are tokenized.
+        document = WikitextDocument(text_area_text)
+
+        # Grab the Pokémon info box and the Pokémon PrevNext box, both found before the first heading
+        lead_templates = document.templates_between(0, document.lead_end)
+        info_box = find_template(lead_templates, "Pokémon Infobox")
+        prev_next_box = find_template(lead_templates, "PokémonPrevNext/Pokémon")
+
+        infobox_dict = dict(info_box.params) if info_box else {}
+        prev_next_dict = dict(prev_next_box.params) if prev_next_box else {}
+
+        # To get the evolution line we need to get another part of the page.
+        #   This is found in the ===Evolution=== section (which ends at ===Forms=== or ===Sprites===)
+        #   Grab all evo boxes if there are multiple, e.g. Evobox-2 or Evobox/1branch2
+        raw_pokemon_evolution_lines = []
+        evolution_section = document.find_section("Evolution")
+        if evolution_section:
+            for template in document.templates_in(evolution_section):
+                if template.name.lower().startswith("evobox"):
+                    raw_pokemon_evolution_lines.append(self._create_raw_evolution_line(template))
 
         # Decide if we have multiple forms to deal with, key: 'forme'
         n_forms = None if 'forme' not in infobox_dict else int(infobox_dict['forme'])
@@ -98,63 +303,60 @@ class PokedexEntryScraperPokemonBulbapedia(PokedexEntryScraper):
             #   So we need to verify whether there are actually more forms if we remove form1.
             del pokemon_forms[1]
 
-        # There are multiple text partitions called 'Pokédex entries', we only care about the one in
-        #   the 'Game data' partition, the dex data is then found in the 'Pokédex entries' partition
-        #   Remove all newlines to make splitting more consistent (as bulbapedia sometimes uses \n followed by a space)
-        game_data_partition = text_area_text.partition("==Game data==")[2].partition("==Trivia==")[0]
-        dex_partition = game_data_partition.partition("===Pokédex entries===")[2].partition("{{Dex/Footer}}")[0] \
-            .replace('\n', '') \
-            .split("|}|}")
-
-        local_dex = self._extract_local_dex_data(dex_partition)
+        # There are multiple sections called 'Pokédex entries', we only care about the one in
+        #   the 'Game data' section, the dex data is then found in the Dex/Gen templates of that section.
+        local_dex = {}
+        dex_section = document.find_section("Pokédex entries", parent=document.find_section("Game data"))
+        if dex_section:
+            local_dex = self._extract_local_dex_data(text_area_text, dex_section.content_start, dex_section.end)
 
         return infobox_dict, prev_next_dict, raw_pokemon_evolution_lines, pokemon_forms, local_dex
 
     @staticmethod
-    def _extract_local_dex_data(local_data_entries):
+    def _create_raw_evolution_line(evobox: WikitextTemplate) -> str:
+        # The evo box arguments as one line, starting with the Evobox variant:
+        #   Sample: /1branch2|type1=Rock|no1=744|name1=Rockruff|...
+        raw_evolution_line = evobox.name[len("evobox"):]
+        for key, value in evobox.arguments:
+            raw_evolution_line += "|" + (value if key is None else key + "=" + value)
+        return raw_evolution_line.replace("\n", "")
+
+    @classmethod
+    def _extract_local_dex_data(cls, text: str, start: int = 0, end: int = None) -> dict:
         # Their data works as follows:
         #   regN='region' numN='local dex number'
         #   Now sometimes regN is present without a numN to match it, meaning that the Pokémon did have a local dex
         #   description but not a local dex number. So skip those, since we only want the number.
         #   Sample: ...|reg1=Kalos|num1=025|...
+        #   All regN/numN of text[start:end] are found in one pass, the N only pairs them up within the same dex entry.
+        #   Only text[start:end] is searched, without copying it.
+        if end is None:
+            end = len(text)
 
         results = {}
 
-        region_key = "reg{}"
-        number_key = "num{}"
-        for entry in local_data_entries:
-            # Loop over all regN, take a maximum of 3 as there is yet to be a generation with more than 2 regions
-            for i in range(1, 4):
-
-                # Create the keys we are looking for, e.g. reg1 and num1
-                reg_key = region_key.format(i.__str__())
-                num_key = number_key.format(i.__str__())
-
-                # Search for the reg key, and try to grab the value between the reg key and the delimiter '|',
-                #   or the ending '}}'
-                #   Sample: ...reg1=Kalos|...
-                reg_regex = rf'{re.escape(reg_key)}=([\w]*)((\|)|(}}))'
-                reg_regex_search = re.search(reg_regex, entry)
-
-                # If reg_regex_search is not None, then it has been found
-                if reg_regex_search:
-                    region = reg_regex_search.group(1)
-
-                    # Search for the num key, and try to grab the value between the num key and the delimiter ('|'),
-                    #   or the ending '}}'
-                    #   Sample: ...num1=023|... / ...num1=026}}
-                    num_regex = rf'{re.escape(num_key)}=([\w]*)((\|)|(}}))'
-                    num_regex_search = re.search(num_regex, entry)
-
-                    # If num_regex_search is not None, then a local dex num has been found
-                    if num_regex_search:
-                        num = num_regex_search.group(1)
-                        if region in results and num not in results[region]:
-                            results[region].append(num_regex_search.group(1))
-                        else:
-                            results[region] = [num_regex_search.group(1)]
-
-                i += 1
-
-        # Remove duplicated numbers
+        # N -> [region, number] of the dex entry we are in, None until the first dex entry is found
+        entry = None
+        for match in _LOCAL_DEX_PATTERN.finditer(text, start, end):
+            if match.group("entry"):
+                cls._add_local_dex_entry(results, entry)
+                entry = {}
+            elif entry is not None:
+                pair = entry.setdefault(match.group("index"), [None, None])
+                pair[match.group("key") == "num"] = match.group("value")
+
+        cls._add_local_dex_entry(results, entry)
         return results
+
+    @staticmethod
+    def _add_local_dex_entry(results: dict, entry: dict):
+        if not entry:
+            return
+
+        for region, number in entry.values():
+            # Skip a region without a local dex number and remove duplicated numbers
+            if region is None or number is None:
+                continue
+            numbers = results.setdefault(region, [])
+            if number not in numbers:
+                numbers.append(number)
@@ -1,15 +1,17 @@
 #  Copyright (c) 2020 Aaron Beetstra
 #  All rights reserved.
 from pokemon_dex_entries.bulbapedia.pokedex_entry_bulbapedia import PokedexEntryBulbapedia
+from pokemon_dex_entries.pokedex_entry_stored import PokedexEntryStored
 
 class EntryScraperFactory():
     @classmethod
-    def create(cls, source_type: str, url: str):
+    def create(cls, source_type: str, url: str, **kwargs):
         SOURCE_TYPE_TO_CLASS_MAP = {
             'bulbapedia': PokedexEntryBulbapedia,
+            'store': PokedexEntryStored,
         }
 
         if source_type not in SOURCE_TYPE_TO_CLASS_MAP:
             raise ValueError('Invalid source type {}'.format(source_type))
 
-        return SOURCE_TYPE_TO_CLASS_MAP[source_type](url)
\ No newline at end of file
+        return SOURCE_TYPE_TO_CLASS_MAP[source_type](url, **kwargs)
\ No newline at end of file
@@ -1,11 +1,136 @@
 #  Copyright (c) 2020 Aaron Beetstra
 #  All rights reserved.
+from operator import attrgetter
 from string import ascii_uppercase
+from typing import NamedTuple
 
 from utils.evolution_line import EvolutionLine
+from utils.interning import intern_strings
+
+
+def _format_abilities(dex_entry) -> str:
+    # Example: [[Keen Eye]]<br />[[Vital Spirit]]
+    return "<br />".join("[[{}]]".format(ability) for ability in dex_entry.abilities)
+
+
+def _format_evo_in(dex_entry) -> str:
+    # Example: Raichu or when multiple: [[Flapple]]<br />[[Appletun]]
+    #   Due to the setup on our Fandom, single mons don't require the '[[' & ']]'
+    evo_in = dex_entry.evo_line.find_step(dex_entry.name).next
+
+    if len(evo_in) > 1:
+        return "<br />".join("[[{}]]".format(evolution.pokemon_name) for evolution in evo_in)
+    return evo_in[0].pokemon_name if evo_in else None
+
+
+def _format_evo_from(dex_entry) -> str:
+    evo_from = dex_entry.evo_line.find_previous(dex_entry.name)
+    return evo_from.pokemon_name if evo_from else None
+
+
+def _format_evo_line(dex_entry) -> str:
+    # Example: [[Bestand:729.png|link=Brionne]][[Bestand:730.png|link=Primarina]]
+    return "".join("[[Bestand:{ndex_number}.png|link={pkmn_name}]]".format(ndex_number=ndex_number, pkmn_name=name)
+                   for name, ndex_number in dex_entry.evo_line.yield_all_name_ndex())
+
+
+ALWAYS = True
+IF_SET = False
+
+# The fields of the Dutch wiki entry, in order: (key, source, suffix, include)
+#   source: the attribute holding the value, or a function of the PokedexEntry returning it
+#   suffix: added after the value, e.g. ' kg'
+#   include: ALWAYS, or IF_SET to leave the field out when the value is empty (None, '', [])
+# The Kalos dex is divided into smaller parts, e.g. Central, Mountain, etc.
+#   TODO: ADD dexkalos
+WIKI_ENTRY_FIELDS = (
+    ("naam", "name", "", ALWAYS),
+    ("jnaam", "japanese_name", "", ALWAYS),
+    ("ndex", "ndex_num", "", ALWAYS),
+    ("ndexvorig", "ndex_prev", "", IF_SET),
+    ("ndexvolgend", "ndex_next", "", IF_SET),
+    ("gen", "generation", "", ALWAYS),
+    ("soort", "species", " Pokémon", ALWAYS),
+    ("type", "type", "", ALWAYS),
+    ("type2", "type2", "", IF_SET),
+    ("dexkanto", "kanto_num", "", IF_SET),
+    ("dexjohto", "johto_num", "", IF_SET),
+    ("dexhoenn", "hoenn_num", "", IF_SET),
+    ("dexsinnoh", "sinnoh_num", "", IF_SET),
+    ("dexunova", "unova_num", "", IF_SET),
+    ("dexalola", "alola_num", "", IF_SET),
+    ("dexgalar", "galar_num", "", IF_SET),
+    ("metgewicht", "met_weight", " kg", ALWAYS),
+    ("metlengte", "met_height", " m", ALWAYS),
+    ("imgewicht", "imp_weight", " lbs.", ALWAYS),
+    ("imlengte", "imp_height", "", ALWAYS),
+    ("lichaam", "body", "", ALWAYS),
+    ("kleur", "color", "", ALWAYS),
+    ("gave", _format_abilities, "", ALWAYS),
+    ("dw", "hidden_ability", "", IF_SET),
+    ("mannelijk", "percent_male", "", IF_SET),
+    ("ei1", lambda dex_entry: dex_entry.egg_groups[0] if dex_entry.egg_groups else None, "", IF_SET),
+    ("ei2", lambda dex_entry: dex_entry.egg_groups[1] if len(dex_entry.egg_groups or ()) > 1 else None, "", IF_SET),
+    ("evoin", _format_evo_in, "", IF_SET),
+    ("evovan", _format_evo_from, "", IF_SET),
+    ("evo", _format_evo_line, "", ALWAYS),
+)
+
+# The keys of WIKI_ENTRY_FIELDS of which a form has a value of its own (see PokedexFormEntry), a form shares the other
+#   fields with its base entry, so their lines are rendered once for all forms
+FORM_WIKI_ENTRY_KEYS = ("ndex", "type", "type2", "metgewicht", "metlengte", "imgewicht", "imlengte", "gave", "dw")
+
+
+def compile_wiki_entry_fields(fields: tuple) -> tuple:
+    """
+    Compile a field table (see WIKI_ENTRY_FIELDS) once into what the renderer loops over
+
+    :returns tuple of (line prefix, value getter, suffix including the newline, include always)
+    """
+    compiled = []
+    for key, source, suffix, include in fields:
+        # All keys are padded to the longest key, e.g. '| naam        = '
+        line_prefix = "| {:<11} = ".format(key)
+        get_value = attrgetter(source) if isinstance(source, str) else source
+        compiled.append((line_prefix, get_value, suffix + "\n", include))
+    return tuple(compiled)
+
+
+_COMPILED_WIKI_ENTRY_FIELDS = compile_wiki_entry_fields(WIKI_ENTRY_FIELDS)
+# The positions of the form fields in WIKI_ENTRY_FIELDS, and those fields compiled
+_FORM_FIELD_INDEXES = tuple(index for index, field in enumerate(WIKI_ENTRY_FIELDS) if field[0] in FORM_WIKI_ENTRY_KEYS)
+_COMPILED_FORM_FIELDS = tuple(_COMPILED_WIKI_ENTRY_FIELDS[index] for index in _FORM_FIELD_INDEXES)
+
+
+class PokedexFormEntry(NamedTuple):
+    """The form depending characteristics of a form of a Pokémon"""
+    form_name: str
+    types: list
+    abilities: list
+    hidden_ability: str
+    met_height: str
+    met_weight: str
+    imp_height: str
+    imp_weight: str
+
+    @classmethod
+    def create(cls, **fields):
+        # Intern the strings, like the fields of a PokedexEntry
+        return cls(**{field: intern_strings(value) for field, value in fields.items()})
 
 
 class PokedexEntry:
+    """
+    All characteristics of a Pokémon, with its forms
+
+    The fields are slots, string values are interned (see utils/interning.py) so a full dex held in memory stays small.
+    """
+    __slots__ = ("name", "form_name", "japanese_name", "generation", "species", "type", "type2", "abilities",
+                 "hidden_ability", "ndex_num", "ndex_next", "ndex_prev", "evo_line", "percent_male", "met_height",
+                 "met_weight", "imp_height", "imp_weight", "egg_groups", "forms", "color", "body", "kanto_num",
+                 "johto_num", "hoenn_num", "sinnoh_num", "unova_num", "kalos_num", "alola_num", "galar_num",
+                 "_resolvers")
+
     prefix = "{{PokémonInfobox\n"
     suffix = "}}"
 
@@ -13,6 +138,11 @@ class PokedexEntry:
     delimiter_multi_forms = "|-|\n"
     suffix_multi_forms = "</tabber></div>"
 
+    # The fields a form has in common with its base entry
+    form_shared_fields = ("name", "japanese_name", "generation", "species", "ndex_next", "ndex_prev", "evo_line",
+                          "percent_male", "egg_groups", "color", "body", "kanto_num", "johto_num", "hoenn_num",
+                          "sinnoh_num", "unova_num", "kalos_num", "alola_num", "galar_num")
+
     def __init__(self,
                  name: str,
                  form_name: str,
@@ -43,46 +173,107 @@ class PokedexEntry:
                  kalos_num: str,
                  alola_num: str,
                  galar_num: str):
-        self.name = name
-        self.form_name = form_name
-        self.japanese_name = japanse_name
-        self.generation = generation
-        self.species = species
-        self.type = type
-        self.type2 = type2
-        self.abilities = abilities
-        self.hidden_ability = hidden_ability
-        self.ndex_num = ndex_num
-        self.ndex_next = ndex_next
-        self.ndex_prev = ndex_prev
+        self.name = intern_strings(name)
+        self.form_name = intern_strings(form_name)
+        self.japanese_name = intern_strings(japanse_name)
+        self.generation = intern_strings(generation)
+        self.species = intern_strings(species)
+        self.type = intern_strings(type)
+        self.type2 = intern_strings(type2)
+        self.abilities = intern_strings(abilities)
+        self.hidden_ability = intern_strings(hidden_ability)
+        self.ndex_num = intern_strings(ndex_num)
+        self.ndex_next = intern_strings(ndex_next)
+        self.ndex_prev = intern_strings(ndex_prev)
         self.evo_line = evo_line
         self.percent_male = percent_male
-        self.met_height = met_height
-        self.met_weight = met_weight
-        self.imp_height = imp_height
-        self.imp_weight = imp_weight
-        self.egg_groups = egg_groups
+        self.met_height = intern_strings(met_height)
+        self.met_weight = intern_strings(met_weight)
+        self.imp_height = intern_strings(imp_height)
+        self.imp_weight = intern_strings(imp_weight)
+        self.egg_groups = intern_strings(egg_groups)
         self.forms = []
-        self.color = color
-        self.body = body
-        self.kanto_num = kanto_num
-        self.johto_num = johto_num
-        self.hoenn_num = hoenn_num
-        self.sinnoh_num = sinnoh_num
-        self.unova_num = unova_num
-        self.kalos_num = kalos_num
-        self.alola_num = alola_num
-        self.galar_num = galar_num
+        self.color = intern_strings(color)
+        self.body = intern_strings(body)
+        self.kanto_num = intern_strings(kanto_num)
+        self.johto_num = intern_strings(johto_num)
+        self.hoenn_num = intern_strings(hoenn_num)
+        self.sinnoh_num = intern_strings(sinnoh_num)
+        self.unova_num = intern_strings(unova_num)
+        self.kalos_num = intern_strings(kalos_num)
+        self.alola_num = intern_strings(alola_num)
+        self.galar_num = intern_strings(galar_num)
+        self._resolvers = None
+
+    @classmethod
+    def create_lazy(cls, **resolvers):
+        """
+        Create a PokedexEntry of which every field is only resolved once it is used
+        resolvers: attribute name -> callable returning its value, e.g. type2=parser.parse_pokemon_types...
+
+        :returns PokedexEntry
+        """
+        pokedex_entry = cls.__new__(cls)
+        pokedex_entry.forms = []
+        pokedex_entry._resolvers = resolvers
+        return pokedex_entry
+
+    def __getattr__(self, item):
+        # Only called for fields that are not set (yet), resolve a lazy field and keep its value
+        resolvers = self._resolvers if item != "_resolvers" else None
+        if resolvers is None or item not in resolvers:
+            raise AttributeError("'{}' object has no attribute '{}'".format(type(self).__name__, item))
+
+        value = intern_strings(resolvers.pop(item)())
+        setattr(self, item, value)
+        if not resolvers:
+            # Everything is resolved, drop the resolvers and with them the parser they belong to
+            self._resolvers = None
+        return value
+
+    def resolve(self):
+        """
+        Resolve all lazy fields that are not resolved yet, after which the entry no longer holds on to its parser
+            (e.g. when keeping many entries in memory)
+        """
+        while self._resolvers:
+            getattr(self, next(iter(self._resolvers)))
+
+    def to_dict(self) -> dict:
+        """
+        All fields as plain data (resolving the lazy ones), e.g. to store the entry as JSON
+            The evolution line is stored as its steps (see EvolutionLine.to_steps), the forms as dicts of their fields.
+
+        :returns dict of field name -> value
+        """
+        data = {field: getattr(self, field) for field in self.__slots__ if field not in ("_resolvers", "forms")}
+        data["evo_line"] = self.evo_line.to_steps() if self.evo_line else None
+        data["forms"] = [form._asdict() for form in self.forms]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict, evo_line: EvolutionLine = None):
+        """
+        Create a PokedexEntry from the data created by to_dict
+        evo_line: the evolution line to use instead of creating one from the stored steps, e.g. one shared by the
+            entries of a family
+
+        :returns PokedexEntry
+        """
+        pokedex_entry = cls.__new__(cls)
+        for field in cls.__slots__:
+            if field not in ("_resolvers", "forms", "evo_line"):
+                setattr(pokedex_entry, field, intern_strings(data.get(field)))
+        if evo_line is None and data.get("evo_line"):
+            evo_line = EvolutionLine.from_steps(data["evo_line"])
+        pokedex_entry.evo_line = evo_line
+        pokedex_entry.forms = [PokedexFormEntry.create(**form) for form in data.get("forms", [])]
+        pokedex_entry._resolvers = None
+        return pokedex_entry
 
     def add_forms(self, forms: list):
         self.forms = self.forms + forms
 
-    def _build_name(self):
-        # Key: naam
-        # Value: provided: str - Required: str
-        name_entry = "| naam        = {}\n".format(self.name)
-        return name_entry
-
     def build_form_name(self):
         # Format: {form_name}=\n
         # Value: provided: str - Required: str
@@ -92,334 +283,48 @@ class PokedexEntry:
         form_name_entry = "{}=\n".format(f_name)
         return form_name_entry
 
-    def _build_japanese_name(self):
-        # Key: jnaam
-        # Value: provided: str - Required: str
-        japanese_name_entry = "| jnaam       = {}\n".format(self.japanese_name)
-        return japanese_name_entry
-
-    def _build_national_dex_number(self):
-        # Key: ndex
-        # Value: provided: str - Required: str
-        national_dex_entry = "| ndex        = {}\n".format(self.ndex_num)
-        return national_dex_entry
-
-    def _build_prev_national_dex_number(self):
-        # Key: ndexvorig
-        # Value: provided: str - Required: str
-        prev_national_dex_entry = "| ndexvorig   = {}\n".format(self.ndex_prev)
-        return prev_national_dex_entry
-
-    def _build_next_national_dex_number(self):
-        # Key: ndexvolgend
-        # Value: provided: str - Required: str
-        next_national_dex_entry = "| ndexvolgend = {}\n".format(self.ndex_next)
-        return next_national_dex_entry
-
-    def _build_generation(self):
-        # Key: gen
-        # Value: provided: str - Required: str
-        generation_dex_entry = "| gen         = {}\n".format(self.generation)
-        return generation_dex_entry
-
-    def _build_species(self):
-        # Key: soort
-        # Value: provided: str (species only) - Required: str ('Species' Pokémon), so add ' Pokémon'
-        species_dex_entry = "| soort       = {} Pokémon\n".format(self.species)
-        return species_dex_entry
+    def create_dutch_wiki_entry(self) -> str:
+        return "".join(self.iter_dutch_wiki_entry())
 
-    def _build_primary_type(self):
-        # Key: type
-        # Value: provided: str - Required: str
-        primary_type_dex_entry = "| type        = {}\n".format(self.type)
-        return primary_type_dex_entry
-
-    def _build_secondary_type(self):
-        # Key: type2
-        # Value: provided: str - Required: str
-        secondary_type_dex_entry = "| type2       = {}\n".format(self.type2)
-        return secondary_type_dex_entry
-
-    def _build_metric_weight(self):
-        # Key: metgewicht
-        # Value: provided: str - Required: str ('weight' kg), so add ' kg'
-        metric_weight_dex_entry = "| metgewicht  = {} kg\n".format(self.met_weight)
-        return metric_weight_dex_entry
-
-    def _build_metric_length(self):
-        # Key: metlengte
-        # Value: provided: str - Required: str ('length' m), so add ' m'
-        metric_length_dex_entry = "| metlengte   = {} m\n".format(self.met_height)
-        return metric_length_dex_entry
-
-    def _build_imperial_weight(self):
-        # Key: imgewicht
-        # Value: provided: str - Required: str ('length' lbs.), so add ' lbs.'
-        imperial_weight_dex_entry = "| imgewicht   = {} lbs.\n".format(self.imp_weight)
-        return imperial_weight_dex_entry
-
-    def _build_imperial_length(self):
-        # Key: imlengte
-        # Value: provided: str - Required: str
-        imperial_length_dex_entry = "| imlengte    = {}\n".format(self.imp_height)
-        return imperial_length_dex_entry
-
-    def _build_abilities(self):
-        # Key: gave
-        # Value: provided: List - Required: str
-        abilities_dex_entry = "| gave        = "
-        for i in range(len(self.abilities)):
-            abilities_dex_entry += "[[{}]]".format(self.abilities[i])
-
-            if i + 1 < len(self.abilities):
-                abilities_dex_entry += "<br />"
-        abilities_dex_entry += "\n"
-        return abilities_dex_entry
-
-    def _build_hidden_ability(self):
-        # Key: dw
-        # Value: provided: str - Required: str
-        hidden_ability_dex_entry = "| dw          = {}\n".format(self.hidden_ability)
-        return hidden_ability_dex_entry
-
-    def _build_male_percentage(self):
-        # Key: mannelijk
-        # Value: provided: str - Required: str
-        male_percentage_dex_entry = "| mannelijk   = {}\n".format(self.percent_male)
-        return male_percentage_dex_entry
-
-    def _build_egg1(self):
-        # Key: ei1
-        # Value: provided: str - Required: str
-        egg1_dex_entry = "| ei1         = {}\n".format(self.egg_groups[0])
-        return egg1_dex_entry
-
-    def _build_egg2(self):
-        # Key: ei2
-        # Value: provided: str - Required: str
-        egg2_dex_entry = "| ei2         = {}\n".format(self.egg_groups[1])
-        return egg2_dex_entry
-
-    def _build_evo_in(self):
-        # Key: evoin
-        # Value: provided: str - Required: str
-        # Example: Raichu or when multiple: [[Flapple]]<br />[[Appletun]]
-        #   Due to the setup on our Fandom, single mons don't require the '[[' & ']]'
-        current_step = EvolutionLine.find_evolution_step(self.evo_line.first, self.name)
-        evo_in = current_step.next
-
-        if evo_in:
-            evo_in_dex_entry = "| evoin       = "
-            if len(evo_in) > 1:
-                for i in range(len(evo_in)):
-                    evo_in_dex_entry += "[[{}]]".format(evo_in[i].pokemon_name)
-
-                    if i + 1 < len(evo_in):
-                        evo_in_dex_entry += "<br />"
-            else:
-                evo_in_dex_entry += "{}".format(evo_in[0].pokemon_name)
-            evo_in_dex_entry += "\n"
-            return evo_in_dex_entry
-        return ""
-
-    def _build_evo_from(self):
-        # Key: evovan
-        # Value: provided: str - Required: str
-        evo_from = EvolutionLine.previous_step(self.evo_line.first, self.name)
-
-        if evo_from:
-            evo_from_dex_entry = "| evovan      = {}\n".format(evo_from.pokemon_name)
-            return evo_from_dex_entry
-        return ""
-
-    def _build_evo_line(self):
-        # Key: evo
-        # Value: provided: tuple(name, ndex) -
-        #   Required: [[Bestand:729.png|link=Brionne]][[Bestand:730.png|link=Primarina]]
-
-        evo_line_dex_entry = "| evo         = "
-
-        link_frame = "[[Bestand:{ndex_number}.png|link={pkmn_name}]]"
-
-        for name, ndex_number in self.evo_line.yield_all_name_ndex():
-            link = link_frame.format(ndex_number=ndex_number, pkmn_name=name)
-            evo_line_dex_entry += link
-
-        evo_line_dex_entry += "\n"
-        return evo_line_dex_entry
-
-    def _build_color(self):
-        # Key: kleur
-        # Value: provided: str - Required: str
-        color_entry = "| kleur       = {}\n".format(self.color)
-        return color_entry
-
-    def _build_body(self):
-        # Key: lichaam
-        # Value: provided: str - Required: str
-        body_entry = "| lichaam     = {}\n".format(self.body)
-        return body_entry
-
-    def _build_kanto_dex(self):
-        # Key: dexkanto
-        # Value: provided: str - Required: str
-        kanto_dex_num_entry = "| dexkanto    = {}\n".format(self.kanto_num)
-        return kanto_dex_num_entry
-
-    def _build_johto_dex(self):
-        # Key: dexjohto
-        # Value: provided: str - Required: str
-        johto_dex_num_entry = "| dexjohto    = {}\n".format(self.johto_num)
-        return johto_dex_num_entry
-
-    def _build_hoenn_dex(self):
-        # Key: dexhoenn
-        # Value: provided: str - Required: str
-        hoenn_dex_num_entry = "| dexhoenn    = {}\n".format(self.hoenn_num)
-        return hoenn_dex_num_entry
-
-    def _build_sinnoh_dex(self):
-        # Key: dexsinnoh
-        # Value: provided: str - Required: str
-        sinnoh_dex_num_entry = "| dexsinnoh   = {}\n".format(self.sinnoh_num)
-        return sinnoh_dex_num_entry
-
-    def _build_unova_dex(self):
-        # Key: dexunova
-        # Value: provided: str - Required: str
-        unova_dex_num_entry = "| dexunova    = {}\n".format(self.unova_num)
-        return unova_dex_num_entry
-
-    def _build_kalos_dex(self):
-        # The Kalos dex is divided into smaller parts, e.g. Central, Mountain, etc.
-        # TODO: ADD THIS
-        raise NotImplementedError()
-
-    def _build_alola_dex(self):
-        # Key: dexalola
-        # Value: provided: str - Required: str
-        alola_dex_num_entry = "| dexalola    = {}\n".format(self.alola_num)
-        return alola_dex_num_entry
-
-    def _build_galar_dex(self):
-        # Key: dexgalar
-        # Value: provided: str - Required: str
-        galar_dex_num_entry = "| dexgalar    = {}\n".format(self.galar_num)
-        return galar_dex_num_entry
-
-    def create_dutch_wiki_entry(self):
+    def write_dutch_wiki_entry(self, fp):
+        """Write the Dutch wiki entry to the (text) file handle fp, chunk by chunk"""
+        fp.writelines(self.iter_dutch_wiki_entry())
 
+    def iter_dutch_wiki_entry(self):
+        """
+        Yields the Dutch wiki entry in chunks (an infobox per form), without building the whole entry as one string
+        """
         if self.forms:
-            return self._create_dutch_wiki_entry_forms()
-        return self._create_dutch_wiki_entry()
-
-    def _create_dutch_wiki_entry(self):
-
-        wiki_entry = ""
-
-        # Add the prefix
-        wiki_entry += self.prefix
+            yield from self._iter_dutch_wiki_entry_forms()
+        else:
+            yield from self._iter_dutch_wiki_entry()
 
-        # Add the name
-        wiki_entry += self._build_name()
+    def _iter_dutch_wiki_entry(self):
+        yield self._join_infobox(self._render_fields(_COMPILED_WIKI_ENTRY_FIELDS))
 
-        # Add japanese name
-        wiki_entry += self._build_japanese_name()
+    def _render_fields(self, compiled_fields: tuple) -> list:
+        # A single loop over the compiled field table (see WIKI_ENTRY_FIELDS), a line per field, '' for a field that is
+        #   left out
+        lines = []
+        for line_prefix, get_value, suffix, always in compiled_fields:
+            value = get_value(self)
+            lines.append(line_prefix + str(value) + suffix if always or value else "")
+        return lines
 
-        # Add ndex number
-        wiki_entry += self._build_national_dex_number()
+    def _join_infobox(self, lines: list) -> str:
+        return self.prefix + "".join(lines) + self.suffix
 
-        # Check if we need to add ndex prev
-        if self.ndex_prev:
-            wiki_entry += self._build_prev_national_dex_number()
-
-        # Check if we need to add ndex next
-        if self.ndex_next:
-            wiki_entry += self._build_next_national_dex_number()
-
-        # Add generation
-        wiki_entry += self._build_generation()
-
-        # Add species
-        wiki_entry += self._build_species()
-
-        # Add type
-        wiki_entry += self._build_primary_type()
-
-        # Add type2 if applicable
-        if self.type2:
-            wiki_entry += self._build_secondary_type()
-
-        # Add regional dex numbers, when applicable
-        if self.kanto_num:
-            wiki_entry += self._build_kanto_dex()
-        if self.johto_num:
-            wiki_entry += self._build_johto_dex()
-        if self.hoenn_num:
-            wiki_entry += self._build_hoenn_dex()
-        if self.sinnoh_num:
-            wiki_entry += self._build_sinnoh_dex()
-        if self.unova_num:
-            wiki_entry += self._build_unova_dex()
-        if self.alola_num:
-            wiki_entry += self._build_alola_dex()
-        if self.galar_num:
-            wiki_entry += self._build_galar_dex()
-
-        # Add metric weight
-        wiki_entry += self._build_metric_weight()
-        # Add metric height
-        wiki_entry += self._build_metric_length()
-        # Add imperial weight
-        wiki_entry += self._build_imperial_weight()
-        # Add imperial height
-        wiki_entry += self._build_imperial_length()
-
-        # Add body
-        wiki_entry += self._build_body()
-
-        # Add color
-        wiki_entry += self._build_color()
-
-        # Abilities
-        wiki_entry += self._build_abilities()
-
-        # Hidden ability (if applicable)
-        if self.hidden_ability:
-            wiki_entry += self._build_hidden_ability()
-
-        # Gender (if applicable)
-        if self.percent_male:
-            wiki_entry += self._build_male_percentage()
-
-        # Egg groups (if applicable)
-        if self.egg_groups:
-            wiki_entry += self._build_egg1()
-            if self.egg_groups.__len__() > 1:
-                wiki_entry += self._build_egg2()
-
-        # Evolutions
-        wiki_entry += self._build_evo_in()
-        wiki_entry += self._build_evo_from()
-        wiki_entry += self._build_evo_line()
-
-        # And add the suffix
-        wiki_entry += self.suffix
-
-        return wiki_entry
-
-    def _create_dutch_wiki_entry_forms(self):
-
-        wiki_entry = ""
+    def _iter_dutch_wiki_entry_forms(self):
 
         # Add the tabber
-        wiki_entry += self.prefix_multi_forms
+        yield self.prefix_multi_forms
 
         # Add the form name
-        wiki_entry += self.build_form_name()
+        yield self.build_form_name()
 
         # Add the base form
-        wiki_entry += self._create_dutch_wiki_entry()
+        lines = self._render_fields(_COMPILED_WIKI_ENTRY_FIELDS)
+        yield self._join_infobox(lines)
 
         # Add forms
 
@@ -431,49 +336,39 @@ class PokedexEntry:
         for form in self.forms:
 
             # Add delimiter
-            wiki_entry += self.delimiter_multi_forms
-            form_entry = PokedexEntry(
-                self.name,
-                form["form"],
-                self.japanese_name,
-                self.generation,
-                self.species,
-                form["type"][0],
-                form["type"][1],
-                form["ability"],
-                form["h_ability"],
-                self.ndex_num + ascii_uppercase[n_ndex_suffix],
-                self.ndex_next,
-                self.ndex_prev,
-                self.evo_line,
-                self.percent_male,
-                form["met_height"],
-                form["met_weight"],
-                form["imp_height"],
-                form["imp_weight"],
-                self.egg_groups,
-                self.color,
-                self.body,
-                self.kanto_num,
-                self.johto_num,
-                self.hoenn_num,
-                self.sinnoh_num,
-                self.unova_num,
-                self.kalos_num,
-                self.alola_num,
-                self.galar_num
-            )
+            yield self.delimiter_multi_forms
+            form_entry = self._create_form_entry(form, self.ndex_num + ascii_uppercase[n_ndex_suffix])
 
             # Add next form name
-            wiki_entry += form_entry.build_form_name()
+            yield form_entry.build_form_name()
 
-            # Build the form data
-            wiki_entry += form_entry.create_dutch_wiki_entry()
+            # Build the form data, only the form fields are rendered again
+            form_lines = list(lines)
+            for index, line in zip(_FORM_FIELD_INDEXES, form_entry._render_fields(_COMPILED_FORM_FIELDS)):
+                form_lines[index] = line
+            yield self._join_infobox(form_lines)
 
             # Go to the next letter (no need to check bounds, since no Pokémon has more than 25 forms)
             n_ndex_suffix += 1
 
         # Add suffix
-        wiki_entry += self.suffix_multi_forms
-
-        return wiki_entry
+        yield self.suffix_multi_forms
+
+    def _create_form_entry(self, form: PokedexFormEntry, ndex_num: str):
+        # A form shares all fields with this entry, except the form depending ones. The shared fields reference the
+        #   values of this entry, only the form depending ones are set.
+        form_entry = type(self).__new__(type(self))
+        for field in self.form_shared_fields:
+            setattr(form_entry, field, getattr(self, field))
+        form_entry._resolvers = None
+        form_entry.forms = []
+        form_entry.form_name = form.form_name
+        form_entry.type, form_entry.type2 = form.types
+        form_entry.abilities = form.abilities
+        form_entry.hidden_ability = form.hidden_ability
+        form_entry.ndex_num = ndex_num
+        form_entry.met_height = form.met_height
+        form_entry.met_weight = form.met_weight
+        form_entry.imp_height = form.imp_height
+        form_entry.imp_weight = form.imp_weight
+        return form_entry
@@ -0,0 +1,213 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import asyncio
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from pokemon_dex_entries.bulbapedia.pokedex_entry_scraper_bulbapedia import PokedexEntryScraperPokemonBulbapedia
+from pokemon_dex_entries.entry_scraper_factory import EntryScraperFactory
+from pokemon_dex_entries.pokedex_entry_store import PokedexEntryStore
+from pokemon_lists.list_scraper_serebii import ListScraperSerebii
+from utils.async_http_fetcher import AsyncHttpFetcher
+from utils.atomic_file import open_atomic
+from utils.generation_ndex_range import GENERATION_TO_NDEX_RANGE
+from utils.http_fetcher import HttpFetcher
+
+
+class PokedexEntryBatchResult:
+    """The outcome of generating a single entry during a batch run"""
+
+    def __init__(self, source: str, output_path: str = None, error: Exception = None):
+        self.source = source
+        self.output_path = output_path
+        self.error = error
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+class PokedexEntryBatch:
+    """
+    Generate many Pokédex entries at once
+
+    Every source (url) is set up and converted to a template on a bounded pool of workers, each entry is written to
+        its own file inside the output directory.
+    entry_options are passed on to the entry class of the source type, e.g. {"fetch_mode": "edit"} for Bulbapedia.
+    When a store is given, every generated entry is stored in it as well (with its source, and its revision when
+        revisions has one for the source), so it can be rendered again later without scraping it again.
+    """
+
+    def __init__(self, sources: list, source_type: str = "bulbapedia", output_dir: str = "output",
+                 max_workers: int = 4, fetcher: HttpFetcher = None, entry_options: dict = None,
+                 store: PokedexEntryStore = None, revisions: dict = None):
+        self.sources = sources
+        self.source_type = source_type
+        self.output_dir = output_dir
+        self.max_workers = max_workers
+        self.fetcher = fetcher
+        self.entry_options = entry_options if entry_options else {}
+        self.store = store
+        self.revisions = revisions if revisions else {}
+
+    def run(self) -> list:
+        """
+        Generate all entries
+
+        :returns a PokedexEntryBatchResult for every source, in the same order as the sources
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self._process, self.sources))
+
+    def run_async(self, fetcher: AsyncHttpFetcher = None) -> list:
+        """
+        Generate all entries on an event loop: the pages of all sources are requested concurrently (bounded by the
+            concurrency of fetcher, which wraps the fetcher of the batch by default), while the scraping, parsing and
+            writing runs on max_workers threads
+
+        :returns a PokedexEntryBatchResult for every source, in the same order as the sources
+        """
+        return asyncio.run(self._run_async(fetcher))
+
+    async def _run_async(self, fetcher: AsyncHttpFetcher) -> list:
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        async_fetcher = fetcher if fetcher else AsyncHttpFetcher(self.fetcher)
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                return list(await asyncio.gather(*(self._process_async(source, async_fetcher, executor)
+                                                   for source in self.sources)))
+        finally:
+            if fetcher is None:
+                async_fetcher.close()
+
+    def _create_entry(self, source: str):
+        return EntryScraperFactory().create(source_type=self.source_type, url=source, fetcher=self.fetcher,
+                                            **self.entry_options)
+
+    def _process(self, source: str) -> PokedexEntryBatchResult:
+        try:
+            scraper_class = self._create_entry(source)
+            scraper_class.setup()
+            return self._write(source, scraper_class.dex_entry, scraper_class.write_template)
+        except Exception as e:
+            return PokedexEntryBatchResult(source, error=e)
+
+    async def _process_async(self, source: str, fetcher: AsyncHttpFetcher,
+                             executor: ThreadPoolExecutor) -> PokedexEntryBatchResult:
+        try:
+            scraper_class = self._create_entry(source)
+            await scraper_class.setup_async(fetcher, executor)
+            # Rendering resolves the lazy fields of the entry, which is where most of the parsing happens
+            return await asyncio.get_running_loop().run_in_executor(executor, self._write, source,
+                                                                    scraper_class.dex_entry,
+                                                                    scraper_class.write_template)
+        except Exception as e:
+            return PokedexEntryBatchResult(source, error=e)
+
+    def _write(self, source: str, dex_entry, write_template) -> PokedexEntryBatchResult:
+        # The template is streamed to its file by write_template(fp), which only replaces the file once the whole entry
+        #   is rendered (the lazy fields are parsed while rendering, a failing entry leaves no partial file behind)
+        output_path = os.path.join(self.output_dir, self.create_output_file_name(dex_entry))
+        with open_atomic(output_path) as text_file:
+            write_template(text_file)
+
+        if self.store is not None:
+            self.store.put(dex_entry, source, self.revisions.get(source))
+
+        return PokedexEntryBatchResult(source, output_path=output_path)
+
+    @staticmethod
+    def create_output_file_name(dex_entry) -> str:
+        # E.g. 744_Rockruff.txt, characters that are not safe in a file name are replaced (Type: Null, Nidoran♀)
+        name = re.sub(r'[^\w\-. ]', '_', dex_entry.name)
+        return "{}_{}.txt".format(dex_entry.ndex_num, name)
+
+    @staticmethod
+    def create_report(results: list) -> str:
+        lines = []
+        for result in results:
+            if result.succeeded:
+                lines.append("OK     {} -> {}".format(result.source, result.output_path))
+            else:
+                lines.append("FAILED {} ({}: {})".format(result.source, type(result.error).__name__, result.error))
+
+        n_failed = sum(1 for result in results if not result.succeeded)
+        lines.append("{} succeeded, {} failed".format(len(results) - n_failed, n_failed))
+        return "\n".join(lines)
+
+
+def split_changed_sources(sources: list, revisions: dict, stored_revisions: dict) -> tuple:
+    """
+    Split the sources of an incremental run into the ones that have to be scraped again and the ones that did not change
+        since they were stored
+    revisions: source -> current revision of the page, stored_revisions: source -> revision when it was stored
+
+    A source is only unchanged when both revisions are known and equal, new sources and pages of which the revision is
+        unknown are always scraped.
+
+    :returns (changed sources, unchanged sources), both in the order of sources
+    """
+    changed = []
+    unchanged = []
+    for source in sources:
+        revision = revisions.get(source)
+        if revision is not None and stored_revisions.get(source) == revision:
+            unchanged.append(source)
+        else:
+            changed.append(source)
+    return changed, unchanged
+
+
+def read_sources_file(path: str) -> list:
+    """
+    Read the sources of a batch run from a file
+
+    Every line contains either a url or a Pokémon name (which is converted to its Bulbapedia edit page url), empty
+        lines and lines starting with '#' are skipped.
+    """
+    sources = []
+    with open(path, "r", encoding='utf8') as sources_file:
+        for line in sources_file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("http://") or line.startswith("https://"):
+                sources.append(line)
+            else:
+                sources.append(PokedexEntryScraperPokemonBulbapedia.create_edit_url(line))
+    return sources
+
+
+def parse_ndex_range(ndex_range: str) -> tuple:
+    """
+    Parse a national dex range, e.g. '1-151' or '25'
+
+    :returns (first, last), both inclusive
+    """
+    first, _, last = ndex_range.partition("-")
+    first = int(first)
+    last = int(last) if last else first
+    if first < 1 or last < first:
+        raise ValueError('Invalid national dex range {}'.format(ndex_range))
+    return first, last
+
+
+def sources_from_ndex_range(first: int, last: int, fetcher: HttpFetcher = None) -> list:
+    """
+    Create the Bulbapedia urls for a national dex range
+
+    The names belonging to the dex numbers are looked up in the Serebii generation lists, only the generations
+        overlapping the range are requested.
+    """
+    pokemon = []
+    for generation, (gen_first, gen_last) in GENERATION_TO_NDEX_RANGE.items():
+        if gen_first <= last and first <= gen_last:
+            list_scraper = ListScraperSerebii(ListScraperSerebii.create_generation_url(generation), fetcher)
+            pokemon += [pkmn for pkmn in list_scraper.parse_pokemon() if first <= pkmn.ndex_no <= last]
+
+    pokemon.sort(key=lambda pkmn: pkmn.ndex_no)
+    return [PokedexEntryScraperPokemonBulbapedia.create_edit_url(pkmn.pkmn_name) for pkmn in pokemon]
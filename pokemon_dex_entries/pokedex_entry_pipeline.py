@@ -0,0 +1,227 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import NamedTuple
+
+from pokemon_dex_entries.bulbapedia.pokedex_entry_bulbapedia import PokedexEntryBulbapedia
+from pokemon_dex_entries.bulbapedia.pokedex_entry_scraper_bulbapedia import PokedexEntryScraperPokemonBulbapedia
+from pokemon_dex_entries.pokedex_entry import PokedexEntry
+from pokemon_dex_entries.pokedex_entry_batch import PokedexEntryBatch, PokedexEntryBatchResult
+from pokemon_dex_entries.pokedex_entry_store import PokedexEntryStore
+from utils.evolution_graph_store import EvolutionGraphStore, get_default_evolution_graph_store
+from utils.evolution_line import EvolutionLine
+from utils.http_fetcher import HttpFetcher
+from utils.translation_cache import TranslationCache, get_default_translation_cache
+
+
+class ParsedPokedexEntry(NamedTuple):
+    """
+    The outcome of the parse stage, plain data so it can be sent back from a worker process
+
+    data: the fields of the PokedexEntry, see PokedexEntry.to_dict
+    raw_evolution_lines: the raw evolution lines the evolution line was parsed from, None when it was not parsed
+        from them (see PokedexEntryParserPokemonStrategyBulbapedia.unparsable_evo_lines)
+    translations: the translations the worker requested while parsing, stored by the main process
+    started_at, finished_at: when the parsing started and finished (time.time(), comparable between processes)
+    """
+    data: dict
+    raw_evolution_lines: tuple
+    translations: dict
+    started_at: float
+    finished_at: float
+
+
+class PipelineStageStats:
+    """The number of pages a stage handled, the time it spent on them and the period it was active"""
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.pages = 0
+        self.busy = 0.0
+        self.first_start = None
+        self.last_finish = None
+
+        self._lock = threading.Lock()
+
+    def add(self, started_at: float, finished_at: float, pages: int = 1):
+        with self._lock:
+            self.pages += pages
+            self.busy += finished_at - started_at
+            self.first_start = started_at if self.first_start is None else min(self.first_start, started_at)
+            self.last_finish = finished_at if self.last_finish is None else max(self.last_finish, finished_at)
+
+    @property
+    def pages_per_second(self) -> float:
+        if not self.pages or self.last_finish <= self.first_start:
+            return 0.0
+        return self.pages / (self.last_finish - self.first_start)
+
+    def __str__(self):
+        return "{:<6} {:5} pages, {:8.1f} pages/s, {:7.2f} s busy over {} worker(s)".format(
+            self.name, self.pages, self.pages_per_second, self.busy, self.workers)
+
+
+# The translator and evolution graph store of a parse worker process, created once by _initialize_parse_worker
+_worker_translator = None
+_worker_evolution_graph_store = None
+
+
+def _initialize_parse_worker(translator_options: dict, evolution_graph_path: str):
+    global _worker_translator, _worker_evolution_graph_store
+    # Reads the translations file, the translations the worker requests are sent back with every entry and stored by
+    #   the main process (see PokedexEntryPipeline._render), workers never write the file
+    _worker_translator = TranslationCache(**translator_options, write_back=False)
+    # Only read, the families are stored by the main process (see PokedexEntryPipeline._render)
+    _worker_evolution_graph_store = EvolutionGraphStore(evolution_graph_path)
+
+
+def parse_wikitext(source: str, wikitext: str) -> ParsedPokedexEntry:
+    """
+    The parse stage, run in a worker process: scrape the wikitext and parse every characteristic of the entry
+
+    :returns ParsedPokedexEntry
+    """
+    started_at = time.time()
+
+    scraper = PokedexEntryScraperPokemonBulbapedia(source)
+    scraper.wikitext = wikitext
+
+    entry = PokedexEntryBulbapedia(source, translator=_worker_translator,
+                                   evolution_graph_store=_worker_evolution_graph_store)
+    parser = entry.setup_from_scraper(scraper)
+    # Resolves every lazy field, which is where most of the parsing happens
+    data = entry.dex_entry.to_dict()
+
+    raw_evolution_lines = tuple(parser.raw_pokemon_evolution_lines) if parser.has_parsable_evo_line() else None
+    return ParsedPokedexEntry(data, raw_evolution_lines, _worker_translator.pop_new_translations(), started_at,
+                              time.time())
+
+
+class PokedexEntryPipeline(PokedexEntryBatch):
+    """
+    Generate many Bulbapedia entries in three explicit stages, so the parsing can use all cores
+
+    fetch: max_workers threads request the wikitext of the sources (through the fetcher, e.g. a HttpCache)
+    parse: a pool of processes (processes, all cores by default) scrapes and parses the wikitext, into plain data
+    render: the main process creates the PokedexEntry from that data, and writes (and stores) it like a batch does
+    The stages overlap: a page is parsed as soon as it is fetched, and rendered as soon as it is parsed. The time every
+        stage spent is kept in stats, see create_throughput_report.
+
+    entry_options are the options of PokedexEntryBulbapedia: fetch_mode, translator and evolution_graph_store. The
+        worker processes use their own translator with the same file and backend, the translations they request are
+        stored by the main process. They read the families of the evolution graph store from its file, the families
+        they parse are added to the store by the main process.
+    """
+
+    def __init__(self, sources: list, output_dir: str = "output", max_workers: int = 4, fetcher: HttpFetcher = None,
+                 entry_options: dict = None, store: PokedexEntryStore = None, revisions: dict = None,
+                 processes: int = None):
+        super().__init__(sources, source_type="bulbapedia", output_dir=output_dir, max_workers=max_workers,
+                         fetcher=fetcher, entry_options=entry_options, store=store, revisions=revisions)
+        self.processes = processes if processes else os.cpu_count()
+
+        self.fetch_mode = self.entry_options.get("fetch_mode", "raw")
+        # Not 'or', an empty store is falsy
+        self.translator = self.entry_options.get("translator")
+        if self.translator is None:
+            self.translator = get_default_translation_cache()
+        self.evolution_graph_store = self.entry_options.get("evolution_graph_store")
+        if self.evolution_graph_store is None:
+            self.evolution_graph_store = get_default_evolution_graph_store()
+
+        self.stats = {}
+
+    def run(self) -> list:
+        """
+        Generate all entries
+
+        :returns a PokedexEntryBatchResult for every source, in the same order as the sources
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.stats = {
+            "fetch": PipelineStageStats("fetch", self.max_workers),
+            "parse": PipelineStageStats("parse", self.processes),
+            "render": PipelineStageStats("render", 1),
+            "total": PipelineStageStats("total", 1)
+        }
+        started_at = time.time()
+
+        results = [None] * len(self.sources)
+        # (index, ParsedPokedexEntry or None, exception or None) of every page that made it through (or failed in)
+        #   the fetch and parse stages, in the order they are done
+        parsed = queue.Queue()
+
+        translator_options = {"path": self.translator.path, "seed": self.translator.seed,
+                              "backend": self.translator.backend, "src": self.translator.src,
+                              "dest": self.translator.dest}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as fetch_pool, \
+                ProcessPoolExecutor(max_workers=self.processes, initializer=_initialize_parse_worker,
+                                    initargs=(translator_options, self.evolution_graph_store.path)) as parse_pool:
+
+            def on_fetched(index: int, future):
+                try:
+                    parse_pool.submit(parse_wikitext, self.sources[index], future.result()).add_done_callback(
+                        lambda parse_future: on_parsed(index, parse_future))
+                except Exception as e:
+                    parsed.put((index, None, e))
+
+            def on_parsed(index: int, future):
+                try:
+                    parsed.put((index, future.result(), None))
+                except Exception as e:
+                    parsed.put((index, None, e))
+
+            for index, source in enumerate(self.sources):
+                fetch_pool.submit(self._fetch, source).add_done_callback(
+                    lambda future, index=index: on_fetched(index, future))
+
+            for _ in self.sources:
+                index, parsed_entry, error = parsed.get()
+                if error is None:
+                    self.stats["parse"].add(parsed_entry.started_at, parsed_entry.finished_at)
+                    results[index] = self._render(self.sources[index], parsed_entry)
+                else:
+                    results[index] = PokedexEntryBatchResult(self.sources[index], error=error)
+
+        self.stats["total"].add(started_at, time.time(), pages=len(results))
+        return results
+
+    def _fetch(self, source: str) -> str:
+        started_at = time.time()
+        wikitext = PokedexEntryScraperPokemonBulbapedia(source, self.fetcher, self.fetch_mode).get_wikitext()
+        self.stats["fetch"].add(started_at, time.time())
+        return wikitext
+
+    def _render(self, source: str, parsed_entry: ParsedPokedexEntry) -> PokedexEntryBatchResult:
+        started_at = time.time()
+        try:
+            self.translator.add_translations(parsed_entry.translations)
+
+            steps = parsed_entry.data["evo_line"]
+            if parsed_entry.raw_evolution_lines is not None:
+                # Shared by the whole family, and stored for the next run
+                evo_line = self.evolution_graph_store.get_or_create(list(parsed_entry.raw_evolution_lines),
+                                                                    lambda: EvolutionLine.from_steps(steps))
+            else:
+                evo_line = EvolutionLine.from_steps(steps)
+
+            dex_entry = PokedexEntry.from_dict(parsed_entry.data, evo_line)
+            result = self._write(source, dex_entry, dex_entry.write_dutch_wiki_entry)
+        except Exception as e:
+            result = PokedexEntryBatchResult(source, error=e)
+
+        self.stats["render"].add(started_at, time.time())
+        return result
+
+    def create_throughput_report(self) -> str:
+        """
+        :returns str with a line per stage: the pages it handled, its throughput (pages/s while it was active) and the
+            time its workers were busy
+        """
+        return "\n".join(str(self.stats[stage]) for stage in ("fetch", "parse", "render", "total")
+                         if stage in self.stats)
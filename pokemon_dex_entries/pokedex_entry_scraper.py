@@ -6,16 +6,29 @@ import abc
 import requests
 from bs4 import BeautifulSoup
 
+from utils.async_http_fetcher import AsyncHttpFetcher
+from utils.http_fetcher import HttpFetcher
+
 
 class PokedexEntryScraper(abc.ABC):
 
-    def __init__(self, url: str):
+    def __init__(self, url: str, fetcher: HttpFetcher = None):
         self.url = url
+        self.fetcher = fetcher
         self.structured_object = None
 
+    def _get_text(self, url: str) -> str:
+        # Go through the shared fetcher (or cache) when one is injected
+        if self.fetcher:
+            return self.fetcher.get_text(url)
+        return requests.get(url).text
+
     def get_structured_object(self):
-        request = requests.get(self.url)
-        self.structured_object = BeautifulSoup(request.text, "html.parser")
+        self.structured_object = BeautifulSoup(self._get_text(self.url), "html.parser")
+
+    async def get_structured_object_async(self, fetcher: AsyncHttpFetcher):
+        # Only the request is awaited, see AsyncHttpFetcher
+        self.structured_object = BeautifulSoup(await fetcher.get_text(self.url), "html.parser")
 
     @abc.abstractmethod
     def generate_usable_data(self):
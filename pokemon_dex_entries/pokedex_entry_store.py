@@ -0,0 +1,256 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from pokemon_dex_entries.pokedex_entry import PokedexEntry
+from utils.evolution_line import EvolutionLine
+from utils.gen_translation import DUTCH_GEN_TO_NUMBER
+from utils.generation_ndex_range import generation_of_ndex
+from utils.pokemon import Pokemon
+from utils.pokemon_type import PokemonType
+
+
+class PokedexEntryNotStoredError(Exception):
+    """Raised when an entry is requested from the store while it was never stored"""
+
+
+class PokedexEntryStore:
+    """
+    A SQLite database of fully parsed Pokédex entries (with their forms), so the templates can be rendered again without
+        requesting and parsing the pages again, e.g. after a change to the template of the Fandom
+
+    Every entry is stored once per name, with its national dex number and the source (url) it was generated from as
+        indexed columns, and the revision of the source page (when known) so an incremental run can tell whether the
+        page changed since. The fields themselves are stored as JSON (see PokedexEntry.to_dict), the forms in a table of
+        their own. Entries of the same family that are loaded from the store share one EvolutionLine.
+    A list index (national dex number, name, generation and types, indexed by generation and type) is kept next to the
+        entries, so the Pokémon lists of the Fandom are made from the same data as the entries (see list_pokemon).
+    The store is safe to use from multiple threads, e.g. the workers of a PokedexEntryBatch.
+    """
+
+    _SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS pokedex_entries (
+            name TEXT PRIMARY KEY,
+            ndex INTEGER,
+            source TEXT,
+            revision INTEGER,
+            stored_at REAL NOT NULL,
+            data TEXT NOT NULL
+        )""",
+        "CREATE INDEX IF NOT EXISTS pokedex_entries_ndex ON pokedex_entries (ndex)",
+        "CREATE INDEX IF NOT EXISTS pokedex_entries_source ON pokedex_entries (source)",
+        """CREATE TABLE IF NOT EXISTS pokedex_forms (
+            name TEXT NOT NULL REFERENCES pokedex_entries (name) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            form_name TEXT,
+            data TEXT NOT NULL,
+            PRIMARY KEY (name, position)
+        )""",
+        """CREATE TABLE IF NOT EXISTS pokedex_list_index (
+            name TEXT PRIMARY KEY REFERENCES pokedex_entries (name) ON DELETE CASCADE,
+            ndex INTEGER NOT NULL,
+            generation INTEGER,
+            type1 TEXT NOT NULL,
+            type2 TEXT
+        )""",
+        "CREATE INDEX IF NOT EXISTS pokedex_list_index_ndex ON pokedex_list_index (ndex)",
+        "CREATE INDEX IF NOT EXISTS pokedex_list_index_generation ON pokedex_list_index (generation, ndex)",
+        "CREATE INDEX IF NOT EXISTS pokedex_list_index_type1 ON pokedex_list_index (type1)",
+        "CREATE INDEX IF NOT EXISTS pokedex_list_index_type2 ON pokedex_list_index (type2)"
+    )
+
+    _INSERT_LIST_INDEX = "INSERT INTO pokedex_list_index (name, ndex, generation, type1, type2) VALUES (?, ?, ?, ?, ?)"
+
+    def __init__(self, path: str = os.path.join(".cache", "pokedex_entries.sqlite")):
+        self.path = path
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        with self._connection:
+            for statement in self._SCHEMA:
+                self._connection.execute(statement)
+            # Stores created before revisions were recorded
+            columns = [row[1] for row in self._connection.execute("PRAGMA table_info(pokedex_entries)")]
+            if "revision" not in columns:
+                self._connection.execute("ALTER TABLE pokedex_entries ADD COLUMN revision INTEGER")
+            # Stores created before the list index was kept, it is filled once from the stored entries
+            if not self._connection.execute("SELECT 1 FROM pokedex_list_index LIMIT 1").fetchone():
+                rows = [self._create_list_index_row(json.loads(data))
+                        for data, in self._connection.execute("SELECT data FROM pokedex_entries")]
+                self._connection.executemany(self._INSERT_LIST_INDEX, [row for row in rows if row])
+
+        # Evolution line steps -> EvolutionLine, shared by the loaded entries of a family
+        self._evo_lines = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def _ndex_to_int(ndex_num):
+        # E.g. '0744' -> 744, entries without a (numeric) national dex number are stored without one
+        return int(ndex_num) if ndex_num and str(ndex_num).isdigit() else None
+
+    @classmethod
+    def _create_list_index_row(cls, data: dict) -> tuple:
+        # Only entries with a national dex number and a type are listed
+        ndex = cls._ndex_to_int(data.get("ndex_num"))
+        if ndex is None or not data.get("type"):
+            return None
+
+        # The generation of the infobox, or else the generation the number belongs to
+        generation = DUTCH_GEN_TO_NUMBER.get(data.get("generation"))
+        if generation is None:
+            generation = generation_of_ndex(ndex)
+        return data["name"], ndex, generation, data["type"], data.get("type2")
+
+    def put(self, dex_entry: PokedexEntry, source: str = None, revision: int = None):
+        """Store a (fully parsed) entry, replacing the entry with the same name"""
+        data = dex_entry.to_dict()
+        forms = data.pop("forms")
+
+        with self._lock, self._connection:
+            # The forms of a replaced entry are deleted with it
+            self._connection.execute("DELETE FROM pokedex_entries WHERE name = ?", (data["name"],))
+            self._connection.execute(
+                "INSERT INTO pokedex_entries (name, ndex, source, revision, stored_at, data) VALUES (?, ?, ?, ?, ?, ?)",
+                (data["name"], self._ndex_to_int(data["ndex_num"]), source, revision, time.time(),
+                 json.dumps(data, ensure_ascii=False)))
+            self._connection.executemany(
+                "INSERT INTO pokedex_forms (name, position, form_name, data) VALUES (?, ?, ?, ?)",
+                [(data["name"], position, form["form_name"], json.dumps(form, ensure_ascii=False))
+                 for position, form in enumerate(forms)])
+            list_index_row = self._create_list_index_row(data)
+            if list_index_row:
+                self._connection.execute(self._INSERT_LIST_INDEX, list_index_row)
+
+    def _query(self, where: str, parameters: tuple) -> list:
+        # The entries matching the where clause, and their forms in a single query as well
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT name, data FROM pokedex_entries {} ORDER BY ndex, name".format(where), parameters).fetchall()
+            form_rows = self._connection.execute(
+                "SELECT name, data FROM pokedex_forms WHERE name IN (SELECT name FROM pokedex_entries {}) "
+                "ORDER BY name, position".format(where), parameters).fetchall() if rows else []
+
+        forms = {}
+        for name, form_data in form_rows:
+            forms.setdefault(name, []).append(json.loads(form_data))
+
+        entries = []
+        for name, entry_data in rows:
+            data = json.loads(entry_data)
+            data["forms"] = forms.get(name, [])
+
+            evo_line = None
+            if data.get("evo_line"):
+                steps = tuple(tuple(step) for step in data["evo_line"])
+                evo_line = self._evo_lines.get(steps)
+                if evo_line is None:
+                    evo_line = self._evo_lines.setdefault(steps, EvolutionLine.from_steps(steps))
+            entries.append(PokedexEntry.from_dict(data, evo_line))
+        return entries
+
+    def get(self, name: str) -> PokedexEntry:
+        """
+        :returns the stored PokedexEntry with the given name, or None
+        """
+        entries = self._query("WHERE name = ?", (name,))
+        return entries[0] if entries else None
+
+    def get_by_ndex(self, ndex_num) -> PokedexEntry:
+        """
+        :returns the stored PokedexEntry with the given national dex number (e.g. 744 or '0744'), or None
+        """
+        entries = self._query("WHERE ndex = ?", (self._ndex_to_int(ndex_num),))
+        return entries[0] if entries else None
+
+    def get_by_source(self, source: str) -> PokedexEntry:
+        """
+        :returns the stored PokedexEntry generated from the given source (url)
+
+        Raises PokedexEntryNotStoredError when no entry was stored for the source
+        """
+        entries = self._query("WHERE source = ?", (source,))
+        if not entries:
+            raise PokedexEntryNotStoredError("{} is not stored".format(source))
+        return entries[0]
+
+    def get_range(self, first: int, last: int) -> list:
+        """
+        :returns list of the stored PokedexEntry objects with a national dex number from first to last (inclusive),
+            ordered by their national dex number
+        """
+        return self._query("WHERE ndex BETWEEN ? AND ?", (first, last))
+
+    def sources_in_range(self, first: int, last: int) -> list:
+        """
+        :returns list of the sources of the stored entries with a national dex number from first to last (inclusive)
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT source FROM pokedex_entries WHERE ndex BETWEEN ? AND ? AND source IS NOT NULL ORDER BY ndex",
+                (first, last)).fetchall()
+        return [source for source, in rows]
+
+    def get_revisions(self, sources: list) -> dict:
+        """
+        :returns dict of source -> revision of the source page when it was stored, for the stored sources only
+        """
+        revisions = {}
+        with self._lock:
+            # In parts, SQLite limits the number of parameters of a query
+            for part_start in range(0, len(sources), 500):
+                part = sources[part_start:part_start + 500]
+                revisions.update(self._connection.execute(
+                    "SELECT source, revision FROM pokedex_entries WHERE source IN ({})".format(
+                        ", ".join("?" * len(part))), part).fetchall())
+        return revisions
+
+    def list_pokemon(self, first: int = None, last: int = None, generation: int = None, pokemon_type: str = None) -> list:
+        """
+        Get the Pokémon of the list index, without loading the entries themselves
+
+        first, last: national dex range (inclusive), generation: e.g. 7, pokemon_type: Dutch name of a type, e.g. 'Steen'
+        :returns list of Pokemon matching all given filters, ordered by national dex number
+        """
+        conditions = []
+        parameters = []
+        if first is not None:
+            conditions.append("ndex >= ?")
+            parameters.append(first)
+        if last is not None:
+            conditions.append("ndex <= ?")
+            parameters.append(last)
+        if generation is not None:
+            conditions.append("generation = ?")
+            parameters.append(generation)
+        if pokemon_type is not None:
+            conditions.append("(type1 = ? OR type2 = ?)")
+            parameters += [pokemon_type, pokemon_type]
+        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT name, ndex, type1, type2 FROM pokedex_list_index {} ORDER BY ndex, name".format(where),
+                parameters).fetchall()
+        return [Pokemon(name, ndex, PokemonType.from_dutch(type1, type2)) for name, ndex, type1, type2 in rows]
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM pokedex_entries").fetchone()[0]
@@ -0,0 +1,28 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+from pokemon_dex_entries.abstract_pokedex_entry import AbstractPokedexEntry
+from pokemon_dex_entries.pokedex_entry_store import PokedexEntryStore
+
+
+class PokedexEntryStored(AbstractPokedexEntry):
+    """
+    A Pokédex entry loaded from a PokedexEntryStore instead of scraped, the url is the source it was stored with
+
+    Nothing is requested or parsed, so rendering the templates again (e.g. after a change to the template of the
+        Fandom) is a local query plus the rendering itself.
+    """
+
+    def __init__(self, url: str, store: PokedexEntryStore, **kwargs):
+        # Any other option (e.g. the fetcher given to every source type) is not needed for a stored entry
+        super().__init__()
+        self.url = url
+        self.store = store
+
+    def setup(self):
+        self.dex_entry = self.store.get_by_source(self.url)
+
+    def build_template(self):
+        return self.dex_entry.create_dutch_wiki_entry()
+
+    def write_template(self, fp):
+        self.dex_entry.write_dutch_wiki_entry(fp)
@@ -0,0 +1,93 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+from pokemon_lists.list_scraper import ListScraper
+from pokemon_lists.list_scraper_factory import ListScraperFactory
+from pokemon_lists.list_scraper_serebii import ListScraperSerebii
+from pokemon_lists.nl_pkmn_fandom_list import DutchPokemonFandomPokemonList
+from utils.generation_ndex_range import GENERATION_TO_NDEX_RANGE
+from utils.http_fetcher import HttpFetcher
+
+
+def parse_list_page(source_type: str, url: str, text: str, list_options: dict) -> list:
+    """
+    Parse the Pokémon of a page that is already requested, a module level function so it can run in a worker process
+
+    :returns list of Pokemon
+    """
+    return ListScraperFactory().create(source_type=source_type, url=url, text=text, **list_options).parse_pokemon()
+
+
+def merge_pokemon(pokemon_lists: list) -> list:
+    """
+    Merge the Pokémon of several pages into one list sorted by national dex number, a Pokémon that is on more than one
+        page is only kept once (as it is on the first of those pages)
+
+    :returns list of Pokemon
+    """
+    merged = {}
+    for pokemon_list in pokemon_lists:
+        for pokemon in pokemon_list:
+            merged.setdefault(pokemon.ndex_no, pokemon)
+    return [merged[ndex] for ndex in sorted(merged)]
+
+
+def create_all_generation_urls() -> list:
+    """
+    :returns the urls of the Serebii list pages of every known generation
+    """
+    return [ListScraperSerebii.create_generation_url(generation) for generation in GENERATION_TO_NDEX_RANGE]
+
+
+class PokemonListBatch:
+    """
+    Create one list from the pages of several urls, e.g. a page per generation
+
+    The pages are requested on a bounded pool of max_workers threads (through the fetcher, so a HttpCache and its rate
+        limiting are shared), and every page is parsed as soon as it is requested: on the thread that requested it, or in
+        a pool of processes when processes is given. The Pokémon of all pages are merged by merge_pokemon.
+    list_options are passed on to the list class of the source type, e.g. {"html_backend": "html.parser"}.
+    """
+
+    def __init__(self, urls: list, source_type: str = "serebii", max_workers: int = 4, fetcher: HttpFetcher = None,
+                 list_options: dict = None, processes: int = None):
+        self.urls = urls
+        self.source_type = source_type
+        self.max_workers = max_workers
+        self.fetcher = fetcher
+        self.list_options = list_options if list_options else {}
+        self.processes = processes
+
+    def run(self) -> DutchPokemonFandomPokemonList:
+        """
+        Request and parse all pages, a page that cannot be requested or parsed raises its exception
+
+        :returns DutchPokemonFandomPokemonList
+        """
+        return DutchPokemonFandomPokemonList(merge_pokemon(self.parse_pages()))
+
+    def write_to(self, fp):
+        """Write the merged list to the (text) file handle fp, once all pages are parsed"""
+        self.run().write_to(fp)
+
+    def parse_pages(self) -> list:
+        """
+        :returns a list of Pokemon for every url, in the same order as the urls
+        """
+        if not self.processes:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                return list(executor.map(self._process, self.urls))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as fetch_pool, \
+                ProcessPoolExecutor(max_workers=self.processes) as parse_pool:
+            fetches = {fetch_pool.submit(ListScraper.fetch_text, url, self.fetcher): url for url in self.urls}
+            parses = {}
+            for future in as_completed(fetches):
+                url = fetches[future]
+                parses[url] = parse_pool.submit(parse_list_page, self.source_type, url, future.result(),
+                                                self.list_options)
+            return [parses[url].result() for url in self.urls]
+
+    def _process(self, url: str) -> list:
+        return parse_list_page(self.source_type, url, ListScraper.fetch_text(url, self.fetcher), self.list_options)
@@ -3,13 +3,73 @@ from abc import ABC, abstractmethod
 import requests
 from bs4 import BeautifulSoup
 
+from pokemon_lists.nl_pkmn_fandom_list import DutchPokemonFandomPokemonList
+from utils.async_http_fetcher import AsyncHttpFetcher
+from utils.html_backends import HtmlBackend, create_html_backend, DEFAULT_HTML_BACKEND
+from utils.http_fetcher import HttpFetcher
+
 
 class ListScraper(ABC):
+    """
+    The html_backend (a HtmlBackend or its name, see create_html_backend) reads the tables of the page, by default
+        the html.parser of the standard library
+    """
+
+    def __init__(self, url: str, fetcher: HttpFetcher = None, text: str = None, html_backend=None):
+        # The page is only requested when its text is not given, through the shared fetcher (or cache) when one is
+        #   injected
+        self.text = text if text is not None else self.fetch_text(url, fetcher)
+        self.html_backend = html_backend if isinstance(html_backend, HtmlBackend) \
+            else create_html_backend(html_backend if html_backend else DEFAULT_HTML_BACKEND)
+
+        self._structured_object = None
+
+    @property
+    def structured_object(self) -> BeautifulSoup:
+        # A BeautifulSoup tree of the whole page, only built when it is used
+        if self._structured_object is None:
+            self._structured_object = BeautifulSoup(self.text, 'html.parser')
+        return self._structured_object
+
+    @staticmethod
+    def fetch_text(url: str, fetcher: HttpFetcher = None) -> str:
+        """
+        Request the page, through the fetcher when one is given
+
+        :returns the text of the page
+        """
+        return fetcher.get_text(url) if fetcher else requests.get(url).text
 
-    def __init__(self, url: str):
-        request = requests.get(url)
-        self.structured_object = BeautifulSoup(request.text, 'html.parser')
+    @classmethod
+    async def create_async(cls, url: str, fetcher: AsyncHttpFetcher, **kwargs):
+        """
+        Create the list scraper, requesting the page without blocking the event loop
+
+        :returns an instance of cls
+        """
+        return cls(url, text=await fetcher.get_text(url), **kwargs)
 
     @abstractmethod
-    def scrape(self):
-        pass
+    def iter_pokemon(self):
+        """
+        Yields the Pokémon of the page (Pokemon objects) as they are parsed
+        """
+
+    def parse_pokemon(self) -> list:
+        """
+        Parse all Pokémon of the page
+
+        :returns list of Pokemon
+        """
+        return list(self.iter_pokemon())
+
+    def create_fandom_list(self) -> DutchPokemonFandomPokemonList:
+        # A Pokémon is parsed while the list is written, see DutchPokemonFandomPokemonList
+        return DutchPokemonFandomPokemonList(self.iter_pokemon())
+
+    def scrape(self) -> str:
+        return self.create_fandom_list().generate_fandom_list()
+
+    def write_to(self, fp):
+        """Write the list to the (text) file handle fp, a row is written as soon as its Pokémon is parsed"""
+        self.create_fandom_list().write_to(fp)
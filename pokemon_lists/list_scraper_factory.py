@@ -1,14 +1,16 @@
 from pokemon_lists.list_scraper_serebii import ListScraperSerebii
+from pokemon_lists.list_scraper_stored import ListScraperStored
 
 
 class ListScraperFactory():
     @classmethod
-    def create(cls, source_type: str, url: str):
+    def create(cls, source_type: str, url: str, **kwargs):
         SOURCE_TYPE_TO_CLASS_MAP = {
             'serebii': ListScraperSerebii,
+            'store': ListScraperStored,
         }
 
         if source_type not in SOURCE_TYPE_TO_CLASS_MAP:
             raise ValueError('Invalid source type {}'.format(source_type))
 
-        return SOURCE_TYPE_TO_CLASS_MAP[source_type](url)
\ No newline at end of file
+        return SOURCE_TYPE_TO_CLASS_MAP[source_type](url, **kwargs)
\ No newline at end of file
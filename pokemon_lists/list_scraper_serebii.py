@@ -3,35 +3,36 @@
 
 import re
 
-from pokemon_lists.nl_pkmn_fandom_list import DutchPokemonFandomPokemonList
 from utils.pokemon import Pokemon
 from utils.pokemon_type import PokemonType
 from pokemon_lists.list_scraper import ListScraper
 
 
 class ListScraperSerebii(ListScraper):
-    def scrape(self):
-        table = self.structured_object.find('table', class_="dextable")
-        mons = []
-        for row in table.find_all("tr", recursive=False)[2:]:  # skipping header rows
-            cells = row.find_all("td", recursive=False)
+    # Serebii has one list page per generation
+    generation_url_format = "https://www.serebii.net/pokemon/gen{}pokemon.shtml"
+
+    @classmethod
+    def create_generation_url(cls, generation: int) -> str:
+        return cls.generation_url_format.format(generation.__str__())
+
+    def iter_pokemon(self):
+        """
+        Yields the Pokémon found in the dextable, while the page is read (see HtmlBackend.iter_table)
+        """
+        for row_index, cells in enumerate(self.html_backend.iter_table(self.text, "dextable")):
+            if row_index < 2:  # skipping header rows
+                continue
 
             pkmn_types = []
-            for a in cells[3].find_all('a', href=True):
-                pkmn_type = a['href'].split("/")[-1]
+            for href in cells[3].hrefs:
+                pkmn_type = href.split("/")[-1]
                 pkmn_types.append(pkmn_type)
 
             pkmn = Pokemon(
-                name=cells[2].text.strip(),
-                ndex=int(re.sub('\D', '', cells[0].text.strip())),
+                name=cells[2].text,
+                ndex=int(re.sub(r'\D', '', cells[0].text)),
                 type=PokemonType(pkmn_types)
             )
 
-            mons.append(pkmn)
-
-        fandom_list = DutchPokemonFandomPokemonList()
-        for mon in mons:
-            fandom_list.add_pokemon(mon)
-
-        return fandom_list.generate_fandom_list()
-
+            yield pkmn
@@ -0,0 +1,31 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+from pokemon_dex_entries.pokedex_entry_store import PokedexEntryStore
+from pokemon_lists.list_scraper import ListScraper
+from utils.pokemon_type import PokemonType
+
+
+class ListScraperStored(ListScraper):
+    """
+    A list made from the list index of a PokedexEntryStore instead of scraped, so it is made without any request and
+        matches the entries generated for the same Pokémon
+
+    first and last (a national dex range, inclusive), generation and pokemon_type (English or Dutch, e.g. 'rock' or
+        'Steen') select the Pokémon, by default every stored Pokémon is listed.
+    """
+
+    def __init__(self, url: str = None, store: PokedexEntryStore = None, first: int = None, last: int = None,
+                 generation: int = None, pokemon_type: str = None, **kwargs):
+        # Nothing is requested, any other option (e.g. the fetcher given to every source type) is not needed
+        self.url = url
+        self.store = store if store else PokedexEntryStore()
+        self.first = first
+        self.last = last
+        self.generation = generation
+        self.pokemon_type = PokemonType.to_dutch_name(pokemon_type) if pokemon_type else None
+
+    def iter_pokemon(self):
+        """
+        Yields the selected Pokémon of the store
+        """
+        yield from self.store.list_pokemon(self.first, self.last, self.generation, self.pokemon_type)
@@ -2,18 +2,45 @@ from utils.pokemon import Pokemon
 
 
 class DutchPokemonFandomPokemonList:
+    """
+    The list is written row by row: the rows of the added Pokémon first, then the rows of pokemon (any iterable, e.g. a
+        generator of a list scraper), which is only consumed while the list is written. So a Pokémon can be written
+        as soon as it is parsed, without keeping all Pokémon or the whole list in memory.
+    """
 
     prefix = "{| class=\"wikitable sortable\"  style=\"text-align: center; font-size: 90%\"\n!\n! Engels\n! Type (" \
              "1)\n! Type (2)\n!  Afbeelding\n"
     suffix = "|-\n|}"
 
-    def __init__(self):
-        self.body = ""
+    def __init__(self, pokemon=None):
+        self.pokemon = pokemon
+        self._rows = []
+
+    @property
+    def body(self) -> str:
+        return "".join(self._rows)
+
+    @staticmethod
+    def create_row(pokemon: Pokemon) -> str:
+        return "|-\n" + pokemon.convert_to_fandom_list_entry()
 
     def add_pokemon(self, pokemon: Pokemon):
-        self.body += "|-\n"
+        self._rows.append(self.create_row(pokemon))
+
+    def iter_fandom_list(self):
+        """
+        Yields the list in chunks (a row per Pokémon), without building the whole list as one string
+        """
+        yield self.prefix
+        yield from self._rows
+        if self.pokemon is not None:
+            for pokemon in self.pokemon:
+                yield self.create_row(pokemon)
+        yield self.suffix
 
-        self.body += pokemon.convert_to_fandom_list_entry()
+    def write_to(self, fp):
+        """Write the list to the (text) file handle fp, chunk by chunk"""
+        fp.writelines(self.iter_fandom_list())
 
     def generate_fandom_list(self):
-        return self.prefix + self.body + self.suffix
+        return "".join(self.iter_fandom_list())
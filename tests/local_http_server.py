@@ -0,0 +1,57 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+class LocalHttpServer:
+    """
+    A local stand-in for the sites we scrape, running on a random free port in a background thread
+
+    routes maps a path to a function receiving the request handler and returning (status, headers, body), every
+        request is recorded in requests as (path, client port, headers).
+    """
+
+    def __init__(self, routes: dict):
+        self.routes = routes
+        self.requests = []
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 so connections are kept alive
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests.append((self.path, self.client_address[1], dict(self.headers)))
+
+                route = server.routes.get(self.path.split("?", 1)[0])
+                status, headers, body = route(self) if route else (404, {}, "Not found")
+                body = body.encode('utf8') if isinstance(body, str) else body
+
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return "http://127.0.0.1:{}".format(self.httpd.server_address[1])
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.httpd.shutdown()
+        self.httpd.server_close()
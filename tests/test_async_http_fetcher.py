@@ -0,0 +1,82 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import asyncio
+import threading
+import time
+import unittest
+
+from pokemon_lists.list_scraper_serebii import ListScraperSerebii
+from tests.local_http_server import LocalHttpServer
+from utils.async_http_fetcher import AsyncHttpFetcher
+from utils.http_fetcher import HttpFetcher
+
+
+class TestAsyncHttpFetcher(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+        def slow(handler):
+            # Keep track of the number of requests handled at the same time
+            with self.lock:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            time.sleep(0.1)
+            with self.lock:
+                self.in_flight -= 1
+            return 200, {"Content-Type": "text/html; charset=utf-8"}, "<p>{}</p>".format(handler.path)
+
+        self.server = LocalHttpServer({"/slow": slow})
+        self.server.__enter__()
+
+    def tearDown(self) -> None:
+        self.server.__exit__(None, None, None)
+
+    def fetch_all(self, fetcher: AsyncHttpFetcher, n_requests: int) -> list:
+        async def fetch():
+            return await asyncio.gather(*(fetcher.get_text(self.server.base_url + "/slow?page={}".format(page))
+                                          for page in range(n_requests)))
+        try:
+            return asyncio.run(fetch())
+        finally:
+            fetcher.close()
+
+    def test_requests_are_concurrent(self):
+        """
+        Test whether all requests are in flight at once, and every response ends up with its own request
+        """
+        fetcher = AsyncHttpFetcher(HttpFetcher(min_interval=0, pool_size=8), max_concurrency=8, max_per_host=8)
+
+        start = time.monotonic()
+        texts = self.fetch_all(fetcher, 8)
+
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(texts, ["<p>/slow?page={}</p>".format(page) for page in range(8)])
+
+    def test_requests_per_host_are_limited(self):
+        """
+        Test whether no more than max_per_host requests to the same host are in flight at once
+        """
+        fetcher = AsyncHttpFetcher(HttpFetcher(min_interval=0), max_concurrency=8, max_per_host=2)
+
+        self.fetch_all(fetcher, 6)
+
+        self.assertEqual(self.max_in_flight, 2)
+
+    def test_list_scraper_create_async(self):
+        """
+        Test whether a list scraper can be created from a page requested by the async fetcher
+        """
+        fetcher = AsyncHttpFetcher(HttpFetcher(min_interval=0))
+        try:
+            list_scraper = asyncio.run(ListScraperSerebii.create_async(self.server.base_url + "/slow", fetcher))
+        finally:
+            fetcher.close()
+
+        self.assertEqual(list_scraper.structured_object.p.text, "/slow")
+
+
+if __name__ == '__main__':
+    unittest.main()
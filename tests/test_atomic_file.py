@@ -0,0 +1,56 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import os
+import tempfile
+import unittest
+
+from utils.atomic_file import open_atomic
+
+
+class TestAtomicFile(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "output.txt")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def read_output(self) -> str:
+        with open(self.path, encoding='utf8') as output_file:
+            return output_file.read()
+
+    def test_writers_of_the_same_path(self):
+        """
+        Test whether two writers of the same path at once (e.g. forked processes, which share a thread id) each
+            replace the file with their own text, without a temporary file left behind
+        """
+        with open_atomic(self.path) as first_file:
+            first_file.write("first")
+            with open_atomic(self.path) as second_file:
+                second_file.write("second")
+            self.assertEqual(self.read_output(), "second")
+
+        self.assertEqual(self.read_output(), "first")
+        self.assertEqual(os.listdir(self.directory.name), ["output.txt"])
+
+    def test_failing_writer_keeps_the_file(self):
+        """
+        Test whether a with block that raises leaves the file (and its permissions) as it was
+        """
+        with open(self.path, "w", encoding='utf8') as output_file:
+            output_file.write("earlier")
+        os.chmod(self.path, 0o640)
+
+        with self.assertRaises(KeyError):
+            with open_atomic(self.path) as output_file:
+                output_file.write("half")
+                raise KeyError("ndex")
+
+        self.assertEqual(self.read_output(), "earlier")
+        self.assertEqual(os.listdir(self.directory.name), ["output.txt"])
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o640)
+
+
+if __name__ == '__main__':
+    unittest.main()
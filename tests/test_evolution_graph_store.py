@@ -0,0 +1,110 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import os
+import tempfile
+import unittest
+
+from pokemon_dex_entries.bulbapedia.pokedex_entry_parser_bulbapedia import PokedexEntryParserPokemonStrategyBulbapedia
+from utils.evolution_graph_store import EvolutionGraphStore
+from utils.evolution_line import EvolutionLine, EvolutionStep
+
+BULBASAUR_RAW_EVOLUTION_LINE = "/2|type1=Grass|no1=0001|name1=Bulbasaur|no2=0002|name2=Ivysaur|no3=0003|name3=Venusaur"
+MEOWTH_RAW_EVOLUTION_LINE = "/1|type1=Dark|no1=0052|name1=Meowth|no2=0053|name2=Persian"
+GALARIAN_MEOWTH_RAW_EVOLUTION_LINE = "/1|type1=Steel|no1=0052|name1=Meowth|no2=0863|name2=Perrserker"
+
+
+def create_evo_line(raw_evolution_lines: list) -> EvolutionLine:
+    main_line = PokedexEntryParserPokemonStrategyBulbapedia._create_evo_line(
+        PokedexEntryParserPokemonStrategyBulbapedia.parse_raw_evolution_line(raw_evolution_lines[0]))
+    for raw_evolution_line in raw_evolution_lines[1:]:
+        main_line.combine_evo_lines(PokedexEntryParserPokemonStrategyBulbapedia._create_evo_line(
+            PokedexEntryParserPokemonStrategyBulbapedia.parse_raw_evolution_line(raw_evolution_line)).first)
+    return main_line
+
+
+class TestEvolutionGraphStore(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "evolution_graph.json")
+        self.created = []
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def get_or_create(self, store: EvolutionGraphStore, raw_evolution_lines: list) -> EvolutionLine:
+        def create():
+            self.created.append(raw_evolution_lines)
+            return create_evo_line(raw_evolution_lines)
+        return store.get_or_create(raw_evolution_lines, create)
+
+    def test_family_is_created_once(self):
+        """
+        Test whether pages with the same Evobox share one evolution line, which is only created for the first page
+        """
+        store = EvolutionGraphStore()
+
+        bulbasaur_line = self.get_or_create(store, [BULBASAUR_RAW_EVOLUTION_LINE])
+        # Ivysaur, the same Evobox with different whitespace
+        ivysaur_line = self.get_or_create(store, [BULBASAUR_RAW_EVOLUTION_LINE.replace("|", "\n|")])
+
+        self.assertIs(bulbasaur_line, ivysaur_line)
+        self.assertEqual(len(self.created), 1)
+        self.assertEqual(store.get_family("Bulbasaur"), [bulbasaur_line])
+
+    def test_family_variants(self):
+        """
+        Test whether a page showing only part of a family gets its own variant, and equal variants are shared
+        """
+        store = EvolutionGraphStore()
+
+        meowth_line = self.get_or_create(store, [MEOWTH_RAW_EVOLUTION_LINE, GALARIAN_MEOWTH_RAW_EVOLUTION_LINE])
+        perrserker_line = self.get_or_create(store, [GALARIAN_MEOWTH_RAW_EVOLUTION_LINE])
+        # Persian, a different Evobox describing the same line as the Meowth page
+        persian_line = self.get_or_create(store, [MEOWTH_RAW_EVOLUTION_LINE + "|evo1=Level up",
+                                                  GALARIAN_MEOWTH_RAW_EVOLUTION_LINE])
+
+        self.assertEqual([name for name, _ in meowth_line.yield_all_name_ndex()], ["Meowth", "Persian", "Perrserker"])
+        self.assertEqual([name for name, _ in perrserker_line.yield_all_name_ndex()], ["Meowth", "Perrserker"])
+        self.assertIs(persian_line, meowth_line)
+        self.assertEqual(len(store.get_family("Meowth")), 2)
+
+    def test_save_and_load(self):
+        """
+        Test whether a stored family is loaded by a new store, without creating it again
+        """
+        store = EvolutionGraphStore(self.path)
+        self.get_or_create(store, [MEOWTH_RAW_EVOLUTION_LINE, GALARIAN_MEOWTH_RAW_EVOLUTION_LINE])
+        store.save()
+
+        loaded_store = EvolutionGraphStore(self.path)
+        evo_line = self.get_or_create(loaded_store, [MEOWTH_RAW_EVOLUTION_LINE, GALARIAN_MEOWTH_RAW_EVOLUTION_LINE])
+
+        self.assertEqual(len(self.created), 1)
+        self.assertEqual(list(evo_line.yield_all_name_ndex()),
+                         [("Meowth", "0052"), ("Persian", "0053"), ("Perrserker", "0863")])
+        self.assertEqual(evo_line.find_previous("Perrserker").pokemon_name, "Meowth")
+
+    def test_missing_file(self):
+        """
+        Test whether a store without a file starts empty, and is not written when nothing was added
+        """
+        store = EvolutionGraphStore(self.path)
+        store.save()
+
+        self.assertEqual(len(store), 0)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_to_and_from_steps(self):
+        """
+        Test whether an evolution line survives a round trip through its steps
+        """
+        evo_line = EvolutionLine(EvolutionStep("Wurmple", "265", 1))
+        evo_line.first.add_next(EvolutionStep("Silcoon", "266", 2))
+        evo_line.first.add_next(EvolutionStep("Cascoon", "268", 2))
+
+        self.assertEqual(EvolutionLine.from_steps(evo_line.to_steps()).to_steps(), evo_line.to_steps())
+
+
+if __name__ == '__main__':
+    unittest.main()
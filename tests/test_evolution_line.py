@@ -0,0 +1,108 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import sys
+import threading
+import unittest
+
+from utils.evolution_line import EvolutionLine, EvolutionStep
+
+
+def create_test_line(*names) -> EvolutionLine:
+    # A straight line, e.g. Shinx -> Luxio -> Luxray
+    steps = [EvolutionStep(name, str(number), evo_stage=number) for number, name in enumerate(names, start=1)]
+    for step, next_step in zip(steps, steps[1:]):
+        step.add_next(next_step)
+    return EvolutionLine(steps[0])
+
+
+class TestEvolutionLine(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.test_line = create_test_line("Wurmple", "Silcoon", "Beautifly")
+        self.test_line.combine_evo_lines(create_test_line("Wurmple", "Cascoon", "Dustox").first)
+
+    def test_combine_evo_lines(self):
+        """
+        Test whether the missing steps of a secondary line are added after the step they evolve from
+        """
+        self.assertEqual(list(self.test_line.yield_all_name_ndex()),
+                         [("Wurmple", "1"), ("Silcoon", "2"), ("Beautifly", "3"), ("Cascoon", "2"), ("Dustox", "3")])
+        self.assertEqual([step.pokemon_name for step in self.test_line.first.next], ["Silcoon", "Cascoon"])
+
+    def test_combine_evo_lines_is_idempotent(self):
+        """
+        Test whether combining a line with steps that are already present does not add them twice
+        """
+        self.test_line.combine_evo_lines(create_test_line("Wurmple", "Cascoon").first)
+
+        self.assertEqual(len(list(self.test_line.yield_all_name_ndex())), 5)
+
+    def test_lookups(self):
+        """
+        Test whether steps and the steps they evolve from are found, including steps added by combining lines
+        """
+        dustox, cascoon = self.test_line.find_step_and_previous("Dustox")
+
+        self.assertEqual((dustox.pokemon_name, cascoon.pokemon_name), ("Dustox", "Cascoon"))
+        self.assertIsNone(self.test_line.find_previous("Wurmple"))
+        self.assertIsNone(self.test_line.find_step("Pikachu"))
+        self.assertIn("Beautifly", self.test_line)
+        self.assertNotIn("Pikachu", self.test_line)
+
+    def test_static_walks(self):
+        """
+        Test whether the static lookups agree with the index
+        """
+        first = self.test_line.first
+
+        self.assertIs(EvolutionLine.find_evolution_step(first, "Dustox"), self.test_line.find_step("Dustox"))
+        self.assertIs(EvolutionLine.previous_step(first, "Dustox"), self.test_line.find_previous("Dustox"))
+        self.assertTrue(EvolutionLine.is_part_of_evo_line(first, "Beautifly"))
+        self.assertFalse(EvolutionLine.is_part_of_evo_line(first, "Pikachu"))
+
+    def test_long_line_does_not_recurse(self):
+        """
+        Test whether lines deeper than the recursion limit can be walked
+        """
+        names = ["Pokémon {}".format(number) for number in range(5000)]
+        test_line = create_test_line(*names)
+
+        self.assertEqual(len(list(test_line.yield_all_name_ndex())), 5000)
+        self.assertEqual(test_line.find_previous(names[-1]).pokemon_name, names[-2])
+        self.assertTrue(EvolutionLine.is_part_of_evo_line(test_line.first, names[-1]))
+
+
+    def test_concurrent_lookups_on_a_new_line(self):
+        """
+        Test whether threads looking up steps of a line that is not indexed yet all find them, e.g. the entries of
+            one family rendered at the same time in a batch
+        """
+        names = ["Pokémon {}".format(number) for number in range(41)]
+        missing = []
+
+        def look_up(test_line: EvolutionLine, barrier: threading.Barrier):
+            barrier.wait()
+            for name in reversed(names):
+                step, previous = test_line.find_step_and_previous(name)
+                if step is None or (previous is None and name != names[0]):
+                    missing.append(name)
+
+        # Switch between the threads as often as possible, so they switch while the index is built
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for _ in range(300):
+                test_line = create_test_line(*names)
+                barrier = threading.Barrier(4)
+                threads = [threading.Thread(target=look_up, args=(test_line, barrier)) for _ in range(4)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        self.assertEqual(missing, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import os
+import unittest
+
+from utils.html_backends import HTML_BACKENDS, HtmlTableCell, create_html_backend, HtmlParserBackend
+
+
+def read_serebii_test_page():
+    # A generation list in the layout of Serebii, e.g. https://www.serebii.net/pokemon/gen1pokemon.shtml
+    with open(os.path.join(os.path.dirname(__file__), "resources", "Serebii_Gen1_Test_Page.html"), 'r',
+              encoding='utf8') as html_file:
+        return html_file.read()
+
+
+def create_backends() -> list:
+    return [backend() for backend in HTML_BACKENDS.values()]
+
+
+class TestHtmlBackends(unittest.TestCase):
+
+    def test_backends_give_the_same_rows(self):
+        """
+        Test whether every backend reads the same rows from the Serebii page as BeautifulSoup does
+        """
+        expected_rows = create_html_backend("beautifulsoup").parse_table(read_serebii_test_page(), "dextable")
+
+        self.assertEqual(len(expected_rows), 2 + 151)
+        self.assertEqual(expected_rows[2][:4], [
+            HtmlTableCell("#001", []),
+            HtmlTableCell("", ["/pokedex-swsh/bulbasaur"]),
+            HtmlTableCell("Bulbasaur", ["/pokedex-swsh/bulbasaur"]),
+            HtmlTableCell("", ["/pokemon/type/grass", "/pokemon/type/poison"])
+        ])
+        for backend in create_backends():
+            with self.subTest(backend=backend.name):
+                self.assertEqual(backend.parse_table(read_serebii_test_page(), "dextable"), expected_rows)
+
+    def test_table_structure(self):
+        """
+        Test whether only the first table with the class is read, with the rows of a tbody, the text and links of
+            a nested table as part of its cell, and the character references resolved
+        """
+        page = '<table class="other"><tr><td>no</td></tr></table>' \
+               '<table class="list wide"><tbody><tr><td>1</td><td><table><tr><td><a href="/a">A</a></td></tr>' \
+               '<tr><td>&amp; B</td></tr></table></td></tr></tbody><tr><th>x</th><td><a name="c">C</a></td></tr>' \
+               '</table><table class="list"><tr><td>no</td></tr></table>'
+
+        for backend in create_backends():
+            with self.subTest(backend=backend.name):
+                self.assertEqual(backend.parse_table(page, "list"), [
+                    [HtmlTableCell("1", []), HtmlTableCell("A& B", ["/a"])],
+                    [HtmlTableCell("C", [])]
+                ])
+                self.assertRaises(ValueError, backend.parse_table, page, "missing")
+
+    def test_create_html_backend(self):
+        """
+        Test whether html.parser is the default, and unknown backends are refused
+        """
+        self.assertIsInstance(create_html_backend(), HtmlParserBackend)
+        self.assertIsInstance(create_html_backend("html.parser"), HtmlParserBackend)
+        self.assertRaises(ValueError, create_html_backend, "InvalidBackend")
+
+
+if __name__ == '__main__':
+    unittest.main()
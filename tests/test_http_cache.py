@@ -0,0 +1,104 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from utils.http_cache import HttpCache, HttpCacheMissError
+
+
+class MockResponse:
+
+    def __init__(self, status_code: int, text: str = "", headers: dict = None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception("HTTP {}".format(self.status_code))
+
+
+class TestHttpCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.test_url = "https://bulbapedia.bulbagarden.net/w/index.php?title=Rockruff_(Pok%C3%A9mon)&action=edit"
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    @mock.patch("utils.http_cache.HttpFetcher.get", return_value=MockResponse(200, "Rockruff", {"ETag": "\"1\""}))
+    def test_fresh_entry_is_served_from_disk(self, mocked_get):
+        """
+        Test whether a url is only requested once while the entry is fresh
+        """
+        cache = HttpCache(self.directory.name)
+
+        self.assertEqual(cache.get_text(self.test_url), "Rockruff")
+        self.assertEqual(cache.get_text(self.test_url), "Rockruff")
+        self.assertEqual(mocked_get.call_count, 1)
+
+    @mock.patch("utils.http_cache.HttpFetcher.get")
+    def test_stale_entry_is_revalidated(self, mocked_get):
+        """
+        Test whether a stale entry is revalidated using its ETag, and a 304 keeps the cached text
+        """
+        cache = HttpCache(self.directory.name, ttl=0)
+
+        mocked_get.return_value = MockResponse(200, "Rockruff", {"ETag": "\"1\""})
+        cache.get_text(self.test_url)
+
+        mocked_get.return_value = MockResponse(304)
+        self.assertEqual(cache.get_text(self.test_url), "Rockruff")
+        self.assertEqual(mocked_get.call_args[1]["headers"], {"If-None-Match": "\"1\""})
+
+    @mock.patch("utils.http_cache.HttpFetcher.get", return_value=MockResponse(200, "Rockruff"))
+    def test_expired_entry_is_requested_again(self, mocked_get):
+        """
+        Test whether an expired entry is requested again while it would still be fresh
+        """
+        cache = HttpCache(self.directory.name)
+        cache.get_text(self.test_url)
+
+        cache.expire(self.test_url)
+        cache.get_text(self.test_url)
+
+        self.assertEqual(mocked_get.call_count, 2)
+
+    @mock.patch("utils.http_cache.HttpFetcher.get", return_value=MockResponse(200, "Rockruff"))
+    def test_offline(self, mocked_get):
+        """
+        Test whether offline mode serves (stale) cached entries and raises for urls that are not cached
+        """
+        HttpCache(self.directory.name).get_text(self.test_url)
+
+        offline_cache = HttpCache(self.directory.name, ttl=0, offline=True)
+
+        self.assertEqual(offline_cache.get_text(self.test_url), "Rockruff")
+        self.assertRaises(HttpCacheMissError, offline_cache.get_text, "https://not/cached")
+        self.assertEqual(mocked_get.call_count, 1)
+
+    @mock.patch("utils.http_cache.HttpFetcher.get",
+                side_effect=lambda url, headers=None: MockResponse(200, url[-1] * 10))
+    def test_least_recently_used_is_evicted(self, mocked_get):
+        """
+        Test whether the least recently used entries are removed once the maximum size is exceeded
+        """
+        cache = HttpCache(self.directory.name, max_size=25)
+
+        cache.get_text("https://test/a")
+        cache.get_text("https://test/b")
+        # Make 'a' the least recently used entry
+        os.utime(os.path.join(self.directory.name, HttpCache.create_key("https://test/a") + ".body"), (0, 0))
+        cache.get_text("https://test/c")
+
+        cache.offline = True
+        self.assertRaises(HttpCacheMissError, cache.get_text, "https://test/a")
+        self.assertEqual(cache.get_text("https://test/b"), "b" * 10)
+        self.assertEqual(cache.get_text("https://test/c"), "c" * 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import time
+import unittest
+
+import requests
+
+from tests.local_http_server import LocalHttpServer
+from utils.http_fetcher import HttpFetcher
+
+
+class TestHttpFetcher(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.failures_left = 2
+
+        def flaky(handler):
+            # Fail the first two requests
+            if self.failures_left:
+                self.failures_left -= 1
+                return 503, {}, "Service Unavailable"
+            return 200, {}, "Recovered"
+
+        def slow(handler):
+            time.sleep(0.5)
+            return 200, {}, "Too late"
+
+        self.server = LocalHttpServer({
+            "/ok": lambda handler: (200, {"Content-Type": "text/plain; charset=utf-8"}, "Rockruff"),
+            "/flaky": flaky,
+            "/rate-limited": lambda handler: (429, {"Retry-After": "0"}, "Slow down"),
+            "/slow": slow
+        })
+        self.server.__enter__()
+
+    def tearDown(self) -> None:
+        self.server.__exit__(None, None, None)
+
+    def test_connections_are_kept_alive(self):
+        """
+        Test whether subsequent requests reuse the same pooled connection
+        """
+        fetcher = HttpFetcher(min_interval=0)
+
+        for _ in range(3):
+            self.assertEqual(fetcher.get_text(self.server.base_url + "/ok"), "Rockruff")
+
+        client_ports = set(port for _, port, _ in self.server.requests)
+        self.assertEqual(len(client_ports), 1)
+
+    def test_retry_on_server_error(self):
+        """
+        Test whether a 5xx response is retried until the server recovers
+        """
+        fetcher = HttpFetcher(min_interval=0, backoff_factor=0.01)
+
+        self.assertEqual(fetcher.get_text(self.server.base_url + "/flaky"), "Recovered")
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_retries_are_limited(self):
+        """
+        Test whether the last response is returned (and raised by get_text) once all retries are used
+        """
+        fetcher = HttpFetcher(min_interval=0, max_retries=2)
+
+        self.assertRaises(requests.HTTPError, fetcher.get_text, self.server.base_url + "/rate-limited")
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_timeout(self):
+        """
+        Test whether a hanging request times out instead of stalling forever
+        """
+        fetcher = HttpFetcher(min_interval=0, timeout=(1, 0.1), max_retries=0)
+
+        self.assertRaises(requests.Timeout, fetcher.get, self.server.base_url + "/slow")
+
+    def test_rate_limit_per_host(self):
+        """
+        Test whether requests to the same host are spaced by at least the minimum interval
+        """
+        fetcher = HttpFetcher(min_interval=0.1)
+
+        start = time.monotonic()
+        for _ in range(3):
+            fetcher.get(self.server.base_url + "/ok")
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import io
+import re
+import unittest
+
+from pokemon_lists.list_batch import PokemonListBatch, merge_pokemon, create_all_generation_urls
+from pokemon_lists.list_scraper_serebii import ListScraperSerebii
+from pokemon_lists.nl_pkmn_fandom_list import DutchPokemonFandomPokemonList
+from tests.local_http_server import LocalHttpServer
+from tests.test_html_backends import read_serebii_test_page
+from utils.http_fetcher import HttpFetcher
+from utils.pokemon import Pokemon
+from utils.pokemon_type import PokemonType
+
+
+class TestPokemonListBatch(unittest.TestCase):
+
+    def setUp(self) -> None:
+        page = read_serebii_test_page()
+        # The same Pokémon with their national dex numbers increased by 100, so #101 - #151 are on both pages
+        shifted_page = re.sub(r'#(\d{3})', lambda match: "#{:03}".format(int(match.group(1)) + 100), page)
+
+        def serve(text):
+            return lambda handler: (200, {"Content-Type": "text/html; charset=utf-8"}, text)
+
+        self.server = LocalHttpServer({"/pokemon/gen1pokemon.shtml": serve(page),
+                                       "/pokemon/shifted.shtml": serve(shifted_page)})
+        self.server.__enter__()
+        self.urls = [self.server.base_url + "/pokemon/gen1pokemon.shtml",
+                     self.server.base_url + "/pokemon/shifted.shtml"]
+
+    def tearDown(self) -> None:
+        self.server.__exit__(None, None, None)
+
+    def check_merged_list(self, batch: PokemonListBatch):
+        mons = merge_pokemon(batch.parse_pages())
+
+        self.assertEqual([mon.ndex_no for mon in mons], list(range(1, 252)))
+        # The first page wins for the Pokémon on both pages
+        self.assertEqual([(mon.ndex_no, mon.pkmn_name) for mon in (mons[0], mons[100], mons[150], mons[151])],
+                         [(1, "Bulbasaur"), (101, "Electrode"), (151, "Mew"), (152, "Meowth")])
+
+    def test_run(self):
+        """
+        Test whether the pages are merged into one list sorted by national dex number, without duplicates
+        """
+        batch = PokemonListBatch(self.urls, max_workers=2, fetcher=HttpFetcher(min_interval=0),
+                                 list_options={"html_backend": "html.parser"})
+        self.check_merged_list(batch)
+
+        output = io.StringIO()
+        batch.write_to(output)
+        self.assertEqual(output.getvalue().count("|-\n"), 252)
+        # The list of the first page, followed by the rows of #152 - #251
+        first_list = ListScraperSerebii(self.urls[0], text=read_serebii_test_page(), html_backend="html.parser").scrape()
+        self.assertTrue(output.getvalue().startswith(first_list[:-len(DutchPokemonFandomPokemonList.suffix)]))
+
+    def test_run_with_processes(self):
+        """
+        Test whether parsing the pages in worker processes gives the same list
+        """
+        self.check_merged_list(PokemonListBatch(self.urls, max_workers=2, fetcher=HttpFetcher(min_interval=0),
+                                                list_options={"html_backend": "html.parser"}, processes=2))
+
+    def test_failing_page(self):
+        """
+        Test whether a page that cannot be requested fails the whole list, instead of leaving out its Pokémon
+        """
+        batch = PokemonListBatch([self.urls[0], self.server.base_url + "/missing"],
+                                 fetcher=HttpFetcher(min_interval=0, max_retries=0))
+        with self.assertRaises(Exception):
+            batch.run()
+
+    def test_merge_pokemon(self):
+        """
+        Test whether merging keeps the first Pokémon of a national dex number and sorts them
+        """
+        rockruff = Pokemon("Rockruff", 744, PokemonType(["rock"]))
+        mons = merge_pokemon([[Pokemon("Lycanroc", 745, PokemonType(["rock"])), rockruff],
+                              [Pokemon("Rockruff (duplicate)", 744, PokemonType(["rock"]))], []])
+
+        self.assertEqual([mon.pkmn_name for mon in mons], ["Rockruff", "Lycanroc"])
+        self.assertIs(mons[0], rockruff)
+
+    def test_all_generation_urls(self):
+        """
+        Test whether there is a Serebii page for every generation
+        """
+        urls = create_all_generation_urls()
+
+        self.assertEqual(len(urls), 8)
+        self.assertEqual(urls[0], "https://www.serebii.net/pokemon/gen1pokemon.shtml")
+
+
+if __name__ == '__main__':
+    unittest.main()
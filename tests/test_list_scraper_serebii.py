@@ -0,0 +1,37 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import unittest
+
+from pokemon_lists.list_scraper_serebii import ListScraperSerebii
+from tests.test_html_backends import read_serebii_test_page, create_backends
+
+
+class TestListScraperSerebii(unittest.TestCase):
+
+    def test_parse_pokemon(self):
+        """
+        Test whether all Pokémon of the generation page are found, with their Dutch types, by every backend
+        """
+        for backend in create_backends():
+            with self.subTest(backend=backend.name):
+                mons = ListScraperSerebii("https://www.serebii.net/pokemon/gen1pokemon.shtml",
+                                          text=read_serebii_test_page(), html_backend=backend).parse_pokemon()
+
+                self.assertEqual(len(mons), 151)
+                self.assertEqual([(mon.ndex_no, mon.pkmn_name, mon.pkmn_type.type1, mon.pkmn_type.type2)
+                                  for mon in (mons[0], mons[121], mons[150])],
+                                 [(1, "Bulbasaur", "Gras", "Gif"), (122, "Mr. Mime", "Psychisch", "Fee"),
+                                  (151, "Mew", "Psychisch", "Geen")])
+
+    def test_scrape(self):
+        """
+        Test whether the list is the same with the default backend as with the BeautifulSoup tree
+        """
+        self.assertEqual(ListScraperSerebii("https://www.serebii.net/pokemon/gen1pokemon.shtml",
+                                            text=read_serebii_test_page()).scrape(),
+                         ListScraperSerebii("https://www.serebii.net/pokemon/gen1pokemon.shtml",
+                                            text=read_serebii_test_page(), html_backend="beautifulsoup").scrape())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import json
+import unittest
+from urllib.parse import urlparse, parse_qs
+
+from tests.local_http_server import LocalHttpServer
+from utils.http_fetcher import HttpFetcher
+from utils.mediawiki_revisions import MediaWikiRevisionChecker
+
+REVISIONS = {"Rockruff (Pokémon)": 3385612, "Lycanroc (Pokémon)": 3401522, "Mr. Mime (Pokémon)": 3399870}
+
+
+def api(handler):
+    # A minimal stand-in for action=query&prop=revisions, 'Mr. mime' is normalized like MediaWiki does
+    titles = parse_qs(urlparse(handler.path).query)["titles"][0].split("|")
+    normalized = [{"from": title, "to": "Mr. Mime (Pokémon)"} for title in titles if title == "Mr. mime (Pokémon)"]
+
+    pages = []
+    for title in titles:
+        title = "Mr. Mime (Pokémon)" if title == "Mr. mime (Pokémon)" else title
+        if title in REVISIONS:
+            pages.append({"title": title, "revisions": [{"revid": REVISIONS[title]}]})
+        else:
+            pages.append({"title": title, "missing": True})
+
+    return 200, {"Content-Type": "application/json"}, json.dumps({"query": {"normalized": normalized, "pages": pages}})
+
+
+class TestMediaWikiRevisionChecker(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.server = LocalHttpServer({"/w/api.php": api})
+        self.server.__enter__()
+
+    def tearDown(self) -> None:
+        self.server.__exit__(None, None, None)
+
+    def create_url(self, title: str) -> str:
+        return self.server.base_url + "/w/index.php?title={}_(Pok%C3%A9mon)&action=edit".format(title)
+
+    def test_revisions_are_requested_in_batches(self):
+        """
+        Test whether the revisions of all pages are found, batch_size titles per request
+        """
+        urls = [self.create_url(title) for title in ("Rockruff", "Lycanroc", "Mr._mime", "Missingno")]
+
+        revisions = MediaWikiRevisionChecker(HttpFetcher(min_interval=0), batch_size=2).get_revisions(urls)
+
+        self.assertEqual(revisions, {urls[0]: 3385612, urls[1]: 3401522, urls[2]: 3399870, urls[3]: None})
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_title_from_url(self):
+        """
+        Test whether the page title is taken from the title parameter or the /wiki/ path
+        """
+        self.assertEqual(MediaWikiRevisionChecker.title_from_url(
+            "https://bulbapedia.bulbagarden.net/w/index.php?title=Rockruff_(Pok%C3%A9mon)&action=edit"),
+            "Rockruff (Pokémon)")
+        self.assertEqual(MediaWikiRevisionChecker.title_from_url(
+            "https://bulbapedia.bulbagarden.net/wiki/Mr._Mime_(Pok%C3%A9mon)"), "Mr. Mime (Pokémon)")
+        self.assertRaises(ValueError, MediaWikiRevisionChecker.title_from_url, "https://bulbapedia.bulbagarden.net/")
+
+    def test_api_url_from_url(self):
+        """
+        Test whether the api.php next to index.php is used
+        """
+        self.assertEqual(MediaWikiRevisionChecker.api_url_from_url(
+            "https://bulbapedia.bulbagarden.net/w/index.php?title=Rockruff_(Pok%C3%A9mon)&action=edit"),
+            "https://bulbapedia.bulbagarden.net/w/api.php")
+
+
+if __name__ == '__main__':
+    unittest.main()
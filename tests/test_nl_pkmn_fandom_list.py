@@ -0,0 +1,91 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import io
+import os
+import tempfile
+import unittest
+
+from pokemon_lists.list_scraper_serebii import ListScraperSerebii
+from pokemon_lists.nl_pkmn_fandom_list import DutchPokemonFandomPokemonList
+from tests.test_html_backends import read_serebii_test_page
+from utils.atomic_file import open_atomic
+from utils.html_backends import HtmlParserBackend
+from utils.pokemon import Pokemon
+from utils.pokemon_type import PokemonType
+
+
+class TestDutchPokemonFandomPokemonList(unittest.TestCase):
+
+    def test_write_to(self):
+        """
+        Test whether writing the list to a file handle gives the same text as generating it as a whole, for added
+            Pokémon followed by the Pokémon of an iterable
+        """
+        fandom_list = DutchPokemonFandomPokemonList([Pokemon("Lycanroc", 745, PokemonType(["rock"]))])
+        fandom_list.add_pokemon(Pokemon("Rockruff", 744, PokemonType(["rock"])))
+
+        output = io.StringIO()
+        fandom_list.write_to(output)
+
+        self.assertEqual(output.getvalue(), fandom_list.generate_fandom_list())
+        self.assertEqual(output.getvalue(), DutchPokemonFandomPokemonList.prefix +
+                         "|-\n| 744\n| [[Rockruff]]\n| {{Type|Steen}}\n| Geen\n| [[Bestand:744.png]]\n"
+                         "|-\n| 745\n| [[Lycanroc]]\n| {{Type|Steen}}\n| Geen\n| [[Bestand:745.png]]\n" +
+                         DutchPokemonFandomPokemonList.suffix)
+
+    def test_rows_are_written_while_parsing(self):
+        """
+        Test whether a row is yielded as soon as its Pokémon is parsed, before the next Pokémon is asked for
+        """
+        parsed = []
+
+        def parse_pokemon():
+            for ndex, name in ((744, "Rockruff"), (745, "Lycanroc")):
+                parsed.append(name)
+                yield Pokemon(name, ndex, PokemonType(["rock"]))
+
+        chunks = DutchPokemonFandomPokemonList(parse_pokemon()).iter_fandom_list()
+
+        self.assertEqual(next(chunks), DutchPokemonFandomPokemonList.prefix)
+        self.assertEqual(parsed, [])
+        self.assertIn("[[Rockruff]]", next(chunks))
+        self.assertEqual(parsed, ["Rockruff"])
+        self.assertEqual(list(chunks)[-1], DutchPokemonFandomPokemonList.suffix)
+
+    def test_serebii_page_in_chunks(self):
+        """
+        Test whether a page read in small chunks gives the same list as a page read at once
+        """
+        url = "https://www.serebii.net/pokemon/gen1pokemon.shtml"
+        output = io.StringIO()
+        ListScraperSerebii(url, text=read_serebii_test_page(), html_backend=HtmlParserBackend(512)).write_to(output)
+
+        self.assertEqual(output.getvalue(), ListScraperSerebii(url, text=read_serebii_test_page(),
+                                                               html_backend=HtmlParserBackend()).scrape())
+        self.assertEqual(output.getvalue().count("|-\n"), 152)
+
+
+    def test_failing_page_keeps_the_earlier_output(self):
+        """
+        Test whether a Pokémon that fails to parse halfway through the list leaves the output of an earlier run as it
+            was, without a temporary file behind
+        """
+        def parse_pokemon():
+            yield Pokemon("Rockruff", 744, PokemonType(["rock"]))
+            raise ValueError("The format of the page changed")
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            output_path = os.path.join(output_dir, "output.txt")
+            with open(output_path, "w", encoding='utf8') as output_file:
+                output_file.write("earlier run")
+
+            with self.assertRaises(ValueError):
+                with open_atomic(output_path) as output_file:
+                    DutchPokemonFandomPokemonList(parse_pokemon()).write_to(output_file)
+
+            self.assertEqual(os.listdir(output_dir), ["output.txt"])
+            with open(output_path, encoding='utf8') as output_file:
+                self.assertEqual(output_file.read(), "earlier run")
+
+if __name__ == '__main__':
+    unittest.main()
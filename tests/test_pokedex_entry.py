@@ -0,0 +1,89 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import io
+import unittest
+
+from pokemon_dex_entries.pokedex_entry import PokedexEntry, PokedexFormEntry
+from utils.evolution_line import EvolutionLine, EvolutionStep
+
+
+def create_test_entry() -> PokedexEntry:
+    evo_line = EvolutionLine(EvolutionStep("Rockruff", "744", 1))
+    evo_line.first.add_next(EvolutionStep("Lycanroc", "745", 2))
+
+    return PokedexEntry("Rockruff", None, "イワンコ Iwanko", "Generatie VII", "Puppy", "Steen", None,
+                        ["Keen Eye", "Vital Spirit"], "Steadfast", "744", "Lycanroc", "Ribombee", evo_line, 50, "0.5",
+                        "9.2", "1'08\"", "20.3", ["Veld"], "Bruin", "08", None, None, None, None, None, None,
+                        "103/126", "157")
+
+
+class TestPokedexEntry(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.test_entry = create_test_entry()
+        self.test_entry.add_forms([PokedexFormEntry(
+            form_name="Midnight Form",
+            types=["Duister", "Steen"],
+            abilities=["Keen Eye"],
+            hidden_ability="No Guard",
+            met_height="1.1",
+            met_weight="25.0",
+            imp_height="3'07\"",
+            imp_weight="55.1"
+        )])
+
+    def test_write_dutch_wiki_entry(self):
+        """
+        Test whether streaming the entry to a file handle gives the same text as creating it as a whole
+        """
+        output = io.StringIO()
+        self.test_entry.write_dutch_wiki_entry(output)
+
+        self.assertEqual(output.getvalue(), self.test_entry.create_dutch_wiki_entry())
+        self.assertGreater(len(list(self.test_entry.iter_dutch_wiki_entry())), 1)
+
+    def test_forms(self):
+        """
+        Test whether a form gets its own fields and ndex, and shares the other fields with the base entry
+        """
+        wiki_entry = self.test_entry.create_dutch_wiki_entry()
+        base_entry, _, form_entry = wiki_entry.partition(PokedexEntry.delimiter_multi_forms)
+
+        self.assertTrue(base_entry.startswith(PokedexEntry.prefix_multi_forms + "Rockruff=\n"))
+        self.assertTrue(form_entry.startswith("Midnight Form=\n"))
+        self.assertIn("| ndex        = 744B\n", form_entry)
+        self.assertIn("| type        = Duister\n| type2       = Steen\n", form_entry)
+        self.assertIn("| soort       = Puppy Pokémon\n", form_entry)
+        self.assertIn("| evoin       = Lycanroc\n", form_entry)
+
+    def test_form_without_optional_fields(self):
+        """
+        Test whether a form leaves out the optional fields it has no value for, even when its base entry has them
+        """
+        self.test_entry.add_forms([PokedexFormEntry("Dusk Form", ["Steen", None], ["Tough Claws"], None, "0.8",
+                                                    "25.0", "2'07\"", "55.1")])
+
+        wiki_entry = self.test_entry.create_dutch_wiki_entry()
+        base_entry, midnight_entry, dusk_entry = wiki_entry.split(PokedexEntry.delimiter_multi_forms)
+
+        self.assertIn("| dw          = Steadfast\n", base_entry)
+        self.assertIn("| ndex        = 744C\n| ndexvorig   = Ribombee\n", dusk_entry)
+        self.assertIn("| type        = Steen\n| dexalola    = 103/126\n", dusk_entry)
+        self.assertIn("| gave        = [[Tough Claws]]\n| mannelijk   = 50\n", dusk_entry)
+        self.assertIn("| type2       = Steen\n", midnight_entry)
+
+    def test_lazy_fields(self):
+        """
+        Test whether a lazy field is resolved once, and an unknown field still raises an AttributeError
+        """
+        calls = []
+        dex_entry = PokedexEntry.create_lazy(name=lambda: calls.append("name") or "Rockruff")
+
+        self.assertEqual(dex_entry.name, "Rockruff")
+        self.assertEqual(dex_entry.name, "Rockruff")
+        self.assertEqual(calls, ["name"])
+        self.assertRaises(AttributeError, getattr, dex_entry, "type")
+
+
+if __name__ == '__main__':
+    unittest.main()
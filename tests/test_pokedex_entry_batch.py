@@ -0,0 +1,144 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from pokemon_dex_entries.abstract_pokedex_entry import AbstractPokedexEntry
+from pokemon_dex_entries.pokedex_entry_batch import PokedexEntryBatch, read_sources_file, parse_ndex_range, \
+    split_changed_sources
+
+
+class FakeDexEntry:
+    def __init__(self, name: str, ndex_num: str):
+        self.name = name
+        self.ndex_num = ndex_num
+
+
+class FakePokedexEntry(AbstractPokedexEntry):
+    """Stand-in for PokedexEntryBulbapedia, the url decides whether the setup fails"""
+
+    def __init__(self, url: str):
+        super().__init__()
+        self.url = url
+
+    def setup(self):
+        if "Broken" in self.url:
+            raise KeyError("name")
+        self.dex_entry = FakeDexEntry("Type: Null", "772")
+
+    def build_template(self):
+        return "{{PokémonInfobox\n| naam        = Type: Null\n}}"
+
+    def write_template(self, fp):
+        if "Unrenderable" in self.url:
+            # A lazy field that fails to parse halfway through the template
+            fp.write("{{PokémonInfobox\n")
+            raise KeyError("ndex")
+        super().write_template(fp)
+
+
+class TestPokedexEntryBatch(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.output_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.output_dir.cleanup()
+
+    @mock.patch("pokemon_dex_entries.pokedex_entry_batch.EntryScraperFactory.create",
+                side_effect=lambda source_type, url, **kwargs: FakePokedexEntry(url))
+    def test_run_reports_every_source(self, mocked_create):
+        """
+        Test whether every source gets a result (in order) and a failing source does not stop the batch
+        """
+        sources = ["https://test/Type:_Null", "https://test/Broken"]
+        batch = PokedexEntryBatch(sources, output_dir=self.output_dir.name, max_workers=2)
+
+        results = batch.run()
+
+        self.assertEqual([result.source for result in results], sources)
+        self.assertTrue(results[0].succeeded)
+        self.assertFalse(results[1].succeeded)
+        self.assertIsInstance(results[1].error, KeyError)
+
+        with open(results[0].output_path, encoding='utf8') as output_file:
+            self.assertEqual(output_file.read(), "{{PokémonInfobox\n| naam        = Type: Null\n}}")
+        self.assertEqual(os.path.basename(results[0].output_path), "772_Type_ Null.txt")
+
+        report = PokedexEntryBatch.create_report(results)
+        self.assertIn("FAILED https://test/Broken (KeyError: 'name')", report)
+        self.assertTrue(report.endswith("1 succeeded, 1 failed"))
+
+    @mock.patch("pokemon_dex_entries.pokedex_entry_batch.EntryScraperFactory.create",
+                side_effect=lambda source_type, url, **kwargs: FakePokedexEntry(url))
+    def test_run_async(self, mocked_create):
+        """
+        Test whether the async run gives the same results as the blocking run
+        """
+        sources = ["https://test/Type:_Null", "https://test/Broken"]
+        batch = PokedexEntryBatch(sources, output_dir=self.output_dir.name, max_workers=2)
+
+        results = batch.run_async()
+
+        self.assertEqual([(result.source, result.succeeded) for result in results],
+                         [("https://test/Type:_Null", True), ("https://test/Broken", False)])
+        self.assertTrue(os.path.exists(results[0].output_path))
+
+    @mock.patch("pokemon_dex_entries.pokedex_entry_batch.EntryScraperFactory.create",
+                side_effect=lambda source_type, url, **kwargs: FakePokedexEntry(url))
+    def test_failing_render_leaves_no_partial_file(self, mocked_create):
+        """
+        Test whether an entry that fails while it is rendered leaves the file of an earlier run as it was, without a
+            partial file or a temporary file behind
+        """
+        output_path = os.path.join(self.output_dir.name, "772_Type_ Null.txt")
+        with open(output_path, "w", encoding='utf8') as output_file:
+            output_file.write("earlier run")
+
+        results = PokedexEntryBatch(["https://test/Unrenderable"], output_dir=self.output_dir.name).run()
+
+        self.assertIsInstance(results[0].error, KeyError)
+        self.assertEqual(os.listdir(self.output_dir.name), ["772_Type_ Null.txt"])
+        with open(output_path, encoding='utf8') as output_file:
+            self.assertEqual(output_file.read(), "earlier run")
+
+    def test_read_sources_file(self):
+        """
+        Test whether names are converted to Bulbapedia urls, urls are kept and comments/empty lines are skipped
+        """
+        path = os.path.join(self.output_dir.name, "sources.txt")
+        with open(path, "w", encoding='utf8') as sources_file:
+            sources_file.write("# Gen VII\nRockruff\n\nMr. Mime\nhttps://test/url\n")
+
+        self.assertEqual(read_sources_file(path), [
+            "https://bulbapedia.bulbagarden.net/w/index.php?title=Rockruff_(Pok%C3%A9mon)&action=edit",
+            "https://bulbapedia.bulbagarden.net/w/index.php?title=Mr._Mime_(Pok%C3%A9mon)&action=edit",
+            "https://test/url"
+        ])
+
+    def test_parse_ndex_range(self):
+        """
+        Test whether ranges and single numbers are parsed, and invalid ranges are rejected
+        """
+        self.assertEqual(parse_ndex_range("1-151"), (1, 151))
+        self.assertEqual(parse_ndex_range("25"), (25, 25))
+        self.assertRaises(ValueError, parse_ndex_range, "151-1")
+
+    def test_split_changed_sources(self):
+        """
+        Test whether only sources stored with their current revision are unchanged
+        """
+        sources = ["https://test/same", "https://test/edited", "https://test/new", "https://test/unknown"]
+        revisions = {"https://test/same": 10, "https://test/edited": 12, "https://test/new": 5}
+        stored_revisions = {"https://test/same": 10, "https://test/edited": 11, "https://test/unknown": None}
+
+        changed, unchanged = split_changed_sources(sources, revisions, stored_revisions)
+
+        self.assertEqual(changed, ["https://test/edited", "https://test/new", "https://test/unknown"])
+        self.assertEqual(unchanged, ["https://test/same"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import unittest
+from unittest import mock
+
+from pokemon_dex_entries.bulbapedia.pokedex_entry_parser_bulbapedia import PokedexEntryParserPokemonStrategyBulbapedia
+from tests.test_pokedex_entry_scraper_bulbapedia import EXPECTED_RAW_EVO_LINES
+from utils.evolution_graph_store import EvolutionGraphStore
+from utils.translation_cache import TranslationCache
+
+
+class TestPokedexEntryParserPokemonStrategyBulbapedia(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.backend = mock.Mock(return_value="hondje")
+        self.test_parser = PokedexEntryParserPokemonStrategyBulbapedia({"name": "Rockruff", "category": "Puppy",
+                                                                        "type1": "Rock"}, {},
+                                                                       EXPECTED_RAW_EVO_LINES, {},
+                                                                       TranslationCache(seed={}, backend=self.backend))
+
+    def test_parse_raw_evolution_line(self):
+        """
+        Test whether all key=value pairs are parsed, and '|' inside nested templates and links does not split a value
+        """
+        evo_dict = PokedexEntryParserPokemonStrategyBulbapedia.parse_raw_evolution_line(
+            "-2|no1=744Rockruff|name1=Rockruff|evo1={{bag|Rare Candy}} [[File:Sun.png|24px]]|no2=745|name2=Lycanroc")
+
+        self.assertEqual(evo_dict, {
+            "no1": "744Rockruff",
+            "name1": "Rockruff",
+            "evo1": "{{bag|Rare Candy}} [[File:Sun.png|24px]]",
+            "no2": "745",
+            "name2": "Lycanroc"
+        })
+
+    def test_parse_pokemon_evo_line(self):
+        """
+        Test whether the main and the secondary evolution lines of Rockruff are combined into one line
+        """
+        evo_line = self.test_parser.parse_pokemon_evo_line()
+
+        self.assertEqual(evo_line.first.pokemon_name, "Rockruff")
+        self.assertEqual(evo_line.first.ndex, "744")
+        self.assertEqual([(step.pokemon_name, step.ndex, step.evo_stage) for step in evo_line.first.next],
+                         [("Lycanroc", "745", 2)])
+
+    def test_evo_line_is_added_to_an_empty_store(self):
+        """
+        Test whether the family is added to the given store while it is still empty, not to the default store
+        """
+        evolution_graph_store = EvolutionGraphStore()
+        test_parser = PokedexEntryParserPokemonStrategyBulbapedia({"name": "Rockruff"}, {}, EXPECTED_RAW_EVO_LINES, {},
+                                                                  TranslationCache(seed={}, backend=self.backend),
+                                                                  evolution_graph_store)
+
+        evo_line = test_parser.parse_pokemon_evo_line()
+
+        self.assertEqual(evolution_graph_store.get_family("Rockruff"), [evo_line])
+
+    def test_evo_line_without_evobox(self):
+        """
+        Test whether a Pokémon without an Evobox (it does not evolve) gets a line of its own, which is not stored
+        """
+        evolution_graph_store = EvolutionGraphStore()
+        test_parser = PokedexEntryParserPokemonStrategyBulbapedia({"name": "Tauros", "ndex": "128"}, {}, [], {},
+                                                                  TranslationCache(seed={}, backend=self.backend),
+                                                                  evolution_graph_store)
+
+        evo_line = test_parser.parse_pokemon_evo_line()
+
+        self.assertEqual((evo_line.first.pokemon_name, evo_line.first.ndex, evo_line.first.next),
+                         ("Tauros", "128", []))
+        self.assertFalse(test_parser.has_parsable_evo_line())
+        self.assertEqual(len(evolution_graph_store), 0)
+
+    def test_parse_pokemon_species(self):
+        """
+        Test whether the species is translated through the given translation cache, only once
+        """
+        self.assertEqual(self.test_parser.parse_pokemon_species(), "Hondje")
+        self.assertEqual(self.test_parser.parse_pokemon_species(), "Hondje")
+        self.backend.assert_called_once_with("Puppy", "en", "nl")
+
+    def test_characteristics_are_parsed_once(self):
+        """
+        Test whether a characteristic used by multiple fields (type and type2) is only parsed once
+        """
+        strategy = self.test_parser.form_strategy
+        with mock.patch.object(strategy, "parse_pokemon_types", wraps=strategy.parse_pokemon_types) as parse_types:
+            dex_entry = self.test_parser.build_pokedex_entry()
+
+            self.assertEqual((dex_entry.type, dex_entry.type2), ("Steen", None))
+            self.assertEqual(self.test_parser.build_pokedex_form_entry().types, ["Steen", None])
+            parse_types.assert_called_once_with()
+
+    def test_fields_are_resolved_lazily(self):
+        """
+        Test whether a field of the PokedexEntry is only parsed once it is used
+        """
+        dex_entry = self.test_parser.build_pokedex_entry()
+
+        self.backend.assert_not_called()
+        self.assertEqual(dex_entry.species, "Hondje")
+        self.backend.assert_called_once_with("Puppy", "en", "nl")
+
+
+if __name__ == '__main__':
+    unittest.main()
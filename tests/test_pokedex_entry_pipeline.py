@@ -0,0 +1,132 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import os
+import tempfile
+import unittest
+from urllib.parse import urlparse, parse_qs
+
+from pokemon_dex_entries.pokedex_entry_batch import PokedexEntryBatch
+from pokemon_dex_entries.pokedex_entry_pipeline import PokedexEntryPipeline, PipelineStageStats
+from tests.local_http_server import LocalHttpServer
+from utils.evolution_graph_store import EvolutionGraphStore
+from utils.http_fetcher import HttpFetcher
+from utils.translation_cache import TranslationCache
+
+
+def translate_backwards(text: str, src: str, dest: str) -> str:
+    # A translator backend that can be sent to a worker process
+    return text[::-1]
+
+
+class TestPokedexEntryPipeline(unittest.TestCase):
+
+    def setUp(self) -> None:
+        with open(os.path.join(os.path.dirname(__file__), "resources", "Rockruff_Test_Page.wiki"), 'r',
+                  encoding='utf8') as wikitext_file:
+            wikitext = wikitext_file.read()
+
+        def index(handler):
+            # Every page is Rockruff, with the number of the page as its national dex number
+            ndex = int(parse_qs(urlparse(handler.path).query)["title"][0].split("_")[-1])
+            return 200, {"Content-Type": "text/plain; charset=utf-8"}, \
+                wikitext.replace("|ndex=744", "|ndex={:03}".format(ndex), 1)
+
+        self.server = LocalHttpServer({"/w/index.php": index})
+        self.server.__enter__()
+        self.sources = [self.server.base_url + "/w/index.php?title=Page_{}&action=edit".format(ndex)
+                        for ndex in (1, 2, 3)]
+
+        self.cache_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.server.__exit__(None, None, None)
+        self.cache_dir.cleanup()
+
+    def create_entry_options(self) -> dict:
+        return {"translator": TranslationCache(os.path.join(self.cache_dir.name, "translations.json"),
+                                               seed={"puppy": "Puppy"}),
+                "evolution_graph_store": EvolutionGraphStore(os.path.join(self.cache_dir.name, "evolution.json"))}
+
+    @staticmethod
+    def read_outputs(results: list) -> list:
+        outputs = []
+        for result in results:
+            with open(result.output_path, encoding='utf8') as output_file:
+                outputs.append((os.path.basename(result.output_path), output_file.read()))
+        return outputs
+
+    def test_same_entries_as_a_batch(self):
+        """
+        Test whether the pipeline writes exactly the entries a batch writes, and shares the evolution line
+        """
+        with tempfile.TemporaryDirectory() as batch_dir, tempfile.TemporaryDirectory() as pipeline_dir:
+            batch_results = PokedexEntryBatch(self.sources, output_dir=batch_dir, max_workers=2,
+                                              fetcher=HttpFetcher(min_interval=0),
+                                              entry_options=self.create_entry_options()).run()
+
+            entry_options = self.create_entry_options()
+            pipeline = PokedexEntryPipeline(self.sources, output_dir=pipeline_dir, max_workers=2,
+                                            fetcher=HttpFetcher(min_interval=0), entry_options=entry_options,
+                                            processes=2)
+            pipeline_results = pipeline.run()
+
+            self.assertEqual([result.source for result in pipeline_results], self.sources)
+            self.assertTrue(all(result.succeeded for result in pipeline_results),
+                            PokedexEntryBatch.create_report(pipeline_results))
+            self.assertEqual(self.read_outputs(pipeline_results), self.read_outputs(batch_results))
+
+        # The three pages are one family, added to the store of the main process
+        self.assertEqual(len(entry_options["evolution_graph_store"]), 1)
+
+        for stage in ("fetch", "parse", "render", "total"):
+            self.assertEqual(pipeline.stats[stage].pages, 3)
+        self.assertEqual(len(pipeline.create_throughput_report().splitlines()), 4)
+
+    def test_translations_are_stored_by_the_main_process(self):
+        """
+        Test whether the translations the worker processes request end up in the translator of the main process (and
+            its file)
+        """
+        path = os.path.join(self.cache_dir.name, "translations.json")
+        translator = TranslationCache(path, seed={"rock": "Steen"}, backend=translate_backwards)
+        # Loaded before the workers request anything
+        self.assertEqual(translator.translate("Rock"), "Steen")
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            results = PokedexEntryPipeline(self.sources, output_dir=output_dir, max_workers=2,
+                                           fetcher=HttpFetcher(min_interval=0),
+                                           entry_options={"translator": translator}, processes=2).run()
+            self.assertTrue(all(result.succeeded for result in results), PokedexEntryBatch.create_report(results))
+
+        translator.backend = None
+        self.assertEqual(translator.translate("Puppy"), "yppuP")
+        self.assertEqual(TranslationCache(path, seed={}).translate("Puppy"), "yppuP")
+
+    def test_failing_page(self):
+        """
+        Test whether a page that cannot be fetched fails on its own, without stopping the pipeline
+        """
+        sources = [self.sources[0], self.server.base_url + "/missing"]
+        with tempfile.TemporaryDirectory() as output_dir:
+            pipeline = PokedexEntryPipeline(sources, output_dir=output_dir, max_workers=2,
+                                            fetcher=HttpFetcher(min_interval=0, max_retries=0),
+                                            entry_options=self.create_entry_options(), processes=1)
+            results = pipeline.run()
+
+        self.assertEqual([(result.source, result.succeeded) for result in results],
+                         [(sources[0], True), (sources[1], False)])
+        self.assertEqual(pipeline.stats["parse"].pages, 1)
+
+    def test_stage_stats(self):
+        """
+        Test whether the throughput of a stage is measured over the period it was active, not its busy time
+        """
+        stats = PipelineStageStats("parse", 2)
+        stats.add(10.0, 11.0)
+        stats.add(10.0, 11.0)
+        stats.add(11.0, 12.0)
+
+        self.assertEqual(stats.pages, 3)
+        self.assertEqual(stats.busy, 3.0)
+        self.assertEqual(stats.pages_per_second, 1.5)
+        self.assertEqual(PipelineStageStats("parse", 2).pages_per_second, 0.0)
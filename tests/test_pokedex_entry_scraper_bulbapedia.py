@@ -1,5 +1,7 @@
 #  Copyright (c) 2021 Aaron Beetstra
 #  All rights reserved.
+import asyncio
+import json
 import os
 import unittest
 from unittest import mock
@@ -7,6 +9,10 @@ from unittest import mock
 from bs4 import BeautifulSoup
 
 from pokemon_dex_entries.bulbapedia.pokedex_entry_scraper_bulbapedia import PokedexEntryScraperPokemonBulbapedia
+from tests.local_http_server import LocalHttpServer
+from utils.async_http_fetcher import AsyncHttpFetcher
+from utils.http_fetcher import HttpFetcher
+from utils.wikitext_parser import WikitextDocument
 
 
 def generate_test_file_path():
@@ -16,6 +22,35 @@ def generate_test_file_path():
     return abs_file_path
 
 
+def read_test_wikitext():
+    # The raw wikitext (action=raw) of the same Rockruff page
+    script_dir = os.path.dirname(__file__)
+    with open(os.path.join(script_dir, "resources/Rockruff_Test_Page.wiki"), 'r', encoding='utf8') as wikitext_file:
+        return wikitext_file.read()
+
+
+def create_mocked_sections_responses(url: str, wikitext: str, revision: int = 42) -> dict:
+    # The responses of MediaWiki to the sections request and the section requests of an article with this wikitext
+    document = WikitextDocument(wikitext)
+    sections = [{"index": "T-1", "line": "Evolution", "level": "2"}]
+    responses = {PokedexEntryScraperPokemonBulbapedia.create_section_url(url, 0, revision): wikitext[:document.lead_end]}
+    for index, section in enumerate(document.sections, 1):
+        sections.append({"index": str(index), "line": section.title, "level": str(section.level)})
+        responses[PokedexEntryScraperPokemonBulbapedia.create_section_url(url, index, revision)] = \
+            wikitext[section.start:section.end].rstrip("\n")
+    responses[PokedexEntryScraperPokemonBulbapedia.create_sections_url(url)] = json.dumps(
+        {"parse": {"title": "Rockruff (Pokémon)", "revid": revision, "sections": sections}})
+    return responses
+
+
+# The results we expect for the Rockruff page, from the wikitext and from its sections
+EXPECTED_INFOBOX = {'name': 'Rockruff', 'jname': 'イワンコ', 'tmname': 'Iwanko', 'form2': 'Event', 'ndex': '744', 'type1': 'Rock', 'category': 'Puppy', 'height-ftin': '1\'08"', 'height-m': '0.5', 'weight-lbs': '20.3', 'weight-kg': '9.2', 'abilitylayout': '2+1', 'abilitycold': '2', 'ability1': 'Keen Eye', 'ability2': 'Vital Spirit', 'abilityd': 'Steadfast', 'ability2-1': 'Own Tempo', 'egggroupn': '1', 'egggroup1': 'Field', 'eggcycles': '15', 'evtotal': '1', 'evat': '1', 'expyield': '56', 'lv100exp': '1,000,000', 'gendercode': '127', 'color': 'Brown', 'catchrate': '190', 'body': '08', 'pokefordex': 'rockruff', 'generation': '7', 'friendship': '70'}
+EXPECTED_PREV_NEXT = {'type': 'Rock', 'prevnum': '743', 'prev': 'Ribombee', 'nextnum': '745', 'next': 'Lycanroc', 'roundleft': 'tl', 'roundright': 'tr'}
+EXPECTED_RAW_EVO_LINES = ['/1branch2|type1=Rock|no1=744|name1=Rockruff|type1-1=Rock|evo1a={{bag|Rare Candy}} [[File:HOME Sun icon.png|24px|Pokémon Sun|link=Pokémon Sun and Moon]][[File:HOME Ultra Sun icon.png|24px|Pokémon Ultra Sun|link=Pokémon Ultra Sun and Ultra Moon]]<br>Level 25<br><small>during the {{color2|000|time|day}}<br>in {{color2|000|Pokémon Sun and Moon|Pokémon Sun}}<br>or {{color2|000|Pokémon Ultra Sun and Ultra Moon|Ultra Sun}}|no2a=745|name2a=Lycanroc|form2a=Midday Form|type1-2a=Rock|evo1b={{bag|Rare Candy}} [[File:HOME Moon icon.png|24px|Pokémon Sun|link=Pokémon Sun and Moon]][[File:HOME Ultra Moon icon.png|24px|Pokémon Ultra Sun|link=Pokémon Ultra Sun and Ultra Moon]]<br>Level 25<br><small>at {{color2|000|time|night}}<br>in {{color2|000|Pokémon Sun and Moon|Pokémon Moon}}<br>or {{color2|000|Pokémon Ultra Sun and Ultra Moon|Ultra Moon}}|no2b=745|art2b=745Lycanroc-Midnight|name2b=Lycanroc|form2b=Midnight Form|type1-2b=Rock', '-2|pictype=sprite|type1=Rock|no1=744Rockruff|name1=Rockruff|type1-1=Rock|evo1={{bag|Rare Candy}} + {{bag|Ability Urge}}<br>{{color2|000|Level|Level 25}}<br><small>between {{color2|000|time|5:00<br>and 5:59 PM}} in-game<br>if its {{color2|000|Ability}} is {{acolor|Own Tempo|000}}</small>|no2=745Lycanroc-Dusk|name2=Lycanroc|type1-2=Rock', '/1branch2|type1=Rock|no1=744|name1=Rockruff|type1-1=Rock|evo1a={{bag|Rare Candy}}<br>Level 25<br><small>during the {{color2|000|time|day}}|no2a=745|name2a=Lycanroc|form2a=Midday Form|type1-2a=Rock|evo1b={{bag|Rare Candy}}<br>Level 25<br><small>at {{color2|000|time|night}}|no2b=745|art2b=745Lycanroc-Midnight|name2b=Lycanroc|form2b=Midnight Form|type1-2b=Rock', '-2|pictype=sprite|type1=Rock|no1=744Rockruff|name1=Rockruff|type1-1=Rock|evo1={{bag|Rare Candy}} + {{bag|Ability Urge}}<br>{{color2|000|Level|Level 25}}<br><small>between {{color2|000|time|7:00<br>and 7:59 PM}} real-time<br>if its {{color2|000|Ability}} is {{acolor|Own Tempo|000}}</small>|no2=745Lycanroc-Dusk|name2=Lycanroc|type1-2=Rock']
+EXPECTED_FORMS = {}
+EXPECTED_LOCAL_DEX = {'Alola': ['103', '126'], 'Galar': ['157']}
+
+
 def mocked_get_request(*args, **kwargs):
     class MockHtmlResponse:
 
@@ -87,6 +122,182 @@ class TestPokedexEntryScraperPokemonBulbapedia(unittest.TestCase):
         self.assertEqual(r_forms, expected_forms)
         self.assertEqual(r_local_dex, expected_local_dex)
 
+    def test_create_raw_url(self):
+        """
+        Test whether the edit url is converted to the url of the raw wikitext
+        """
+        self.assertEqual(PokedexEntryScraperPokemonBulbapedia.create_raw_url(self.test_url),
+                         "https://bulbapedia.bulbagarden.net/w/index.php?title=Rockruff_(Pok%C3%A9mon)&action=raw")
+        self.assertEqual(PokedexEntryScraperPokemonBulbapedia.create_raw_url("https://test/index.php?title=Rockruff"),
+                         "https://test/index.php?title=Rockruff&action=raw")
+
+    def test_extract_text_area_text(self):
+        """
+        Test whether scanning the edit page for the textarea gives the same text as BeautifulSoup
+        """
+        with open(generate_test_file_path(), 'r', encoding='utf8') as html_file:
+            html = html_file.read()
+
+        expected_text = BeautifulSoup(html, 'html.parser').find("textarea", id="wpTextbox1").text
+
+        self.assertEqual(PokedexEntryScraperPokemonBulbapedia.extract_text_area_text(html), expected_text)
+
+    def test_mocked_get_wikitext(self):
+        """
+        Test whether the raw wikitext is requested in the (default) raw fetch mode
+        Mocked the fetcher to a local file
+        """
+        fetcher = mock.Mock()
+        fetcher.get_text.return_value = read_test_wikitext()
+
+        test_scraper = PokedexEntryScraperPokemonBulbapedia(self.test_url, fetcher)
+        test_scraper.get_wikitext()
+
+        fetcher.get_text.assert_called_once_with(PokedexEntryScraperPokemonBulbapedia.create_raw_url(self.test_url))
+        self.assertEqual(test_scraper.wikitext, read_test_wikitext())
+
+    def test_mocked_get_wikitext_async(self):
+        """
+        Test whether the async variant requests the same url through the async fetcher, in edit mode as well
+        Mocked the async fetcher to the local files
+        """
+        with open(generate_test_file_path(), 'r', encoding='utf8') as html_file:
+            html = html_file.read()
+        fetcher = mock.Mock()
+        fetcher.get_text = mock.AsyncMock(return_value=html)
+
+        test_scraper = PokedexEntryScraperPokemonBulbapedia(self.test_url, fetch_mode="edit")
+        asyncio.run(test_scraper.get_wikitext_async(fetcher))
+
+        fetcher.get_text.assert_awaited_once_with(self.test_url)
+        self.assertEqual(test_scraper.wikitext, PokedexEntryScraperPokemonBulbapedia.extract_text_area_text(html))
+
+    def test_mocked_get_wikitext_sections(self):
+        """
+        Test whether only the lead, the Evolution section and the Pokédex entries of the Game data section are
+            requested in the sections fetch mode, and the same data is generated from them as from the whole article
+        Mocked the fetcher to the sections of the local Rockruff page
+        """
+        responses = create_mocked_sections_responses(self.test_url, read_test_wikitext())
+        fetcher = mock.Mock()
+        fetcher.get_text.side_effect = responses.get
+
+        test_scraper = PokedexEntryScraperPokemonBulbapedia(self.test_url, fetcher, fetch_mode="sections")
+        test_scraper.get_wikitext()
+
+        self.assertEqual([call.args[0] for call in fetcher.get_text.call_args_list], [
+            PokedexEntryScraperPokemonBulbapedia.create_sections_url(self.test_url),
+            PokedexEntryScraperPokemonBulbapedia.create_section_url(self.test_url, 0, 42),
+            PokedexEntryScraperPokemonBulbapedia.create_section_url(self.test_url, 28, 42),
+            PokedexEntryScraperPokemonBulbapedia.create_section_url(self.test_url, 14, 42)
+        ])
+        self.assertLess(len(test_scraper.wikitext), len(read_test_wikitext()) / 2)
+        self.assertEqual(test_scraper.generate_usable_data(), (EXPECTED_INFOBOX, EXPECTED_PREV_NEXT,
+                                                                EXPECTED_RAW_EVO_LINES, EXPECTED_FORMS,
+                                                                EXPECTED_LOCAL_DEX))
+
+    def test_mocked_get_wikitext_sections_async(self):
+        """
+        Test whether the async variant requests the same sections through the async fetcher
+        Mocked the async fetcher to the sections of the local Rockruff page
+        """
+        responses = create_mocked_sections_responses(self.test_url, read_test_wikitext())
+        fetcher = mock.Mock()
+        fetcher.get_text = mock.AsyncMock(side_effect=responses.get)
+
+        test_scraper = PokedexEntryScraperPokemonBulbapedia(self.test_url, fetch_mode="sections")
+        asyncio.run(test_scraper.get_wikitext_async(fetcher))
+
+        self.assertEqual(fetcher.get_text.await_count, 4)
+        self.assertEqual(test_scraper.generate_usable_data()[2], EXPECTED_RAW_EVO_LINES)
+
+    def test_mocked_get_wikitext_sections_fallback(self):
+        """
+        Test whether the whole article is requested when it has no Game data section, or a section moved in between
+        Mocked the fetcher to the sections of the local Rockruff page, without Game data or with the wrong section
+        """
+        raw_url = PokedexEntryScraperPokemonBulbapedia.create_raw_url(self.test_url)
+        for wikitext, moved in ((read_test_wikitext().replace("==Game data==", "==Data=="), False),
+                                (read_test_wikitext(), True)):
+            responses = create_mocked_sections_responses(self.test_url, wikitext)
+            if moved:
+                responses[PokedexEntryScraperPokemonBulbapedia.create_section_url(self.test_url, 28, 42)] = "==Sprites=="
+            responses[raw_url] = read_test_wikitext()
+            fetcher = mock.Mock()
+            fetcher.get_text.side_effect = responses.get
+
+            test_scraper = PokedexEntryScraperPokemonBulbapedia(self.test_url, fetcher, fetch_mode="sections")
+            test_scraper.get_wikitext()
+
+            self.assertEqual(fetcher.get_text.call_args_list[-1].args[0], raw_url)
+            self.assertEqual(test_scraper.wikitext, read_test_wikitext())
+
+    def test_get_wikitext_sections_http_error(self):
+        """
+        Test whether the whole article is requested when a section request fails with an HTTP error, blocking and async
+        Served by a local server that has no Evolution section (404)
+        """
+        responses = {}
+
+        def serve(handler):
+            text = responses.get(server.base_url + handler.path)
+            return (200, {"Content-Type": "text/plain; charset=utf-8"}, text) if text is not None \
+                else (404, {}, "Not found")
+
+        with LocalHttpServer({"/w/index.php": serve, "/w/api.php": serve}) as server:
+            url = server.base_url + "/w/index.php?title=Rockruff_(Pok%C3%A9mon)&action=edit"
+            responses.update(create_mocked_sections_responses(url, read_test_wikitext()))
+            del responses[PokedexEntryScraperPokemonBulbapedia.create_section_url(url, 28, 42)]
+            responses[PokedexEntryScraperPokemonBulbapedia.create_raw_url(url)] = read_test_wikitext()
+            fetcher = HttpFetcher(min_interval=0, max_retries=0)
+
+            test_scraper = PokedexEntryScraperPokemonBulbapedia(url, fetcher, fetch_mode="sections")
+            self.assertEqual(test_scraper.get_wikitext(), read_test_wikitext())
+
+            async_fetcher = AsyncHttpFetcher(fetcher)
+            try:
+                test_scraper = PokedexEntryScraperPokemonBulbapedia(url, fetch_mode="sections")
+                self.assertEqual(asyncio.run(test_scraper.get_wikitext_async(async_fetcher)), read_test_wikitext())
+            finally:
+                async_fetcher.close()
+
+            # Once blocking and once async
+            self.assertEqual([request[0] for request in server.requests].count(
+                "/w/index.php?title=Rockruff_(Pok%C3%A9mon)&action=raw"), 2)
+
+    def test_invalid_fetch_mode(self):
+        """
+        Test if a ValueError is thrown if an invalid fetch mode is provided
+        """
+        self.assertRaises(ValueError, PokedexEntryScraperPokemonBulbapedia, self.test_url, fetch_mode="InvalidMode")
+
+    def test_generating_of_data_from_wikitext(self):
+        """
+        Test whether the usable data is correctly generated from the raw wikitext
+        Uses the wikitext of the local Rockruff page
+        """
+        r_infobox, r_prev_next, r_raw_evo_lines, r_forms, r_local_dex = \
+            self.test_scraper.generate_usable_data(read_test_wikitext())
+
+        self.assertEqual(r_infobox, EXPECTED_INFOBOX)
+        self.assertEqual(r_prev_next, EXPECTED_PREV_NEXT)
+        self.assertEqual(r_raw_evo_lines, EXPECTED_RAW_EVO_LINES)
+        self.assertEqual(r_forms, EXPECTED_FORMS)
+        self.assertEqual(r_local_dex, EXPECTED_LOCAL_DEX)
+
+    def test_extract_local_dex_data(self):
+        """
+        Test whether all regN/numN pairs are found, also beyond 3 regions or split over multiple lines, and a region
+            without a number is skipped
+        """
+        text = "{{Dex/Gen/1|gen=VIII|reg1=Galar|num1=157}}" \
+               "{{Dex/Gen/4|gen=IX|reg1=Paldea|num1=001|reg2=Kitakami|num2=010|reg3=Blueberry|num3=100" \
+               "\n |reg4=Galar\n |num4=157\n |reg5=Kanto}}"
+
+        self.assertEqual(PokedexEntryScraperPokemonBulbapedia._extract_local_dex_data(text), {
+            "Galar": ["157"], "Paldea": ["001"], "Kitakami": ["010"], "Blueberry": ["100"]
+        })
+
 
 if __name__ == '__main__':
     unittest.main()
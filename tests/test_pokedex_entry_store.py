@@ -0,0 +1,181 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import os
+import tempfile
+import unittest
+
+from pokemon_dex_entries.entry_scraper_factory import EntryScraperFactory
+from pokemon_dex_entries.pokedex_entry import PokedexFormEntry
+from pokemon_dex_entries.pokedex_entry_store import PokedexEntryStore, PokedexEntryNotStoredError
+from pokemon_lists.list_scraper_factory import ListScraperFactory
+from tests.test_pokedex_entry import create_test_entry
+
+
+class TestPokedexEntryStore(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "pokedex_entries.sqlite")
+        self.test_source = "https://bulbapedia.bulbagarden.net/w/index.php?title=Rockruff_(Pok%C3%A9mon)&action=edit"
+
+        self.test_entry = create_test_entry()
+        self.test_entry.add_forms([PokedexFormEntry(
+            form_name="Own Tempo Rockruff",
+            types=["Steen", None],
+            abilities=["Own Tempo"],
+            hidden_ability=None,
+            met_height="0.5",
+            met_weight="9.2",
+            imp_height="1'08\"",
+            imp_weight="20.3"
+        )])
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_stored_entry_renders_the_same(self):
+        """
+        Test whether an entry loaded from the store (by a new connection) renders the same template, forms included
+        """
+        with PokedexEntryStore(self.path) as store:
+            store.put(self.test_entry, self.test_source)
+
+        with PokedexEntryStore(self.path) as store:
+            stored_entry = store.get("Rockruff")
+
+            self.assertEqual(stored_entry.create_dutch_wiki_entry(), self.test_entry.create_dutch_wiki_entry())
+            self.assertEqual(stored_entry.forms, self.test_entry.forms)
+            self.assertEqual(len(store), 1)
+
+    def test_lookups(self):
+        """
+        Test whether entries are found by name, national dex number, source and range
+        """
+        with PokedexEntryStore(self.path) as store:
+            store.put(self.test_entry, self.test_source)
+
+            self.assertEqual(store.get_by_ndex("0744").name, "Rockruff")
+            self.assertEqual(store.get_by_source(self.test_source).name, "Rockruff")
+            self.assertEqual([entry.name for entry in store.get_range(722, 809)], ["Rockruff"])
+            self.assertEqual(store.sources_in_range(722, 809), [self.test_source])
+            self.assertIsNone(store.get("Lycanroc"))
+            self.assertEqual(store.get_range(1, 151), [])
+            self.assertRaises(PokedexEntryNotStoredError, store.get_by_source, "https://not/stored")
+
+    def test_revisions(self):
+        """
+        Test whether the revision of the source page is stored with the entry
+        """
+        with PokedexEntryStore(self.path) as store:
+            store.put(self.test_entry, self.test_source, revision=3385612)
+
+            self.assertEqual(store.get_revisions([self.test_source, "https://not/stored"]),
+                             {self.test_source: 3385612})
+
+    def test_put_replaces_entry(self):
+        """
+        Test whether storing an entry again replaces it, including its forms
+        """
+        with PokedexEntryStore(self.path) as store:
+            store.put(self.test_entry, self.test_source)
+            store.put(create_test_entry(), self.test_source)
+
+            self.assertEqual(len(store), 1)
+            self.assertEqual(store.get("Rockruff").forms, [])
+
+    def test_family_shares_evolution_line(self):
+        """
+        Test whether the loaded entries of the same family share one evolution line
+        """
+        lycanroc_entry = create_test_entry()
+        lycanroc_entry.name = "Lycanroc"
+        lycanroc_entry.ndex_num = "745"
+
+        with PokedexEntryStore(self.path) as store:
+            store.put(self.test_entry)
+            store.put(lycanroc_entry)
+
+            rockruff, lycanroc = store.get_range(744, 745)
+            self.assertIs(rockruff.evo_line, lycanroc.evo_line)
+            self.assertEqual(rockruff.evo_line.find_previous("Lycanroc").pokemon_name, "Rockruff")
+
+    def test_stored_source_type(self):
+        """
+        Test whether the store source type renders a stored entry without scraping it
+        """
+        with PokedexEntryStore(self.path) as store:
+            store.put(self.test_entry, self.test_source)
+
+            scraper_class = EntryScraperFactory().create(source_type="store", url=self.test_source, fetcher=None,
+                                                         store=store)
+            scraper_class.setup()
+
+            self.assertEqual(scraper_class.build_template(), self.test_entry.create_dutch_wiki_entry())
+
+    def create_list_test_entries(self) -> list:
+        # Rockruff (Steen, generation VII), Umbreon (Duister, generation II) and Lycanroc (Duister/Steen, no generation)
+        umbreon_entry = create_test_entry()
+        umbreon_entry.name, umbreon_entry.ndex_num, umbreon_entry.type = "Umbreon", "197", "Duister"
+        umbreon_entry.generation = "Generatie II"
+        lycanroc_entry = create_test_entry()
+        lycanroc_entry.name, lycanroc_entry.ndex_num, lycanroc_entry.type2 = "Lycanroc", "745", "Duister"
+        lycanroc_entry.generation = None
+        return [self.test_entry, umbreon_entry, lycanroc_entry]
+
+    def test_list_pokemon(self):
+        """
+        Test whether the list index is filtered by national dex range, generation and type, the generation of an entry
+            without one is taken from its national dex number
+        """
+        with PokedexEntryStore(self.path) as store:
+            for entry in self.create_list_test_entries():
+                store.put(entry)
+
+            def names(**kwargs):
+                return [pokemon.pkmn_name for pokemon in store.list_pokemon(**kwargs)]
+
+            self.assertEqual(names(), ["Umbreon", "Rockruff", "Lycanroc"])
+            self.assertEqual(names(first=700, last=744), ["Rockruff"])
+            self.assertEqual(names(generation=7), ["Rockruff", "Lycanroc"])
+            self.assertEqual(names(pokemon_type="Duister"), ["Umbreon", "Lycanroc"])
+            self.assertEqual(names(generation=7, pokemon_type="Duister"), ["Lycanroc"])
+
+            lycanroc = store.list_pokemon(first=745)[0]
+            self.assertEqual((lycanroc.ndex_no, lycanroc.pkmn_type.type1, lycanroc.pkmn_type.type2),
+                             (745, "Steen", "Duister"))
+            self.assertEqual(store.list_pokemon(first=744, last=744)[0].pkmn_type.type2, "Geen")
+
+    def test_list_index_is_filled_for_older_stores(self):
+        """
+        Test whether the list index of a store created before it was kept is filled from the stored entries
+        """
+        with PokedexEntryStore(self.path) as store:
+            for entry in self.create_list_test_entries():
+                store.put(entry)
+            with store._connection:
+                store._connection.execute("DELETE FROM pokedex_list_index")
+
+        with PokedexEntryStore(self.path) as store:
+            self.assertEqual(len(store.list_pokemon()), 3)
+
+    def test_stored_list_source_type(self):
+        """
+        Test whether the store list source type lists the stored Pokémon of a type, given in English
+        """
+        with PokedexEntryStore(self.path) as store:
+            for entry in self.create_list_test_entries():
+                store.put(entry)
+
+            scraper_class = ListScraperFactory().create(source_type="store", url=None, fetcher=None, store=store,
+                                                        pokemon_type="dark")
+
+            self.assertEqual(scraper_class.scrape(), (
+                "{| class=\"wikitable sortable\"  style=\"text-align: center; font-size: 90%\"\n!\n! Engels\n"
+                "! Type (1)\n! Type (2)\n!  Afbeelding\n"
+                "|-\n| 197\n| [[Umbreon]]\n| {{Type|Duister}}\n| Geen\n| [[Bestand:197.png]]\n"
+                "|-\n| 745\n| [[Lycanroc]]\n| {{Type|Steen}}\n| {{Type|Duister}}\n| [[Bestand:745.png]]\n"
+                "|-\n|}"))
+
+
+if __name__ == '__main__':
+    unittest.main()
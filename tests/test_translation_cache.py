@@ -0,0 +1,67 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from utils.translation_cache import TranslationCache
+
+
+class TestTranslationCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "translations.json")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_seed_is_used_before_the_backend(self):
+        """
+        Test whether a translation present in the seed never reaches the backend
+        """
+        backend = mock.Mock(return_value="Hondje")
+        cache = TranslationCache(self.path, seed={"puppy": "Puppy"}, backend=backend)
+
+        self.assertEqual(cache.translate("Puppy"), "Puppy")
+        backend.assert_not_called()
+
+    def test_translation_is_persisted(self):
+        """
+        Test whether a missing translation is requested once, and is served from the file afterwards
+        """
+        backend = mock.Mock(return_value="Wolf")
+
+        self.assertEqual(TranslationCache(self.path, seed={}, backend=backend).translate("Wolf"), "Wolf")
+        self.assertEqual(TranslationCache(self.path, seed={}, backend=backend).translate("wolf"), "Wolf")
+        backend.assert_called_once_with("Wolf", "en", "nl")
+
+    def test_without_backend(self):
+        """
+        Test whether missing text is returned untranslated when there is no backend
+        """
+        cache = TranslationCache(self.path, seed={})
+
+        self.assertEqual(cache.translate("Puppy"), "Puppy")
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_without_write_back(self):
+        """
+        Test whether a cache without write back never writes the file, and hands its new translations to the cache
+            that does
+        """
+        worker_cache = TranslationCache(self.path, seed={}, backend=mock.Mock(return_value="Wolf"), write_back=False)
+
+        self.assertEqual(worker_cache.translate("Wolf"), "Wolf")
+        self.assertFalse(os.path.exists(self.path))
+        new_translations = worker_cache.pop_new_translations()
+        self.assertEqual(new_translations, {"wolf": "Wolf"})
+        self.assertEqual(worker_cache.pop_new_translations(), {})
+
+        TranslationCache(self.path, seed={}).add_translations(new_translations)
+        self.assertEqual(TranslationCache(self.path, seed={}).translate("WOLF"), "Wolf")
+
+
+if __name__ == '__main__':
+    unittest.main()
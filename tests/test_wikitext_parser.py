@@ -0,0 +1,89 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import unittest
+
+from utils.wikitext_parser import parse_templates, find_template, normalize_template_name, WikitextDocument
+
+
+class TestWikitextParser(unittest.TestCase):
+
+    def test_named_and_positional_arguments(self):
+        """
+        Test whether named arguments are stripped and positional arguments are kept in order
+        """
+        templates = parse_templates("{{Dex/Gen/1|gen=VIII\n|reg1=Galar\n|num1=157}} {{p|Lycanroc}}")
+
+        self.assertEqual(len(templates), 2)
+        self.assertEqual(templates[0].name, "Dex/Gen/1")
+        self.assertEqual(templates[0].params, {"gen": "VIII", "reg1": "Galar", "num1": "157"})
+        self.assertEqual(templates[1].positional, ["Lycanroc"])
+
+    def test_nested_templates_and_links(self):
+        """
+        Test whether '|' and '=' inside nested templates and links do not split arguments
+        """
+        text = "{{Evobox-2|evo1={{bag|Rare Candy}} [[File:Sun.png|24px|link=Pokémon Sun]]|name2=Lycanroc}}"
+
+        templates = parse_templates(text)
+
+        self.assertEqual(len(templates), 1)
+        self.assertEqual(templates[0].params, {
+            "evo1": "{{bag|Rare Candy}} [[File:Sun.png|24px|link=Pokémon Sun]]",
+            "name2": "Lycanroc"
+        })
+
+    def test_comments_and_ref_tags(self):
+        """
+        Test whether comments are removed and the contents of ref tags are not tokenized
+        """
+        text = "{{Pokémon Infobox|name=Rockruff<!-- |name=Lycanroc -->|category=Puppy<ref>Sun|Moon</ref>}}"
+
+        templates = parse_templates(text)
+
+        self.assertEqual(templates[0].params, {"name": "Rockruff", "category": "Puppy<ref>Sun|Moon</ref>"})
+
+    def test_offsets(self):
+        """
+        Test whether the offsets point to the template source, and whether only the given range is tokenized
+        """
+        text = "{{a|1}}\n==Evolution==\n{{Evobox-2|name1=Rockruff}}\n==Trivia==\n{{b}}"
+
+        templates = parse_templates(text)
+        evobox = find_template(templates, "Evobox-2")
+
+        self.assertEqual(text[evobox.start:evobox.end], "{{Evobox-2|name1=Rockruff}}")
+        self.assertEqual([template.name for template in parse_templates(text, 8, 60)], ["Evobox-2"])
+        self.assertIsNone(find_template(templates, "A", start=1))
+
+    def test_unclosed_template_is_ignored(self):
+        """
+        Test whether a template that is never closed does not end up in the results
+        """
+        self.assertEqual(parse_templates("{{a|b=c"), [])
+
+    def test_sections(self):
+        """
+        Test whether headings are indexed with their level, and whether a section contains its subsections
+        """
+        text = "==Biology==\n{{a}}\n==Game data==\n===Pokédex entries===\n{{Dex/Gen/1}}\n==Trivia==\n{{b}}"
+
+        document = WikitextDocument(text)
+        game_data = document.find_section("Game data")
+        dex_section = document.find_section("Pokédex entries", parent=game_data)
+
+        self.assertEqual([(section.title, section.level) for section in document.sections],
+                         [("Biology", 2), ("Game data", 2), ("Pokédex entries", 3), ("Trivia", 2)])
+        self.assertEqual(document.lead_end, 0)
+        self.assertEqual(game_data.end, text.find("==Trivia=="))
+        self.assertEqual([template.name for template in document.templates_in(dex_section)], ["Dex/Gen/1"])
+        self.assertIsNone(document.find_section("Pokédex entries", parent=document.find_section("Biology")))
+
+    def test_normalize_template_name(self):
+        """
+        Test whether template names are normalized like MediaWiki does
+        """
+        self.assertEqual(normalize_template_name(" pokémon_Infobox "), "Pokémon Infobox")
+
+
+if __name__ == '__main__':
+    unittest.main()
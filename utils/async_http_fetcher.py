@@ -0,0 +1,62 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from utils.http_fetcher import HttpFetcher
+
+
+class AsyncHttpFetcher:
+    """
+    An asyncio adapter for a blocking fetcher (a HttpFetcher or HttpCache), so a single event loop can await many
+        requests at once
+
+    This is not asyncio-native I/O: every request runs the blocking get_text of the given fetcher on a thread pool of
+        its own, which holds a thread for as long as the request takes. Retries, rate limiting and caching work exactly
+        the same, so requests to one host are still spaced by the rate limit of the fetcher, and max_concurrency
+        requests in flight are as fast as the same number of blocking workers. What it adds is the bounds: at most
+        max_concurrency requests are in flight at any time, and at most max_per_host to the same host.
+    The fetcher is meant to be used from a single event loop.
+    """
+
+    def __init__(self, fetcher: HttpFetcher = None, max_concurrency: int = 32, max_per_host: int = 8):
+        # A keep-alive connection for every request that can be in flight
+        self.fetcher = fetcher if fetcher else HttpFetcher(pool_size=max_concurrency)
+        self.max_concurrency = max_concurrency
+        self.max_per_host = max_per_host
+
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="AsyncHttpFetcher")
+        # Created on first use, inside the running event loop
+        self._semaphore = None
+        self._host_semaphores = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _get_semaphores(self, url: str) -> tuple:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        host = urlparse(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        return self._semaphore, self._host_semaphores[host]
+
+    async def get_text(self, url: str) -> str:
+        """
+        Request a url without blocking the event loop
+
+        :returns the response text
+        """
+        semaphore, host_semaphore = self._get_semaphores(url)
+
+        # The host slot first, so requests waiting for a busy host do not hold on to a slot other hosts could use
+        async with host_semaphore, semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, self.fetcher.get_text, url)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
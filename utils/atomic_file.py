@@ -0,0 +1,34 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import contextlib
+import os
+import stat
+import tempfile
+
+# The permissions of a new file are those open() would give it, read once (os.umask can only be read by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@contextlib.contextmanager
+def open_atomic(path: str, encoding: str = 'utf8'):
+    """
+    Open path to write text to, a file that is streamed to without ever leaving a half written file behind
+
+    The text is written to a temporary file next to path, which replaces path once the with block is done. When the
+        with block raises, the temporary file is removed and path is left as it was. Every writer (thread or process)
+        gets a temporary file of its own, so writers of the same path never write into or replace each other's file.
+    """
+    directory, file_name = os.path.split(path)
+    # In the directory of path, so replacing path is a rename on the same file system
+    fd, temp_path = tempfile.mkstemp(prefix=file_name + ".", suffix=".tmp", dir=directory or ".")
+    try:
+        with open(fd, "w", encoding=encoding) as temp_file:
+            # mkstemp only gives the owner access, path keeps its permissions (or gets those of a new file)
+            os.chmod(temp_path, stat.S_IMODE(os.stat(path).st_mode) if os.path.exists(path) else 0o666 & ~_UMASK)
+            yield temp_file
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
+        raise
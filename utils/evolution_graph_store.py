@@ -0,0 +1,154 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import hashlib
+import json
+import os
+import threading
+
+from utils.atomic_file import open_atomic
+from utils.evolution_line import EvolutionLine
+
+
+class EvolutionGraphStore:
+    """
+    The evolution families of a run, shared by every entry so a family is only built once
+
+    Families are keyed by their first Pokémon (the root, e.g. Bulbasaur). The Evobox of every member page usually
+        describes the same family, but not always: e.g. the Perrserker page only shows Meowth -> Perrserker, while
+        the Meowth page also shows Persian. So a family can have multiple variants, and a page is matched to its
+        variant by a fingerprint of its raw evolution lines. A page with a known fingerprint reuses the variant
+        without parsing its Evobox at all, a page with a new fingerprint is parsed once, and shares an equal variant
+        that was already built from another page.
+    The families are loaded from the JSON file at path on first use, and only written by save(), so a later run skips
+        parsing the Evobox of every known page.
+    The EvolutionLine objects are shared between entries, they must not be changed once they are in the store.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+
+        self._lock = threading.Lock()
+        # root -> list of EvolutionLine (the variants of the family)
+        self._families = None
+        # fingerprint -> EvolutionLine, and the steps of a variant (see EvolutionLine.to_steps) -> EvolutionLine
+        self._lines = None
+        self._variants = None
+        self._changed = False
+
+    @staticmethod
+    def create_fingerprint(raw_evolution_lines: list) -> str:
+        # Whitespace is not part of the fingerprint, it does not change the parsed evolution line: runs of whitespace
+        #   are collapsed, and whitespace around the '|' and '=' of the arguments (stripped when parsed) is removed.
+        #   Plain string operations, a regex is about ten times slower on a full Evobox.
+        normalized = "\n".join(" ".join(raw_evolution_line.split())
+                               .replace(" |", "|").replace("| ", "|").replace(" =", "=").replace("= ", "=")
+                               for raw_evolution_line in raw_evolution_lines)
+        return hashlib.sha256(normalized.encode('utf8')).hexdigest()
+
+    def _ensure_loaded(self):
+        if self._families is not None:
+            return
+
+        self._families = {}
+        self._lines = {}
+        self._variants = {}
+
+        if not self.path:
+            return
+        try:
+            with open(self.path, "r", encoding='utf8') as store_file:
+                stored_families = json.load(store_file)["families"]
+        except (OSError, ValueError, KeyError):
+            return
+
+        for variants in stored_families.values():
+            for variant in variants:
+                steps = tuple(tuple(step) for step in variant["steps"])
+                evo_line = self._add_variant(steps, EvolutionLine.from_steps(steps))
+                for fingerprint in variant["fingerprints"]:
+                    self._lines[fingerprint] = evo_line
+
+    def _add_variant(self, steps: tuple, evo_line: EvolutionLine) -> EvolutionLine:
+        # An equal variant that is already present is shared instead
+        if steps not in self._variants:
+            self._variants[steps] = evo_line
+            self._families.setdefault(evo_line.first.pokemon_name, []).append(evo_line)
+        return self._variants[steps]
+
+    def get_or_create(self, raw_evolution_lines: list, create_evo_line) -> EvolutionLine:
+        """
+        Get the evolution line belonging to the raw evolution lines of a page, create_evo_line is only called (without
+            arguments) when the store does not know them yet
+
+        :returns EvolutionLine
+        """
+        fingerprint = self.create_fingerprint(raw_evolution_lines)
+
+        with self._lock:
+            self._ensure_loaded()
+            if fingerprint in self._lines:
+                return self._lines[fingerprint]
+
+        # Parsed without holding the lock, when another worker parses the same page at the same time its line is kept
+        evo_line = create_evo_line()
+
+        with self._lock:
+            if fingerprint not in self._lines:
+                self._lines[fingerprint] = self._add_variant(evo_line.to_steps(), evo_line)
+                self._changed = True
+            return self._lines[fingerprint]
+
+    def get_family(self, root: str) -> list:
+        """
+        :returns list of the variants (EvolutionLine) of the family starting with root, empty when it is not known
+        """
+        with self._lock:
+            self._ensure_loaded()
+            return list(self._families.get(root, []))
+
+    def __len__(self):
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._families)
+
+    def save(self):
+        """Write the families to the JSON file at path, when anything was added since they were loaded"""
+        with self._lock:
+            if not self.path or not self._changed:
+                return
+
+            fingerprints = {}
+            for fingerprint, evo_line in self._lines.items():
+                fingerprints.setdefault(id(evo_line), []).append(fingerprint)
+
+            stored_families = {}
+            for steps, evo_line in self._variants.items():
+                stored_families.setdefault(evo_line.first.pokemon_name, []).append({
+                    "steps": steps,
+                    "fingerprints": sorted(fingerprints.get(id(evo_line), []))
+                })
+
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            with open_atomic(self.path) as graph_file:
+                json.dump({"families": stored_families}, graph_file, ensure_ascii=False, sort_keys=True)
+            self._changed = False
+
+
+_default_evolution_graph_store = None
+_default_evolution_graph_store_lock = threading.Lock()
+
+
+def get_default_evolution_graph_store() -> EvolutionGraphStore:
+    """
+    The evolution graph store shared by all parsers that are not given one, kept in memory only
+
+    :returns EvolutionGraphStore
+    """
+    global _default_evolution_graph_store
+    with _default_evolution_graph_store_lock:
+        if _default_evolution_graph_store is None:
+            _default_evolution_graph_store = EvolutionGraphStore()
+        return _default_evolution_graph_store
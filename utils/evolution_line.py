@@ -2,15 +2,20 @@
 #  All rights reserved.
 
 
+import sys
+
+
 class EvolutionStep(object):
     """An step in an evolution line"""
+    __slots__ = ("pokemon_name", "ndex", "next", "evo_stage")
 
     def __init__(self,
                  pokemon_name: str,
                  ndex: str,
                  evo_stage: int):
-        self.pokemon_name = pokemon_name
-        self.ndex = ndex
+        # Names and numbers are interned, every evolution line of a family shares them
+        self.pokemon_name = sys.intern(pokemon_name)
+        self.ndex = sys.intern(ndex)
         self.next = []
         self.evo_stage = evo_stage
 
@@ -19,43 +24,98 @@ class EvolutionStep(object):
 
 
 class EvolutionLine:
-    """An evolution line object"""
+    """
+    An evolution line object
+
+    Every step is indexed by its Pokémon name, together with the step it evolves from, so looking up a step, its
+        parent or its children never walks the line. The index is built on the first lookup (steps are added to
+        the EvolutionStep objects directly while a line is created) and kept up to date when lines are combined.
+    """
+    __slots__ = ("first", "_steps", "_parents")
 
     def __init__(self, first: EvolutionStep):
         self.first = first
+        # pokemon_name -> EvolutionStep and pokemon_name -> previous EvolutionStep (None for the first step)
+        self._steps = None
+        self._parents = None
+
+    def _build_index(self):
+        # A line is shared between threads (e.g. by an EvolutionGraphStore), so the index is only assigned once it is
+        #   complete: the parents first, a thread that finds the steps finds all parents as well. Threads building
+        #   the index at the same time build the same index.
+        steps = {}
+        parents = {}
+        for step, previous in EvolutionLine._walk(self.first):
+            # Like the walks this index replaces, the first step in the line wins when a name occurs twice
+            if step.pokemon_name not in steps:
+                steps[step.pokemon_name] = step
+                parents[step.pokemon_name] = previous
+        self._parents = parents
+        self._steps = steps
+
+    def _index(self) -> dict:
+        if self._steps is None:
+            self._build_index()
+        return self._steps
+
+    @staticmethod
+    def _walk(evolution_step: EvolutionStep):
+        """Yields tuples of (EvolutionStep, previous EvolutionStep) in depth-first order, without recursion"""
+        stack = [(evolution_step, None)]
+        while stack:
+            step, previous = stack.pop()
+            yield step, previous
+            # Reversed, so the first evolution is popped (and yielded) first
+            stack.extend((next_evolution, step) for next_evolution in reversed(step.next))
+
+    def find_step(self, pokemon_name: str) -> EvolutionStep:
+        """
+        Find the step of a Pokémon in this line
+
+        :returns EvolutionStep or None
+        """
+        return self._index().get(pokemon_name)
+
+    def find_previous(self, pokemon_name: str) -> EvolutionStep:
+        """
+        Find the step a Pokémon evolves from
+
+        :returns EvolutionStep or None (for the first step, or when the Pokémon is not part of this line)
+        """
+        self._index()
+        return self._parents.get(pokemon_name)
+
+    def find_step_and_previous(self, pokemon_name: str) -> tuple:
+        """
+        Find the step of a Pokémon and the step it evolves from (None for the first step)
+
+        :returns tuple of (EvolutionStep or None, EvolutionStep or None)
+        """
+        return self.find_step(pokemon_name), self.find_previous(pokemon_name)
+
+    def __contains__(self, pokemon_name: str) -> bool:
+        return pokemon_name in self._index()
 
     @staticmethod
     def find_evolution_step(evolution_step: EvolutionStep,
-                    pokemon_name: str) -> EvolutionStep:
-        if evolution_step.pokemon_name == pokemon_name:
-            return evolution_step
-        for next_evultion in evolution_step.next:
-            result = EvolutionLine.find_evolution_step(next_evultion, pokemon_name)
-            if result:
-                return result
+                            pokemon_name: str) -> EvolutionStep:
+        for step, _ in EvolutionLine._walk(evolution_step):
+            if step.pokemon_name == pokemon_name:
+                return step
+        return None
 
     @staticmethod
     def is_part_of_evo_line(evolution_step: EvolutionStep,
                             pokemon_name: str) -> bool:
-
-        if evolution_step.pokemon_name == pokemon_name:
-            return True
-        for next_evolution in evolution_step.next:
-            result = EvolutionLine.is_part_of_evo_line(next_evolution, pokemon_name)
-            if result:
-                return result
-        return False
+        return EvolutionLine.find_evolution_step(evolution_step, pokemon_name) is not None
 
     @staticmethod
     def previous_step(evolution_step: EvolutionStep,
-                      pokemon_name: str,
-                      previous_step = None):
-        if evolution_step.pokemon_name == pokemon_name:
-            return previous_step
-        for next_evolution in evolution_step.next:
-            result = EvolutionLine.previous_step(next_evolution, pokemon_name, evolution_step)
-            if result:
-                return result
+                      pokemon_name: str):
+        for step, previous in EvolutionLine._walk(evolution_step):
+            if step.pokemon_name == pokemon_name:
+                return previous
+        return None
 
     def combine_evo_lines(self, second_evo_first_step: EvolutionStep):
         """Combine a secondary evolution line with this one.
@@ -66,56 +126,74 @@ class EvolutionLine:
         if self.first.pokemon_name != second_evo_first_step.pokemon_name:
             raise Exception("UNEQUAL PARENTS")
         else:
-            self._combine_evo_lines([self.first.pokemon_name], second_evo_first_step.next)
+            self._combine_evo_lines(second_evo_first_step)
 
-    def _combine_evo_lines(self, path: list, secondary: list):
-        """Combine a secondary evolution line with this one recursively
+    def _combine_evo_lines(self, second_evo_first_step: EvolutionStep):
+        """Combine a secondary evolution line with this one, every step of the secondary line is visited once
 
         Keyword arguments:
-        path: list -- The path (where we are), e.g. ['Shinx', 'Luxio']
-        secondary: list -- the .next() of the secondary EvolutionLine, contains the next EvolutionStep(s)
+        second_evo_first_step: EvolutionStep -- The first step of the secondary EvolutionLine
         """
-        for pkmn in secondary:
-            if not EvolutionLine.is_part_of_evo_line(self.first, pkmn.pokemon_name):
-                self._insert(path.copy(), pkmn.pokemon_name, pkmn.ndex, pkmn.evo_stage)
-            new_path = path.copy()
-            new_path.append(pkmn.pokemon_name)
-            self._combine_evo_lines(new_path, pkmn.next)
-
-    def _insert(self, path: list, pkmn_name: str, ndex: str, evo_stage: int):
+        steps = self._index()
+        # Depth-first over the secondary line, every step that is missing goes after the step it evolves from,
+        #   which has been visited (and inserted when missing) before. The first steps are equal.
+        stack = [(pkmn, second_evo_first_step) for pkmn in reversed(second_evo_first_step.next)]
+        while stack:
+            pkmn, previous = stack.pop()
+            if pkmn.pokemon_name not in steps:
+                self._insert(steps[previous.pokemon_name], pkmn.pokemon_name, pkmn.ndex, pkmn.evo_stage)
+            if pkmn.next:
+                stack.extend((next_evolution, pkmn) for next_evolution in reversed(pkmn.next))
+
+    def _insert(self, parent: EvolutionStep, pkmn_name: str, ndex: str, evo_stage: int) -> EvolutionStep:
         """Insert a new EvolutionStep into the EvolutionLine object
 
         Keyword arguments:
-        path: list -- The path (where we are), e.g. ['Shinx', 'Luxio']
+        parent: EvolutionStep -- The step of this line the new step evolves from
         pkmn_name: str -- The Pokémon name
         evo_stage: int -- The evolution stage
         """
-        current = self.first
-        path.pop(0)
-
-        while path:
-            next = path.pop(0)
-            for evo in current.next:
-                if evo.pokemon_name == next:
-                    current = evo
-        current.add_next(
-            EvolutionStep(
-                pkmn_name,
-                ndex,
-                evo_stage
-            )
+        step = EvolutionStep(
+            pkmn_name,
+            ndex,
+            evo_stage
         )
+        parent.add_next(step)
 
-    def yield_all_name_ndex(self):
-        """Yields tupil of (name, ndex)"""
-        yield from self._yield_all_name_ndex(self.first)
+        self._index()[step.pokemon_name] = step
+        self._parents[step.pokemon_name] = parent
+        return step
+
+    def to_steps(self) -> tuple:
+        """
+        The steps of this line in depth-first order, as tuples of (name, ndex, evo_stage, index of the previous step)
+            The index of the previous step is -1 for the first step. Two lines are equal when their steps are equal.
 
-    def _yield_all_name_ndex(self, current_node):
-        """Recursive function to yield tupils of (name, ndex)"""
+        :returns tuple of tuples
+        """
+        indexes = {}
+        steps = []
+        for step, previous in EvolutionLine._walk(self.first):
+            indexes[id(step)] = len(steps)
+            steps.append((step.pokemon_name, step.ndex, step.evo_stage, indexes[id(previous)] if previous else -1))
+        return tuple(steps)
 
-        current_node = current_node
+    @staticmethod
+    def from_steps(steps) -> "EvolutionLine":
+        """
+        Create an evolution line from the steps created by to_steps
 
-        yield current_node.pokemon_name, current_node.ndex
+        :returns EvolutionLine
+        """
+        created = []
+        for pokemon_name, ndex, evo_stage, previous_index in steps:
+            step = EvolutionStep(pokemon_name, ndex, evo_stage)
+            if created:
+                created[previous_index].add_next(step)
+            created.append(step)
+        return EvolutionLine(created[0])
 
-        for next_evolution in current_node.next:
-            yield from self._yield_all_name_ndex(next_evolution)
+    def yield_all_name_ndex(self):
+        """Yields tupil of (name, ndex)"""
+        for step, _ in EvolutionLine._walk(self.first):
+            yield step.pokemon_name, step.ndex
@@ -0,0 +1,32 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import argparse
+
+from utils.http_cache import HttpCache
+from utils.http_fetcher import HttpFetcher
+
+
+def add_fetcher_arguments(parser: argparse.ArgumentParser):
+    """Add the arguments shared by all scripts that request pages"""
+    parser.add_argument('-timeout', action="store", help='Seconds to wait for a response', type=float, default=30)
+    parser.add_argument('-retries', action="store", help='Times a failed request is retried', type=int, default=3)
+    parser.add_argument('-rate-limit', action="store", help='Minimum seconds between requests to the same host',
+                        type=float, default=0.5)
+    parser.add_argument('-cache-dir', action="store", help='Directory used to cache the scraped pages', type=str,
+                        default=".cache")
+    cache_mode = parser.add_mutually_exclusive_group()
+    cache_mode.add_argument('-no-cache', action="store_true", help='Always request the pages, do not use the cache')
+    cache_mode.add_argument('-offline', action="store_true", help='Only use cached pages, never make a request')
+
+
+def create_fetcher(args: argparse.Namespace):
+    """
+    Create the fetcher shared by all scrapers of a run, based on the arguments added by add_fetcher_arguments
+
+    :returns a HttpCache (wrapping a HttpFetcher), or a plain HttpFetcher when the cache is disabled
+    """
+    fetcher = HttpFetcher(timeout=(5, args.timeout), max_retries=args.retries, min_interval=args.rate_limit)
+
+    if args.no_cache:
+        return fetcher
+    return HttpCache(args.cache_dir, offline=args.offline, fetcher=fetcher)
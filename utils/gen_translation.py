@@ -23,4 +23,7 @@ ENGLISH_TO_DUTCH_GEN = {
     "6": "Generatie VI",
     "7": "Generatie VII",
     "8": "Generatie VIII",
-}
\ No newline at end of file
+}
+
+# The number of a generation by its Dutch name, e.g. 'Generatie VII' -> 7
+DUTCH_GEN_TO_NUMBER = {dutch: int(english) for english, dutch in ENGLISH_TO_DUTCH_GEN.items() if english.isdigit()}
@@ -0,0 +1,25 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+
+# First and last national dex number (inclusive) introduced in each generation
+
+GENERATION_TO_NDEX_RANGE = {
+    1: (1, 151),
+    2: (152, 251),
+    3: (252, 386),
+    4: (387, 493),
+    5: (494, 649),
+    6: (650, 721),
+    7: (722, 809),
+    8: (810, 898),
+}
+
+
+def generation_of_ndex(ndex: int) -> int:
+    """
+    :returns the generation the national dex number was introduced in, or None when it is not in a known generation
+    """
+    for generation, (first, last) in GENERATION_TO_NDEX_RANGE.items():
+        if first <= ndex <= last:
+            return generation
+    return None
@@ -0,0 +1,190 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import abc
+from html.parser import HTMLParser
+from typing import NamedTuple
+
+from bs4 import BeautifulSoup
+
+
+class HtmlTableCell(NamedTuple):
+    """
+    A cell of a HTML table, as far as the list scrapers use it
+
+    text: all text inside the cell (nested elements included), stripped
+    hrefs: the href of every link inside the cell, in order of appearance
+    """
+    text: str
+    hrefs: list
+
+
+class HtmlBackend(abc.ABC):
+    """
+    Turns a HTML page into the rows of one of its tables, the part of a page the list scrapers need
+
+    Every backend gives the same rows for the same page: the <tr> children of the first table with the given class
+        (inside a <thead> or <tbody> as well), every row as a list of its <td> children. Tables nested in a cell are
+        part of that cell.
+    """
+
+    name = None
+
+    @abc.abstractmethod
+    def parse_table(self, text: str, table_class: str) -> list:
+        """
+        Raises ValueError when the page has no table with the class
+
+        :returns list of rows, every row a list of HtmlTableCell
+        """
+
+    def iter_table(self, text: str, table_class: str):
+        """
+        Yields the rows of the table (see parse_table), by default once the whole page is read
+        """
+        yield from self.parse_table(text, table_class)
+
+
+class _TableParser(HTMLParser):
+    # Collects the rows of the first table with the class while the page is tokenized, without building a tree.
+    #   Stops the tokenizing (by raising _TableComplete) as soon as that table is closed.
+
+    def __init__(self, table_class: str):
+        super().__init__(convert_charrefs=True)
+        self.table_class = table_class
+        self.rows = []
+        self.found = False
+
+        # Number of tables we are in, counted from the table we are looking for (0: not inside it yet)
+        self._depth = 0
+        self._row = None
+        # Text parts and hrefs of the cell we are in
+        self._cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            if self._depth:
+                self._depth += 1
+            elif self.table_class in (dict(attrs).get("class") or "").split():
+                self._depth = 1
+                self.found = True
+        elif not self._depth:
+            return
+        elif tag == "a":
+            if self._cell is not None:
+                for name, value in attrs:
+                    if name == "href":
+                        self._cell[1].append(value or "")
+                        break
+        elif self._depth == 1:
+            if tag == "tr":
+                self._end_row()
+                self._row = []
+            elif tag == "td" and self._row is not None:
+                self._end_cell()
+                self._cell = ([], [])
+
+    def handle_endtag(self, tag):
+        if not self._depth:
+            return
+        if tag == "table":
+            self._depth -= 1
+            if not self._depth:
+                self._end_row()
+                raise _TableComplete()
+        elif self._depth == 1:
+            if tag == "td":
+                self._end_cell()
+            elif tag == "tr":
+                self._end_row()
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell[0].append(data)
+
+    def _end_cell(self):
+        if self._cell is not None:
+            self._row.append(HtmlTableCell("".join(self._cell[0]).strip(), self._cell[1]))
+            self._cell = None
+
+    def _end_row(self):
+        if self._row is not None:
+            self._end_cell()
+            self.rows.append(self._row)
+            self._row = None
+
+    def take_rows(self) -> list:
+        # The rows completed since the last call
+        rows, self.rows = self.rows, []
+        return rows
+
+
+class _TableComplete(Exception):
+    pass
+
+
+class HtmlParserBackend(HtmlBackend):
+    """
+    The html.parser of the standard library, always available
+
+    Only the tokenizer is used, the rows are collected while the page is read instead of building a tree of the whole
+        page first, and reading stops at the end of the table. The page is read chunk_size characters at a time, the
+        rows are yielded (see iter_table) as soon as they are read.
+    """
+
+    name = "html.parser"
+
+    def __init__(self, chunk_size: int = 16384):
+        self.chunk_size = chunk_size
+
+    def parse_table(self, text: str, table_class: str) -> list:
+        return list(self.iter_table(text, table_class))
+
+    def iter_table(self, text: str, table_class: str):
+        parser = _TableParser(table_class)
+        try:
+            for chunk_start in range(0, len(text), self.chunk_size):
+                parser.feed(text[chunk_start:chunk_start + self.chunk_size])
+                yield from parser.take_rows()
+            parser.close()
+        except _TableComplete:
+            pass
+        yield from parser.take_rows()
+
+        if not parser.found:
+            raise ValueError("No table with class {} found".format(table_class))
+
+
+class BeautifulSoupBackend(HtmlBackend):
+    """A BeautifulSoup tree of the whole page (using html.parser), the slowest but the most forgiving"""
+
+    name = "beautifulsoup"
+
+    def parse_table(self, text: str, table_class: str) -> list:
+        table = BeautifulSoup(text, "html.parser").find("table", class_=table_class)
+        if table is None:
+            raise ValueError("No table with class {} found".format(table_class))
+
+        rows = []
+        for child in table.find_all(["tr", "thead", "tbody"], recursive=False):
+            for row in (child.find_all("tr", recursive=False) if child.name != "tr" else (child,)):
+                rows.append([HtmlTableCell(cell.text.strip(), [link["href"] for link in cell.find_all("a", href=True)])
+                             for cell in row.find_all("td", recursive=False)])
+        return rows
+
+
+HTML_BACKENDS = {backend.name: backend for backend in (HtmlParserBackend, BeautifulSoupBackend)}
+
+# The backend used when none is chosen
+DEFAULT_HTML_BACKEND = HtmlParserBackend.name
+
+
+def create_html_backend(name: str = DEFAULT_HTML_BACKEND) -> HtmlBackend:
+    """
+    Create a HTML backend by name
+
+    Raises ValueError for an unknown backend
+    :returns HtmlBackend
+    """
+    if name not in HTML_BACKENDS:
+        raise ValueError("Invalid HTML backend {}".format(name))
+    return HTML_BACKENDS[name]()
@@ -0,0 +1,179 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import hashlib
+import json
+import os
+import threading
+import time
+
+from utils.atomic_file import open_atomic
+from utils.http_fetcher import HttpFetcher
+
+
+class HttpCacheMissError(Exception):
+    """Raised when running offline and the requested url is not present in the cache"""
+
+
+class HttpCache:
+    """
+    A content-addressed on-disk cache for HTTP responses
+
+    Every response is stored under the sha256 of its url, as {key}.body (the text) and {key}.json (url, ETag,
+        Last-Modified and the time it was fetched/validated).
+    Entries younger than ttl (seconds) are served straight from disk, older entries are revalidated using
+        If-None-Match/If-Modified-Since so an unchanged page (304) is never downloaded again.
+    The total size is bounded by max_size (bytes), the least recently used entries are evicted first.
+    When offline no requests are made at all, a url missing from the cache raises HttpCacheMissError.
+    Requests go through the given fetcher, so the cache can be used anywhere a HttpFetcher is expected.
+    """
+
+    def __init__(self, directory: str = ".cache", ttl: int = 24 * 60 * 60, max_size: int = 512 * 1024 * 1024,
+                 offline: bool = False, fetcher: HttpFetcher = None):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_size = max_size
+        self.offline = offline
+        self.fetcher = fetcher if fetcher else HttpFetcher()
+
+        self._lock = threading.Lock()
+        self._size = None
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def create_key(url: str) -> str:
+        return hashlib.sha256(url.encode('utf8')).hexdigest()
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".body")
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".json")
+
+    def get_text(self, url: str) -> str:
+        """
+        Get the text of a url, from the cache when possible
+
+        :returns the response text
+        """
+        key = self.create_key(url)
+        meta = self._read_meta(key)
+
+        if meta is not None:
+            if self.offline or time.time() - meta["fetched_at"] < self.ttl:
+                return self._read_body(key)
+        elif self.offline:
+            raise HttpCacheMissError("{} is not cached, it cannot be requested while offline".format(url))
+
+        # Either not cached or stale, revalidate when we have validators
+        headers = {}
+        if meta is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = self.fetcher.get(url, headers=headers)
+
+        if response.status_code == 304 and meta is not None:
+            meta["fetched_at"] = time.time()
+            self._write_meta(key, meta)
+            return self._read_body(key)
+
+        response.raise_for_status()
+
+        text = response.text
+        self._store(key, {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.time()
+        }, text)
+        return text
+
+    def expire(self, url: str):
+        """
+        Mark the cached entry of a url as stale (when cached), the next request revalidates it instead of serving it
+            from disk, e.g. when it is known that the page changed
+        """
+        key = self.create_key(url)
+        meta = self._read_meta(key)
+        if meta is not None:
+            meta["fetched_at"] = 0
+            self._write_meta(key, meta)
+
+    def _read_meta(self, key: str):
+        try:
+            with open(self._meta_path(key), "r", encoding='utf8') as meta_file:
+                meta = json.load(meta_file)
+        except (OSError, ValueError):
+            return None
+
+        # A body might have been evicted by another process while the metadata is still present
+        return meta if os.path.exists(self._body_path(key)) else None
+
+    def _read_body(self, key: str) -> str:
+        body_path = self._body_path(key)
+        with open(body_path, "r", encoding='utf8') as body_file:
+            text = body_file.read()
+
+        # Mark as recently used, the mtime is what the LRU eviction is based on
+        os.utime(body_path)
+        return text
+
+    def _write_meta(self, key: str, meta: dict):
+        self._write_atomic(self._meta_path(key), json.dumps(meta))
+
+    def _store(self, key: str, meta: dict, text: str):
+        body_path = self._body_path(key)
+
+        with self._lock:
+            size = self._current_size()
+            if os.path.exists(body_path):
+                size -= os.path.getsize(body_path)
+
+            self._write_atomic(body_path, text)
+            self._write_meta(key, meta)
+
+            self._size = size + os.path.getsize(body_path)
+            if self._size > self.max_size:
+                self._evict(keep=key)
+
+    @staticmethod
+    def _write_atomic(path: str, text: str):
+        with open_atomic(path) as cache_file:
+            cache_file.write(text)
+
+    def _list_bodies(self) -> list:
+        bodies = []
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith(".body"):
+                stat = os.stat(os.path.join(self.directory, file_name))
+                bodies.append((stat.st_mtime, stat.st_size, file_name[:-len(".body")]))
+        return bodies
+
+    def _current_size(self) -> int:
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._list_bodies())
+        return self._size
+
+    def _evict(self, keep: str):
+        # Remove the least recently used entries until we are below the maximum size again
+        for _, size, key in sorted(self._list_bodies()):
+            if self._size <= self.max_size:
+                break
+            if key == keep:
+                continue
+            for path in (self._body_path(key), self._meta_path(key)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._size -= size
+
+    def clear(self):
+        with self._lock:
+            for file_name in os.listdir(self.directory):
+                if file_name.endswith(".body") or file_name.endswith(".json"):
+                    os.remove(os.path.join(self.directory, file_name))
+            self._size = 0
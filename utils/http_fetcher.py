@@ -0,0 +1,105 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HostRateLimiter:
+    """Keeps requests to the same host at least min_interval seconds apart, shared between threads"""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+
+        self._lock = threading.Lock()
+        self._next_allowed = {}
+
+    def wait(self, url: str):
+        if self.min_interval <= 0:
+            return
+
+        host = urlparse(url).netloc
+
+        # Reserve the next slot for this host while holding the lock, sleep outside of it so other hosts can continue
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_allowed.get(host, now))
+            self._next_allowed[host] = slot + self.min_interval
+
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class HttpFetcher:
+    """
+    Fetches pages over a shared keep-alive connection pool
+
+    Every request has a (connect, read) timeout, requests failing with a connection error, timeout, 429 or 5xx are
+        retried with an exponential backoff (or the Retry-After the server asks for), and requests to the same host
+        are rate limited so we stay polite to the wikis we scrape.
+    A single instance can (and should) be shared between scrapers and threads.
+    """
+
+    retry_status_codes = (429, 500, 502, 503, 504)
+
+    user_agent = "python3-dutch-pokemon-fandom-scripts"
+
+    def __init__(self, timeout: tuple = (5, 30), max_retries: int = 3, backoff_factor: float = 0.5,
+                 min_interval: float = 0.5, pool_size: int = 10, session: requests.Session = None):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.rate_limiter = HostRateLimiter(min_interval)
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = self.user_agent
+        self.session = session
+
+    def get(self, url: str, headers: dict = None) -> requests.Response:
+        """
+        Request a url, retrying on failures
+
+        :returns the response, which may still have an error status once all retries are used
+        """
+        attempt = 0
+        while True:
+            self.rate_limiter.wait(url)
+
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                self._backoff(attempt)
+                attempt += 1
+                continue
+
+            if response.status_code in self.retry_status_codes and attempt < self.max_retries:
+                self._backoff(attempt, response.headers.get("Retry-After"))
+                attempt += 1
+                continue
+
+            return response
+
+    def get_text(self, url: str) -> str:
+        response = self.get(url)
+        response.raise_for_status()
+        return response.text
+
+    def _backoff(self, attempt: int, retry_after: str = None):
+        # Retry-After can also be a http date, we only honour the (far more common) number of seconds
+        if retry_after is not None and retry_after.strip().isdigit():
+            delay = int(retry_after)
+        else:
+            delay = self.backoff_factor * (2 ** attempt)
+        time.sleep(delay)
+
+    def close(self):
+        self.session.close()
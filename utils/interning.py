@@ -0,0 +1,19 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import sys
+
+
+def intern_strings(value):
+    """
+    Intern a string, or the strings in a list/tuple, so the same text (e.g. 'Rock', 'Keen Eye' or a Dutch translation)
+        is stored only once no matter how many entries hold it. Any other value is returned as is.
+
+    :returns the interned value
+    """
+    if type(value) is str:
+        return sys.intern(value)
+    if type(value) is list:
+        return [intern_strings(item) for item in value]
+    if type(value) is tuple:
+        return tuple(intern_strings(item) for item in value)
+    return value
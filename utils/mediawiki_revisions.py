@@ -0,0 +1,92 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import json
+from urllib.parse import urlparse, parse_qs, unquote, urlencode
+
+from utils.http_fetcher import HttpFetcher
+
+
+class MediaWikiRevisionChecker:
+    """
+    Looks up the current revision of many MediaWiki (e.g. Bulbapedia) pages at once, through the api.php of the wiki
+
+    The titles are requested batch_size at a time (50 is the most the API allows without a bot account), so checking
+        the whole national dex takes a few dozen requests instead of a request per page.
+    The revisions should always be up to date, so use a HttpFetcher here and not a HttpCache.
+    """
+
+    def __init__(self, fetcher: HttpFetcher = None, batch_size: int = 50):
+        self.fetcher = fetcher if fetcher else HttpFetcher()
+        self.batch_size = batch_size
+
+    @staticmethod
+    def title_from_url(url: str) -> str:
+        """
+        Get the page title of a wiki url, like MediaWiki normalizes it
+
+        :returns title, e.g. ...index.php?title=Rockruff_(Pok%C3%A9mon)&action=edit -> 'Rockruff (Pokémon)'
+        """
+        parsed_url = urlparse(url)
+        titles = parse_qs(parsed_url.query).get("title")
+        if titles:
+            title = titles[0]
+        elif "/wiki/" in parsed_url.path:
+            title = unquote(parsed_url.path.split("/wiki/", 1)[1])
+        else:
+            raise ValueError("No page title found in {}".format(url))
+        return title.replace("_", " ").strip()
+
+    @staticmethod
+    def api_url_from_url(url: str) -> str:
+        """
+        :returns the url of the api.php of the wiki a page belongs to, e.g. https://bulbapedia.bulbagarden.net/w/api.php
+        """
+        parsed_url = urlparse(url)
+        if parsed_url.path.endswith("index.php"):
+            path = parsed_url.path[:-len("index.php")] + "api.php"
+        else:
+            path = "/w/api.php"
+        return "{}://{}{}".format(parsed_url.scheme, parsed_url.netloc, path)
+
+    def get_revisions(self, urls: list) -> dict:
+        """
+        Get the current revision id of the pages of urls, the pages of all urls are looked up in batches per wiki
+
+        :returns dict of url -> revision id, None for pages that do not exist
+        """
+        # api url -> title -> urls of that page
+        wikis = {}
+        for url in urls:
+            wikis.setdefault(self.api_url_from_url(url), {}).setdefault(self.title_from_url(url), []).append(url)
+
+        revisions = {}
+        for api_url, titles in wikis.items():
+            titles = list(titles.items())
+            for batch_start in range(0, len(titles), self.batch_size):
+                batch = titles[batch_start:batch_start + self.batch_size]
+                batch_revisions = self._query_revisions(api_url, [title for title, _ in batch])
+                for title, title_urls in batch:
+                    for url in title_urls:
+                        revisions[url] = batch_revisions.get(title)
+        return revisions
+
+    def _query_revisions(self, api_url: str, titles: list) -> dict:
+        # Only the ids of the latest revision of every page, this is all the API returns when asking for many titles
+        query_url = api_url + "?" + urlencode({
+            "action": "query",
+            "prop": "revisions",
+            "rvprop": "ids",
+            "titles": "|".join(titles),
+            "format": "json",
+            "formatversion": "2"
+        })
+        query = json.loads(self.fetcher.get_text(query_url)).get("query", {})
+
+        # The API answers with the normalized titles, e.g. 'Mr. mime' -> 'Mr. Mime', map those back to ours
+        normalized = {item["to"]: item["from"] for item in query.get("normalized", [])}
+
+        revisions = {}
+        for page in query.get("pages", []):
+            title = normalized.get(page["title"], page["title"])
+            revisions[title] = page["revisions"][0]["revid"] if page.get("revisions") else None
+        return revisions
@@ -6,3 +6,30 @@ class PokemonType:
     def __init__(self, types: list):
         self.type1 = ENGLISH_TO_DUTCH_TYPE[types[0]]
         self.type2 = ENGLISH_TO_DUTCH_TYPE[types[1]] if len(types) > 1 else "Geen"
+
+    @classmethod
+    def from_dutch(cls, type1: str, type2: str = None):
+        """
+        Create the types from their Dutch names, e.g. the types of a PokedexEntry ('Steen', None)
+
+        :returns PokemonType
+        """
+        pokemon_type = cls.__new__(cls)
+        pokemon_type.type1 = type1
+        pokemon_type.type2 = type2 if type2 else "Geen"
+        return pokemon_type
+
+    @staticmethod
+    def to_dutch_name(type_name: str) -> str:
+        """
+        Get the Dutch name of a type given in English or Dutch, in any case
+
+        :returns name, e.g. 'rock' or 'steen' -> 'Steen'
+        """
+        name = type_name.strip().lower()
+        if name in ENGLISH_TO_DUTCH_TYPE:
+            return ENGLISH_TO_DUTCH_TYPE[name]
+        for dutch_name in ENGLISH_TO_DUTCH_TYPE.values():
+            if dutch_name.lower() == name:
+                return dutch_name
+        raise ValueError("Unknown type {}".format(type_name))
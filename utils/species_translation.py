@@ -0,0 +1,79 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+
+# Seed of the species (Bulbapedia 'category') translations, English (lowercase) -> Dutch
+#   Anything missing here is translated once and then kept in the translation cache, see utils/translation_cache.py
+ENGLISH_TO_DUTCH_SPECIES = {
+    "seed": "Zaad",
+    "lizard": "Hagedis",
+    "flame": "Vlam",
+    "tiny turtle": "Kleine schildpad",
+    "turtle": "Schildpad",
+    "shellfish": "Schelpdier",
+    "worm": "Worm",
+    "cocoon": "Cocon",
+    "butterfly": "Vlinder",
+    "tiny bird": "Klein vogeltje",
+    "bird": "Vogel",
+    "mouse": "Muis",
+    "poison pin": "Gifpin",
+    "fairy": "Fee",
+    "fox": "Vos",
+    "balloon": "Ballon",
+    "bat": "Vleermuis",
+    "weed": "Onkruid",
+    "flower": "Bloem",
+    "mushroom": "Paddenstoel",
+    "mole": "Mol",
+    "scratch cat": "Krabkat",
+    "classy cat": "Chique kat",
+    "duck": "Eend",
+    "pig monkey": "Varkensaap",
+    "puppy": "Puppy",
+    "tadpole": "Kikkervisje",
+    "psi": "Psi",
+    "superpower": "Superkracht",
+    "jellyfish": "Kwal",
+    "rock": "Steen",
+    "megaton": "Megaton",
+    "fire horse": "Vuurpaard",
+    "magnet": "Magneet",
+    "ball": "Bal",
+    "shadow": "Schaduw",
+    "hypnosis": "Hypnose",
+    "crab": "Krab",
+    "egg": "Ei",
+    "kicking": "Trappend",
+    "punching": "Stompend",
+    "licking": "Likkend",
+    "poison gas": "Gifgas",
+    "spikes": "Stekels",
+    "drill": "Boor",
+    "vine": "Rank",
+    "parent": "Ouder",
+    "dragon": "Draak",
+    "goldfish": "Goudvis",
+    "star prism": "Sterprisma",
+    "mysterious": "Mysterieus",
+    "mantis": "Bidsprinkhaan",
+    "human shape": "Mensvorm",
+    "electric": "Elektrisch",
+    "spitfire": "Vuurspuwer",
+    "stag beetle": "Vliegend hert",
+    "wild bull": "Wilde stier",
+    "fish": "Vis",
+    "atrocious": "Gruwelijk",
+    "transport": "Transport",
+    "transform": "Transformatie",
+    "evolution": "Evolutie",
+    "bubble jet": "Bellenstraal",
+    "lightning": "Bliksem",
+    "virtual": "Virtueel",
+    "spiral": "Spiraal",
+    "fossil": "Fossiel",
+    "sleeping": "Slapend",
+    "freeze": "Bevriezing",
+    "genetic": "Genetisch",
+    "new species": "Nieuwe soort",
+    "wolf": "Wolf",
+}
@@ -0,0 +1,158 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import importlib.util
+import json
+import os
+import threading
+
+from utils.atomic_file import open_atomic
+from utils.interning import intern_strings
+from utils.species_translation import ENGLISH_TO_DUTCH_SPECIES
+
+
+class GoogleTranslateBackend:
+    """
+    Translator backend using googletrans, only imported once the first translation is actually needed
+
+    Any callable taking (text, src, dest) and returning the translated text can be used as a backend instead.
+    """
+
+    def __init__(self):
+        self._translator = None
+
+    def __call__(self, text: str, src: str, dest: str) -> str:
+        if self._translator is None:
+            from googletrans import Translator
+            self._translator = Translator()
+        return self._translator.translate(text, src=src, dest=dest).text
+
+
+def create_default_backend():
+    """
+    :returns a GoogleTranslateBackend if googletrans is installed, otherwise None (no translations are requested)
+    """
+    if importlib.util.find_spec("googletrans") is None:
+        return None
+    return GoogleTranslateBackend()
+
+
+class TranslationCache:
+    """
+    A persistent English -> Dutch translation dictionary, consulted before any translator backend
+
+    The dictionary starts from the seed (e.g. ENGLISH_TO_DUTCH_SPECIES) and the translations stored in the JSON file at
+        path, keys are lowercase. Only text missing from both is sent to the backend, its translation is written to
+        the file right away, so a warm cache never requests a translation again.
+    Without a backend (offline or googletrans not installed) missing text is returned untranslated, and not stored.
+    With write_back False the file is only read, new translations are kept until pop_new_translations hands them to
+        the cache that writes the file (e.g. from a worker process to the main process, see add_translations).
+    """
+
+    def __init__(self, path: str = None, seed: dict = None, backend=None, src: str = "en", dest: str = "nl",
+                 write_back: bool = True):
+        self.path = path
+        self.seed = ENGLISH_TO_DUTCH_SPECIES if seed is None else seed
+        self.backend = backend
+        self.src = src
+        self.dest = dest
+        self.write_back = write_back
+
+        self._lock = threading.Lock()
+        self._translations = None
+        self._new_translations = {}
+
+    def _load(self) -> dict:
+        translations = dict(self.seed)
+        if self.path:
+            try:
+                with open(self.path, "r", encoding='utf8') as translations_file:
+                    translations.update((key, intern_strings(value))
+                                        for key, value in json.load(translations_file).items())
+            except (OSError, ValueError):
+                pass
+        return translations
+
+    def translate(self, text: str) -> str:
+        """
+        Translate text, from the cache when possible
+
+        :returns the translated text, or text itself if it is not cached and there is no backend
+        """
+        key = text.strip().lower()
+
+        with self._lock:
+            if self._translations is None:
+                self._translations = self._load()
+            if key in self._translations:
+                return self._translations[key]
+
+        if self.backend is None:
+            return text
+
+        translation = intern_strings(self.backend(text, self.src, self.dest))
+
+        with self._lock:
+            self._translations[key] = translation
+            if self.write_back:
+                self._save()
+            else:
+                self._new_translations[key] = translation
+        return translation
+
+    def pop_new_translations(self) -> dict:
+        """
+        The translations requested from the backend since the last call, when write_back is False
+
+        :returns dict of lowercase text -> translation
+        """
+        with self._lock:
+            new_translations, self._new_translations = self._new_translations, {}
+        return new_translations
+
+    def add_translations(self, translations: dict):
+        """
+        Add translations requested elsewhere (see pop_new_translations), and store them
+        """
+        if not translations:
+            return
+
+        with self._lock:
+            if self._translations is None:
+                self._translations = self._load()
+            self._translations.update((key, intern_strings(value)) for key, value in translations.items())
+            if self.write_back:
+                self._save()
+            else:
+                self._new_translations.update(translations)
+
+    def _save(self):
+        if not self.path:
+            return
+
+        # Only the translations that are not part of the seed are stored
+        stored = {key: value for key, value in self._translations.items() if self.seed.get(key) != value}
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with open_atomic(self.path) as translations_file:
+            json.dump(stored, translations_file, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+_default_translation_cache = None
+_default_translation_cache_lock = threading.Lock()
+
+
+def get_default_translation_cache() -> TranslationCache:
+    """
+    The translation cache shared by all parsers that are not given one, stored in .cache/translations.json
+
+    :returns TranslationCache
+    """
+    global _default_translation_cache
+    with _default_translation_cache_lock:
+        if _default_translation_cache is None:
+            _default_translation_cache = TranslationCache(os.path.join(".cache", "translations.json"),
+                                                          backend=create_default_backend())
+        return _default_translation_cache
@@ -0,0 +1,282 @@
+#  Copyright (c) 2021 Aaron Beetstra
+#  All rights reserved.
+import re
+
+# Everything the tokenizer has to act on, the text between two tokens is skipped in one go.
+#   Outside of templates only the start of a template matters, so links, '|' and '=' in the prose are skipped as well.
+_TOKEN_PATTERN = re.compile(r'\{\{|\}\}|\[\[|\]\]|\||=|<!--|<(?P<tag>ref|nowiki)\b[^>]*?(?P<closed>/?)>',
+                            re.IGNORECASE)
+_TOP_LEVEL_TOKEN_PATTERN = re.compile(r'\{\{|<!--|<(?P<tag>ref|nowiki)\b[^>]*?(?P<closed>/?)>', re.IGNORECASE)
+# Inside a nested template only the braces matter, the '|', '=' and links in it are part of the outer argument
+_NESTED_TOKEN_PATTERN = re.compile(r'\{\{|\}\}|<!--|<(?P<tag>ref|nowiki)\b[^>]*?(?P<closed>/?)>', re.IGNORECASE)
+# A section heading is a line starting and ending with '=', e.g. ===Evolution===
+#   Anchoring on the newline instead of using '^' lets the regex engine jump straight to the candidates
+_HEADING_PATTERN = re.compile(r'\n(=+)([^\n]+?)(=+)[ \t]*$', re.MULTILINE)
+_COMMENT_END = "-->"
+_CLOSING_TAG_PATTERNS = {
+    "ref": re.compile(r'</ref\s*>', re.IGNORECASE),
+    "nowiki": re.compile(r'</nowiki\s*>', re.IGNORECASE)
+}
+
+
+def normalize_template_name(name: str) -> str:
+    """
+    Normalize a template name the way MediaWiki does, e.g. ' pokémon_Infobox ' -> 'Pokémon Infobox'
+    """
+    name = " ".join(name.replace("_", " ").split())
+    return name[:1].upper() + name[1:]
+
+
+class WikitextTemplate:
+    """
+    A (top-level) template found in wikitext, e.g. {{Pokémon Infobox|name=Rockruff|...}}
+
+    arguments: list of (name, value) in order of appearance, name is None for positional arguments
+    params: dict of the named arguments, name -> value
+    start, end: offsets of the template in the text, text[start:end] is the template source including the braces
+    """
+
+    def __init__(self, name: str, arguments: list, start: int, end: int):
+        self.name = name
+        self.arguments = arguments
+        self.params = {key: value for key, value in arguments if key is not None}
+        self.start = start
+        self.end = end
+
+    @property
+    def positional(self) -> list:
+        return [value for key, value in self.arguments if key is None]
+
+    def is_named(self, name: str) -> bool:
+        return normalize_template_name(self.name) == name
+
+    def __repr__(self):
+        return "WikitextTemplate({!r}, {!r})".format(self.name, self.params)
+
+
+class WikitextSection:
+    """
+    A section of wikitext, started by a heading, e.g. ===Evolution===
+
+    start: offset of the heading, content_start: offset right after the heading line
+    end: offset of the next heading of the same or a higher level (or the end of the text), so subsections are part of
+        their parent section
+    """
+
+    def __init__(self, level: int, title: str, start: int, content_start: int):
+        self.level = level
+        self.title = title
+        self.start = start
+        self.content_start = content_start
+        self.end = None
+
+    def __repr__(self):
+        return "WikitextSection({!r}, {}, {}-{})".format(self.title, self.level, self.start, self.end)
+
+
+class WikitextDocument:
+    """
+    The sections of a piece of wikitext, with lookups of the templates inside them
+
+    The headings are indexed in a single pass, templates are only tokenized for the parts of the page that are looked
+        at. Everything is referenced by offset into text, so parts of the page are never copied to look something up.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.sections = _index_sections(text)
+        # The lead is everything before the first heading
+        self.lead_end = self.sections[0].start if self.sections else len(text)
+
+        self._templates = {}
+
+    def find_section(self, title: str, parent: WikitextSection = None) -> WikitextSection:
+        """
+        Find the first section with the given title, optionally only inside the parent section
+
+        :returns WikitextSection or None
+        """
+        for section in self.sections:
+            if section.title == title and (parent is None or parent.start < section.start < parent.end):
+                return section
+        return None
+
+    def templates_between(self, start: int, end: int) -> list:
+        """All top-level templates between the offsets start and end, tokenized once per range"""
+        key = (start, end)
+        if key not in self._templates:
+            self._templates[key] = parse_templates(self.text, start, end)
+        return self._templates[key]
+
+    def templates_in(self, section: WikitextSection) -> list:
+        return self.templates_between(section.content_start, section.end)
+
+
+def _create_section(match, start: int, content_start: int) -> WikitextSection:
+    left, title, right = match.groups()
+
+    # The level is the smallest number of '=' on either side, extra '=' are part of the title
+    level = min(len(left), len(right))
+    title = left[level:] + title + right[level:]
+    return WikitextSection(level, title.strip(), start, content_start)
+
+
+def _index_sections(text: str) -> list:
+    sections = []
+    # The pattern starts at the newline before a heading, a heading on the very first line is matched with a newline
+    #   prepended to that line only
+    if text[:1] == "=":
+        first_line_end = text.find("\n")
+        first_line_end = len(text) if first_line_end == -1 else first_line_end
+        match = _HEADING_PATTERN.match("\n" + text[:first_line_end])
+        if match:
+            sections.append(_create_section(match, 0, match.end() - 1))
+
+    for match in _HEADING_PATTERN.finditer(text):
+        sections.append(_create_section(match, match.start() + 1, match.end()))
+
+    # A section ends where the next section of the same or a higher level starts
+    open_sections = []
+    for section in sections:
+        while open_sections and open_sections[-1].level >= section.level:
+            open_sections.pop().end = section.start
+        open_sections.append(section)
+    for section in open_sections:
+        section.end = len(text)
+
+    return sections
+
+
+def parse_templates(text: str, start: int = 0, end: int = None) -> list:
+    """
+    Tokenize wikitext and return all top-level templates in a single, linear pass
+
+    Nested templates ({{...}} inside an argument) and links ([[...|...]]) are kept as text of the argument they are
+        part of, so their '|' and '=' do not split arguments. Comments are removed from names and values, the contents
+        of <ref> and <nowiki> tags are kept as is. Names and values of named arguments are stripped, like MediaWiki
+        does.
+    Only text[start:end] is tokenized, without copying it.
+
+    :returns list of WikitextTemplate, in order of appearance
+    """
+    if end is None:
+        end = len(text)
+
+    templates = []
+
+    # Template depth and link depth, links only count inside a template
+    depth = 0
+    link_depth = 0
+
+    # State of the template and argument we are in (at depth 1)
+    template_start = 0
+    template_name = None
+    arguments = []
+    part_start = 0
+    equals_index = -1
+    # Comments found in the current part, these are cut out when the part is complete
+    comments = []
+
+    search_top_level = _TOP_LEVEL_TOKEN_PATTERN.search
+    search_nested = _NESTED_TOKEN_PATTERN.search
+    search = _TOKEN_PATTERN.search
+    position = start
+
+    while True:
+        if depth == 1:
+            match = search(text, position, end)
+        elif depth:
+            match = search_nested(text, position, end)
+        else:
+            match = search_top_level(text, position, end)
+        if match is None:
+            break
+
+        token = match.group()
+        token_start = match.start()
+        position = match.end()
+
+        if token == "<!--":
+            comment_end = text.find(_COMMENT_END, position, end)
+            position = end if comment_end == -1 else comment_end + len(_COMMENT_END)
+            if depth:
+                comments.append((token_start, position))
+            continue
+
+        if token[0] == "<":
+            # <ref> or <nowiki>, skip to the closing tag unless self-closing
+            if not match.group("closed"):
+                closing = _CLOSING_TAG_PATTERNS[match.group("tag").lower()].search(text, position, end)
+                position = end if closing is None else closing.end()
+            continue
+
+        if token == "{{":
+            depth += 1
+            if depth == 1:
+                template_start = token_start
+                template_name = None
+                arguments = []
+                part_start = position
+                equals_index = -1
+                comments = []
+                link_depth = 0
+        elif token == "[[":
+            link_depth += 1
+        elif token == "]]":
+            if link_depth:
+                link_depth -= 1
+        elif token == "}}" and depth > 1:
+            depth -= 1
+        elif token != "}}" and (depth > 1 or link_depth):
+            # A '|' or '=' inside a nested template or a link, part of the current argument
+            continue
+        elif token == "=":
+            if equals_index == -1 and template_name is not None:
+                equals_index = token_start
+        else:
+            # A '|' or '}}' on depth 1, which completes the current part
+            if template_name is None:
+                template_name = _cut(text, part_start, token_start, comments).strip()
+            elif equals_index == -1:
+                arguments.append((None, _cut(text, part_start, token_start, comments)))
+            else:
+                arguments.append((_cut(text, part_start, equals_index, comments).strip(),
+                                  _cut(text, equals_index + 1, token_start, comments).strip()))
+
+            part_start = position
+            equals_index = -1
+            comments = []
+
+            if token == "}}":
+                depth = 0
+                link_depth = 0
+                templates.append(WikitextTemplate(template_name, arguments, template_start, position))
+
+    return templates
+
+
+def _cut(text: str, start: int, end: int, comments: list) -> str:
+    # Slice text[start:end] without the comments inside it
+    if not comments:
+        return text[start:end]
+
+    pieces = []
+    for comment_start, comment_end in comments:
+        if comment_end <= start or comment_start >= end:
+            continue
+        pieces.append(text[start:comment_start])
+        start = comment_end
+    pieces.append(text[start:end])
+    return "".join(pieces)
+
+
+def find_template(templates: list, name: str, start: int = 0, end: int = None) -> WikitextTemplate:
+    """
+    Find the first template with the given (normalized) name, optionally only between the offsets start and end
+
+    :returns WikitextTemplate or None
+    """
+    for template in templates:
+        if template.start >= start and (end is None or template.start < end) and template.is_named(name):
+            return template
+    return None